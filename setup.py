@@ -41,10 +41,11 @@ setup(
     packages=find_packages(),
     include_package_data=True,
     install_requires=requires,
-    namespace_packages=["sphinxcontrib"],
     entry_points={
         "console_scripts": [
             "sphinx-matlab-apidoc=sphinxcontrib.sphinx_matlab_apidoc:main",
+            "sphinx-matlab-watch=sphinxcontrib.mat_watch:main",
+            "sphinx-matlab-cache=sphinxcontrib.mat_cache:main",
         ],
     },
 )
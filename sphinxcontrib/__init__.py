@@ -10,4 +10,5 @@ distributed in the ``sphinx-contrib`` distribution.
 :license: BSD, see LICENSE for details.
 """
 
-__import__("pkg_resources").declare_namespace(__name__)
+# A pkgutil-style namespace, as pkg_resources is slow to import.
+__path__ = __import__("pkgutil").extend_path(__path__, __name__)
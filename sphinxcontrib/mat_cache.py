@@ -0,0 +1,468 @@
+"""
+sphinxcontrib.mat_cache
+~~~~~~~~~~~~~~~~~~~~~~~
+
+A cache of parsed MATLAB files in ``matlab_cache_dir``, which several projects
+and concurrent builds may share.
+
+Entries are addressed by the content of the file, its name, the encoding,
+whether only the header is parsed, the parser engine and the versions of the
+parsers, not by the path of the file. Identical files of different projects
+thus share an entry. Each entry is a JSON file with the fields of the entity,
+see :func:`mat_index.entity_definition`, and is written to a temporary file
+that is then renamed, such that readers never see it half written.
+
+Reading an entry updates its modification time. Once the entries exceed
+``matlab_cache_size`` bytes, the least recently used are removed.
+
+``sphinx-matlab-cache`` fills the cache ahead of builds, e.g. in a separate CI
+stage, with the configuration in ``conf.py``.
+
+:copyright: Copyright 2025 by the sphinxcontrib-matlabdomain team.
+:license: BSD, see LICENSE for details.
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+
+from sphinx.config import eval_config_file
+from sphinx.util.logging import getLogger
+from sphinx.util.tags import Tags
+
+#: Default of ``matlab_cache_size``, in bytes. Defined before importing
+#: `mat_types`, whose `Analyzer` uses it, for when this module is imported first.
+DEFAULT_SIZE = 256 * 1024 * 1024
+
+from sphinxcontrib import mat_index, mat_trace, mat_types
+
+logger = getLogger("matlab-domain")
+
+#: Version of the entries, entries of other versions are never found.
+CACHE_VERSION = "1"
+
+#: After pruning, the entries take at most this share of the size limit.
+PRUNE_RATIO = 0.8
+
+# Temporary files older than this many seconds are left over by killed builds.
+STALE_TMP_AGE = 3600
+
+
+@lru_cache(maxsize=1)
+def parser_version():
+    """Return the versions of the packages that parse MATLAB files."""
+    versions = [CACHE_VERSION]
+    for distribution in (
+        "sphinxcontrib-matlabdomain",
+        "tree-sitter",
+        "tree-sitter-matlab",
+    ):
+        try:
+            versions.append(metadata.version(distribution))
+        except metadata.PackageNotFoundError:
+            versions.append("")
+    return "\0".join(versions)
+
+
+class ParseCache(object):
+    """
+    Parsed MATLAB files in *directory*, see the module documentation.
+
+    :param directory: Folder of the cache, created if missing.
+    :type directory: str
+    :param max_size: Number of bytes the entries may take, None for no limit.
+    :type max_size: int
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # estimated size of all entries, None until computed
+        self._size = None
+        #: number of entries found and written since created
+        self.hits = 0
+        self.writes = 0
+
+    def key(self, mfile, name, encoding, partial, engine):
+        """Return the key of the entity parsed from *mfile* called *name*, see
+        the module documentation."""
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(
+            f"{parser_version()}\0{engine}\0{name}\0{encoding}\0{partial:d}\0".encode()
+        )
+        with open(mfile, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def path(self, key):
+        """Return the path of the entry *key*."""
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, key, module):
+        """Return the entity of the entry *key*, in the folder *module*, or
+        None if there is no such entry."""
+        path = self.path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                record = mat_index.loads(f.read())
+            # most recently used
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        entity = mat_index.build_entity(
+            record["name"],
+            record["kind"],
+            module,
+            record["docstring"],
+            record["definition"],
+            record["members"],
+            record["bases"],
+        )
+        entity.partial = record["partial"]
+        self.hits += 1
+        return entity
+
+    def put(self, key, entity):
+        """Store *entity* as the entry *key*, replacing the entry at once."""
+        kind = mat_index.entity_kind(entity)
+        definition, members, bases = mat_index.entity_definition(entity, kind)
+        data = mat_index.dumps(
+            {
+                "name": entity.name,
+                "kind": kind,
+                "docstring": entity.docstring,
+                "definition": definition,
+                "members": members,
+                "bases": bases,
+                "partial": entity.partial,
+            }
+        ).encode()
+        path = self.path(key)
+        tmpname = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmpname, "wb") as f:
+                f.write(data)
+            os.replace(tmpname, path)
+        except OSError as exc:
+            logger.debug("[sphinxcontrib-matlabdomain] Cannot write %s: %s", path, exc)
+            return
+        self.writes += 1
+        if self.max_size is None:
+            return
+        with self._lock:
+            if self._size is None:
+                self._size = self.size()
+            else:
+                self._size += len(data)
+            exceeded = self._size > self.max_size
+        if exceeded:
+            self.prune()
+
+    def entries(self):
+        """Yield the path, size and last use of all entries."""
+        for root, _, files in os.walk(self.directory):
+            for filename in files:
+                path = os.path.join(root, filename)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    # removed by another build
+                    continue
+                if filename.endswith(".json"):
+                    yield path, st.st_size, st.st_mtime
+                elif (
+                    filename.endswith(".tmp")
+                    and time.time() - st.st_mtime > STALE_TMP_AGE
+                ):
+                    _remove(path)
+
+    def size(self):
+        """Return the number of bytes of all entries."""
+        return sum(size for _, size, _ in self.entries())
+
+    def prune(self, max_size=None):
+        """
+        Remove the least recently used entries until they take at most
+        ``PRUNE_RATIO`` of *max_size* bytes, by default the size limit of the
+        cache. Returns the number of entries removed.
+        """
+        max_size = self.max_size if max_size is None else max_size
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        if total > max_size:
+            limit = max_size * PRUNE_RATIO
+            for path, size, _ in entries:
+                if total <= limit:
+                    break
+                if _remove(path):
+                    removed += 1
+                total -= size
+        with self._lock:
+            self._size = total
+        logger.debug(
+            "[sphinxcontrib-matlabdomain] Removed %d entries from %s.",
+            removed,
+            self.directory,
+        )
+        return removed
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        # removed by another build
+        return False
+    return True
+
+
+def read_options(source_dir):
+    """
+    Return the ``matlab_src_dir`` and the options of
+    :class:`mat_types.Analyzer` in the ``conf.py`` of *source_dir*, the Sphinx
+    source directory. Paths in the options are made absolute like the
+    extension does.
+    """
+    namespace = eval_config_file(source_dir / "conf.py", Tags())
+    src_dir = namespace.get("matlab_src_dir")
+    if src_dir is not None:
+        src_dir = os.path.normpath(os.path.join(source_dir, src_dir))
+    options = {
+        name: namespace[name]
+        for name in mat_types.Analyzer.analysis_defaults
+        if name in namespace
+    }
+    for name in ("matlab_cache_dir", "matlab_index_file"):
+        if options.get(name):
+            options[name] = os.path.join(source_dir, options[name])
+    return src_dir, options
+
+
+def _init_worker(src_dir, options, trace):
+    # Each worker process has an analyzer, i.e. configuration, of its own.
+    registry = mat_types.Analyzer(src_dir, options).registry
+    if trace:
+        registry.tracer = mat_trace.Tracer()
+    registry.activate()
+
+
+def _prepare(relpath, check):
+    # `_prepare_file` with the spans it recorded, see `mat_trace`.
+    status, size = _prepare_file(relpath, check)
+    tracer = mat_trace.tracer()
+    return status, size, tracer.take_events() if tracer is not None else []
+
+
+def _prepare_file(relpath, check):
+    # Parse the MATLAB file *relpath* into the cache, or with *check* only
+    # look it up. Returns its status and size.
+    basedir = mat_types.MatObject.basedir
+    mfile = os.path.join(basedir, relpath)
+    path, filename = os.path.split(relpath)
+    name = os.path.splitext(filename)[0]
+    cache = mat_types.parse_cache()
+    try:
+        size = os.path.getsize(mfile)
+        key = cache.key(
+            mfile,
+            name,
+            mat_types.MatObject.encoding or "utf-8",
+            mat_types.header_only(mfile),
+            mat_types.parser_engine_name(),
+        )
+        try:
+            # most recently used, as in `ParseCache.get`
+            os.utime(cache.path(key))
+        except FileNotFoundError:
+            pass
+        else:
+            return "cached", size
+        if check:
+            return "stale", size
+        entity = mat_types.MatObject.parse_mfile(
+            mfile, name, path, mat_types.MatObject.encoding
+        )
+    except Exception:
+        return "failed", 0
+    if entity.partial and not mat_types.header_only(mfile):
+        # timed out, see `ParseCache`
+        return "slow", size
+    return "parsed", size
+
+
+def prepare_tree(src_dir, options, jobs=None, check=False, out=None, tracer=None):
+    """
+    Parse the MATLAB files of *src_dir* into the cache in
+    ``matlab_cache_dir`` with *jobs* processes, by default one per core, and
+    report the progress to *out*, by default stderr. With *check* nothing is
+    parsed. The spans of all processes are recorded with the
+    :class:`mat_trace.Tracer` *tracer*, if given.
+
+    Returns the relative paths of the files by their status: ``cached``,
+    ``parsed``, ``stale`` (not cached, with *check*), ``slow`` (not cached
+    as parsing timed out) and ``failed``.
+    """
+    analyzer = mat_types.Analyzer(src_dir, options)
+    analyzer.registry.tracer = tracer
+    basedir = analyzer.registry.basedir
+    with analyzer.activated(), mat_trace.span("walk", "analyze"):
+        relpaths = sorted(
+            relpath
+            for relpath, signature in mat_types.snapshot_tree(basedir).items()
+            if signature is not None and relpath.endswith(".m")
+        )
+    jobs = jobs or os.cpu_count() or 1
+    out = out or sys.stderr
+    results = {status: [] for status in ("cached", "parsed", "stale", "slow", "failed")}
+    start = time.monotonic()
+    total_size = 0
+
+    def report(done, final=False):
+        elapsed = max(time.monotonic() - start, 1e-9)
+        out.write(
+            f"\r{done}/{len(relpaths)} files, {done / elapsed:.1f} files/s, "
+            f"{total_size / elapsed / 1e6:.2f} MB/s"
+        )
+        if final:
+            out.write("\n")
+        out.flush()
+
+    checks = [check] * len(relpaths)
+    with analyzer.activated(), ExitStack() as stack:
+        if jobs > 1:
+            executor = stack.enter_context(
+                ProcessPoolExecutor(
+                    max_workers=jobs,
+                    initializer=_init_worker,
+                    initargs=(basedir, options, tracer is not None),
+                )
+            )
+            statuses = executor.map(_prepare, relpaths, checks, chunksize=8)
+        else:
+            statuses = map(_prepare, relpaths, checks)
+        for done, (relpath, (status, size, events)) in enumerate(
+            zip(relpaths, statuses), start=1
+        ):
+            results[status].append(relpath)
+            total_size += size
+            if tracer is not None:
+                tracer.extend(events)
+            if done % 50 == 0:
+                report(done)
+    report(len(relpaths), final=True)
+    return results
+
+
+def main(argv=None):
+    """Main entry point for sphinx-matlab-cache."""
+    parser = argparse.ArgumentParser(
+        description="Fill the MATLAB parse cache (matlab_cache_dir) of a Sphinx "
+        "project ahead of builds.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Example usage:
+  sphinx-matlab-cache docs
+  sphinx-matlab-cache -j 8 --cache-dir /ci/cache/matlab docs
+  sphinx-matlab-cache --check docs
+  sphinx-matlab-cache --prune docs
+  sphinx-matlab-cache --trace cache-trace.json docs
+        """,
+    )
+    parser.add_argument(
+        "source_dir", type=Path, help="Path to Sphinx source directory with conf.py"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of processes (default: number of cores)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Cache folder, instead of matlab_cache_dir in conf.py",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help="Write the parse spans of all processes to FILE, in the Trace Event "
+        "Format",
+    )
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report the files that are not cached, exit with 1 if any",
+    )
+    action.add_argument(
+        "--prune",
+        action="store_true",
+        help="Only remove the least recently used entries beyond matlab_cache_size",
+    )
+
+    args = parser.parse_args(argv)
+
+    if not (args.source_dir / "conf.py").is_file():
+        print(f"Error: No conf.py in {args.source_dir}", file=sys.stderr)
+        return 1
+    src_dir, options = read_options(args.source_dir)
+    if args.cache_dir:
+        options["matlab_cache_dir"] = os.path.abspath(args.cache_dir)
+    if not options.get("matlab_cache_dir"):
+        print("Error: matlab_cache_dir is not set in conf.py", file=sys.stderr)
+        return 1
+
+    if args.prune:
+        cache = ParseCache(
+            options["matlab_cache_dir"], options.get("matlab_cache_size", DEFAULT_SIZE)
+        )
+        if cache.max_size is None:
+            print("matlab_cache_size is None, nothing to prune.")
+            return 0
+        removed = cache.prune()
+        print(f"Removed {removed} entries, {cache.size()} bytes remain.")
+        return 0
+
+    if src_dir is None:
+        print("Error: matlab_src_dir is not set in conf.py", file=sys.stderr)
+        return 1
+    start = time.monotonic()
+    tracer = mat_trace.Tracer() if args.trace else None
+    results = prepare_tree(src_dir, options, args.jobs, args.check, tracer=tracer)
+    elapsed = time.monotonic() - start
+    if tracer is not None:
+        tracer.write(args.trace)
+    if args.check:
+        for relpath in results["stale"]:
+            print(f"Not cached: {relpath}")
+        print(f"{len(results['cached'])} files cached, {len(results['stale'])} not.")
+        return 1 if results["stale"] else 0
+    for relpath in results["failed"]:
+        print(f"Failed to parse: {relpath}", file=sys.stderr)
+    for relpath in results["slow"]:
+        print(f"Parsing timed out: {relpath}", file=sys.stderr)
+    print(
+        f"Parsed {len(results['parsed'])} files, {len(results['cached'])} were "
+        f"cached already, in {elapsed:.2f} s."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
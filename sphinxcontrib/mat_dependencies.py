@@ -0,0 +1,100 @@
+"""
+sphinxcontrib.mat_dependencies
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Track the MATLAB entities that each document refers to, such that a changed
+entity makes exactly the documents that depend on it outdated.
+
+Sphinx already reads a document again if the file of an entity that it
+documents changed. The documenters further record the entities they refer to:
+base classes, auto-link targets and the bases of classes documented with
+inherited members, as well as names that could not be resolved. Through the
+``env-get-outdated`` event, a document is read again if any of these entities
+changed, was removed or now exists.
+
+:copyright: Copyright 2025 by the sphinxcontrib-matlabdomain team.
+:license: BSD, see LICENSE for details.
+"""
+
+from sphinx.util.logging import getLogger
+
+from sphinxcontrib import mat_types
+
+logger = getLogger("matlab-domain")
+
+
+def resolve(name):
+    """Return the entity called *name* in the current registry, like the
+    documenters look names up, or None."""
+    entity = mat_types.entities_table.get(name)
+    if entity is None and name in mat_types.entities_name_map:
+        entity = mat_types.entities_table.get(mat_types.entities_name_map[name])
+    if entity is None and mat_types.scan_referenced_only():
+        entity = mat_types.load_entity(name)
+    if isinstance(entity, dict):
+        entity = (
+            entity.get("class") or entity.get("func") or next(iter(entity.values()))
+        )
+    return entity
+
+
+def entity_signature(name):
+    """
+    Return the state of the entity *name*: its kind and source file, with the
+    modification time and size of the file. None if there is no such entity.
+    """
+    entity = resolve(name)
+    if entity is None:
+        return None
+    source = mat_types.entity_source_file(entity)
+    try:
+        return (entity.ref_role(), source, *mat_types._file_signature(source))
+    except (OSError, TypeError):
+        # Folders of modules, or entities without a file.
+        return (entity.ref_role(), source)
+
+
+def note_entities(env, docname, names):
+    """Record that the document *docname* refers to the entities *names*."""
+    if not names:
+        return
+    dependencies = env.matlab_entity_dependencies.setdefault(docname, {})
+    for name in names:
+        if name not in dependencies:
+            dependencies[name] = entity_signature(name)
+
+
+def env_before_read_docs(app, env, docnames):
+    if not hasattr(env, "matlab_entity_dependencies"):
+        #: entities referred to by document, with their signatures
+        env.matlab_entity_dependencies = {}
+
+
+def env_purge_doc(app, env, docname):
+    getattr(env, "matlab_entity_dependencies", {}).pop(docname, None)
+
+
+def env_get_outdated(app, env, added, changed, removed):
+    """Return the documents that refer to entities which changed since they
+    were read."""
+    dependencies = getattr(env, "matlab_entity_dependencies", {})
+    if not dependencies:
+        return []
+    outdated = []
+    signatures = {}
+    with mat_types.registry_for(app).activated():
+        for docname, names in dependencies.items():
+            if docname in changed or docname in removed:
+                continue
+            for name, signature in names.items():
+                if name not in signatures:
+                    signatures[name] = entity_signature(name)
+                if signatures[name] != signature:
+                    logger.debug(
+                        "[sphinxcontrib-matlabdomain] %s is outdated, %s changed.",
+                        docname,
+                        name,
+                    )
+                    outdated.append(docname)
+                    break
+    return outdated
@@ -8,6 +8,10 @@ Extend autodoc directives to matlabdomain.
 :license: BSD, see LICENSE for details.
 """
 
+import hashlib
+import os
+
+from docutils.statemachine import StringList
 from sphinx.ext.autodoc.directive import (
     AutodocDirective,
     DocumenterBridge,
@@ -15,10 +19,86 @@ from sphinx.ext.autodoc.directive import (
     parse_generated_content,
     process_documenter_options,
 )
-from sphinx.util.logging import getLogger
+from sphinx.util.logging import getLogger, suppress_logging
+
+from .mat_dependencies import note_entities, resolve
+from .mat_trace import span
+from .mat_types import (
+    _file_signature,
+    debug_enabled,
+    entity_source_file,
+    names_digest,
+    registry_for,
+)
 
 logger = getLogger("matlab-domain")
 
+#: Number of generated directive outputs kept in the environment.
+DIRECTIVE_CACHE_SIZE = 5000
+
+#: Events through which other extensions change the generated output.
+AUTODOC_EVENTS = (
+    "autodoc-process-docstring",
+    "autodoc-process-signature",
+    "autodoc-skip-member",
+    "autodoc-process-bases",
+)
+
+
+def directive_cache(env):
+    """Return the generated output of the directives kept in the environment
+    *env*, see :meth:`MatlabAutodocDirective.run`."""
+    cache = getattr(env, "matlab_directive_cache", None)
+    if cache is None:
+        cache = env.matlab_directive_cache = {}
+    return cache
+
+
+def file_digests(env):
+    cache = getattr(env, "matlab_file_digests", None)
+    if cache is None:
+        cache = env.matlab_file_digests = {}
+    return cache
+
+
+def file_digest(env, filename):
+    """Return a hash of the content of *filename*, or None if it cannot be
+    read. Files are only read again once their modification time or size
+    changed."""
+    try:
+        signature = _file_signature(filename)
+    except OSError:
+        return None
+    cache = file_digests(env)
+    cached = cache.get(filename)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    with open(filename, "rb") as f:
+        digest = hashlib.blake2b(f.read(), digest_size=16).digest()
+    cache[filename] = (signature, digest)
+    return digest
+
+
+def output_settings(app):
+    """Return what the output of all directives depends on, besides their
+    own input and the entities: the autodoc and MATLAB configuration and the
+    handlers of autodoc events."""
+    config = tuple(
+        (value.name, repr(value.value))
+        for value in app.config
+        if value.name.startswith(("matlab_", "autodoc_"))
+    )
+    handlers = tuple(
+        (
+            event,
+            getattr(h.handler, "__module__", None),
+            getattr(h.handler, "__qualname__", type(h.handler).__qualname__),
+        )
+        for event in AUTODOC_EVENTS
+        for h in app.events.listeners.get(event, ())
+    )
+    return hashlib.blake2b(repr((config, handlers)).encode(), digest_size=16).digest()
+
 
 class MatlabAutodocDirective(AutodocDirective):
     """A directive class for all MATLAB autodoc directives.
@@ -52,7 +132,8 @@ class MatlabAutodocDirective(AutodocDirective):
 
         # look up target Documenter
         objtype = self.name.replace("auto", "")  # Removes auto
-        doccls = self.env.app.registry.documenters[objtype]
+        app = self.env.app
+        doccls = app.registry.documenters[objtype]
 
         # process the options with the selected documenter's option_spec
         try:
@@ -69,27 +150,119 @@ class MatlabAutodocDirective(AutodocDirective):
             )
             return []
 
-        # generate the output
-        params = DocumenterBridge(
-            self.env, reporter, documenter_options, lineno, self.state
-        )
-        documenter = doccls(params, self.arguments[0])
-        documenter.generate(more_content=self.content)
-        if not params.result:
+        # Other applications may have analyzed in this thread since.
+        with (
+            registry_for(app).activated(),
+            span(
+                f"{self.name} {self.arguments[0]}", "autodoc", docname=self.env.docname
+            ),
+        ):
+            key = self.cache_key(app, doccls, documenter_options, lineno)
+            cache = directive_cache(self.env)
+            cached = cache.pop(key, None)
+            if cached is not None and self.is_current(cached):
+                logger.debug(
+                    "[sphinxcontrib-matlabdomain] Reusing output at %s:%s",
+                    source,
+                    lineno,
+                )
+            else:
+                cached = self.generate(doccls, documenter_options, lineno)
+            # most recently used last
+            cache[key] = cached
+            if len(cache) > DIRECTIVE_CACHE_SIZE:
+                del cache[next(iter(cache))]
+            lines, items, dependencies, entities, _ = cached
+            note_entities(self.env, self.env.docname, entities)
+        if not lines:
             return []
 
-        lines = "\n".join(params.result)
-        logger.debug(
-            "[sphinxcontrib-matlabdomain] Generated output at %s:%s\n%s",
-            source,
-            lineno,
-            lines,
-        )
+        if debug_enabled():
+            logger.debug(
+                "[sphinxcontrib-matlabdomain] Generated output at %s:%s\n%s",
+                source,
+                lineno,
+                "\n".join(lines),
+            )
 
         # record all filenames as dependencies -- this will at least
         # partially make automatic invalidation possible
-        for fn in params.record_dependencies:
+        for fn in dependencies:
             self.state.document.settings.record_dependencies.add(fn)
 
-        result = parse_generated_content(self.state, params.result, documenter)
+        result = parse_generated_content(
+            self.state, StringList(lines, items=items), doccls
+        )
         return result
+
+    def cache_key(self, app, doccls, documenter_options, lineno):
+        # The input of the directive, the name it resolves to in the module
+        # and class it is in, the configuration and the names of all entities.
+        # Changes of the entities consulted are checked by `is_current`.
+        return (
+            self.name,
+            self.arguments[0],
+            self.resolved_name(doccls, documenter_options, lineno),
+            tuple(sorted(self.options.items())),
+            tuple(self.content.data),
+            tuple(self.content.items),
+            output_settings(app),
+            names_digest(),
+        )
+
+    def resolved_name(self, doccls, documenter_options, lineno):
+        # The module and object path the documenter resolves the argument to,
+        # which depend on the ``mat:module`` and ``mat:class`` directives and
+        # the autodoc directive the directive is in.
+        params = DocumenterBridge(
+            self.env,
+            self.state.document.reporter,
+            documenter_options,
+            lineno,
+            self.state,
+        )
+        documenter = doccls(params, self.arguments[0])
+        # An unresolved name is reported when generating.
+        with suppress_logging():
+            if not documenter.parse_name():
+                return None
+        return documenter.modname, tuple(documenter.objpath)
+
+    def generate(self, doccls, documenter_options, lineno):
+        """
+        Run the documenter and return the generated lines with their sources,
+        the files and entities it depends on, and the hashes of the files of
+        all entities consulted.
+        """
+        params = DocumenterBridge(
+            self.env,
+            self.state.document.reporter,
+            documenter_options,
+            lineno,
+            self.state,
+        )
+        #: names of the entities referred to, see `mat_dependencies`
+        params.matlab_entities = set()
+        documenter = doccls(params, self.arguments[0])
+        documenter.generate(more_content=self.content)
+        consulted = set(params.record_dependencies)
+        for name in params.matlab_entities:
+            entity = resolve(name)
+            filename = entity_source_file(entity) if entity is not None else None
+            if filename and os.path.isfile(filename):
+                consulted.add(filename)
+        digests = {filename: file_digest(self.env, filename) for filename in consulted}
+        return (
+            params.result.data,
+            params.result.items,
+            sorted(params.record_dependencies),
+            sorted(params.matlab_entities),
+            digests,
+        )
+
+    def is_current(self, cached):
+        # True if none of the files of the entities consulted changed.
+        return all(
+            file_digest(self.env, filename) == digest
+            for filename, digest in cached[4].items()
+        )
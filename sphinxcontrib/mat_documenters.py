@@ -8,9 +8,12 @@ Extend autodoc directives to matlabdomain.
 :license: BSD, see LICENSE for details.
 """
 
+import hashlib
 import inspect
+import os
 import re
 import traceback
+from functools import lru_cache
 
 from docutils.statemachine import ViewList
 from sphinx.ext.autodoc import (
@@ -42,6 +45,7 @@ from sphinx.util.docstrings import prepare_docstring
 from sphinx.util.inspect import safe_getattr
 from sphinx.util.logging import getLogger
 
+from .mat_trace import span
 from .mat_types import (
     MatApplication,
     MatClass,
@@ -54,6 +58,9 @@ from .mat_types import (
     MatScript,
     entities_name_map,
     entities_table,
+    entity_source_file,
+    load_referenced,
+    names_digest,
     try_get_module_entity_or_default,
 )
 
@@ -68,6 +75,62 @@ mat_ext_sig_re = re.compile(
     re.VERBOSE,
 )
 
+# Patterns used for auto-linking, see `MatlabDocumenter.auto_link`.
+see_also_re = re.compile(r"(See also:?\s*)(\b.*\b)(.*)", re.IGNORECASE)
+see_also_cond_re = re.compile(r"(\s*)(\b.*\b)(.*)")
+see_also_sep_re = re.compile(r"\s*,\s*")
+class_member_re = re.compile(r"(.*)\.([^\.]+)")
+properties_section_re = re.compile(r"(.* Properties:)", re.IGNORECASE)
+methods_section_re = re.compile(r"(.* Methods:)", re.IGNORECASE)
+member_item_re = re.compile(r"((\*\s*)?(\b\w*\b))(?=\s*-)")
+
+
+@lru_cache(maxsize=4096)
+def entity_link_patterns(name):
+    """Return the patterns to auto-link the entity *name* everywhere.
+
+    The first pattern matches *name* if it is NOT followed by
+    ``.<property_or_method>``, the second one if it is.
+    """
+    # negative look-behind for ` . + < @ * <non-breaking space>
+    look_behind = r"(?<!(`|\.|\+|<|@|\*| ))\b"
+    # negative look-ahead for ` * or <non-breaking space> or
+    # " Properties:" or " Methods:" or .<alphanum>
+    look_ahead = r"\b(?!(`|\*| |\sProperties:|\sMethods:|\.\w))"
+    look_ahead2 = r"\b(?!(`|\*| |\sProperties:|\sMethods:))"
+    escaped = name.replace(".", r"\.")
+    return (
+        re.compile(look_behind + escaped + look_ahead),
+        re.compile(look_behind + escaped + r"\.(\w+)" + look_ahead2),
+    )
+
+
+@lru_cache(maxsize=4096)
+def method_self_pattern(name):
+    # negative look-behind for ` or . or < or @ or * or <non-breaking space>
+    # and negative look-ahead for * or <non-breaking space> or .<alphanum>
+    return re.compile(r"(?<!(`|\.|<|@|\*| ))\b" + name + r"\b(?!\*| |\.\w)")
+
+
+@lru_cache(maxsize=4096)
+def attribute_self_pattern(name):
+    # negative look-behind for ` or . or < or * or <non-breaking space>
+    # and negative look-ahead for ` * or <non-breaking space>
+    return re.compile(r"(?<!(`|\.|<|\*| ))\b" + name + r"\b(?!`|\*| )")
+
+
+#: Default number of auto-linked docstrings kept in the environment, see
+#: `MatlabDocumenter.cached_auto_link` and ``matlab_docstring_cache_size``.
+DOCSTRING_CACHE_SIZE = 20000
+
+
+def docstring_cache(env):
+    """Return the auto-linked docstrings kept in the environment *env*."""
+    cache = getattr(env, "matlab_docstring_cache", None)
+    if cache is None:
+        cache = env.matlab_docstring_cache = {}
+    return cache
+
 
 # TODO: check MRO's for all classes, attributes and methods!!!
 
@@ -109,7 +172,7 @@ class MatlabDocumenter(PyDocumenter):
         # This only applies when there's no explicit module name and no path
         if base == "." and explicit_modname is None and path is None:
             logger.info(
-                f"[sphinxcontrib-matlabdomain] parse_name: Special case for root module detected"
+                "[sphinxcontrib-matlabdomain] parse_name: Special case for root module detected"
             )
             # "." means document the global namespace (root module)
             self.modname = ""
@@ -144,15 +207,21 @@ class MatlabDocumenter(PyDocumenter):
         Returns True if successful, False if an error occurred.
         """
         try:
-            msg = f"[sphinxcontrib-matlabdomain] MatlabDocumenter.import_object {self.modname=}, {self.objpath=}, {self.fullname=}."
-            logger.debug(msg)
+            logger.debug(
+                "[sphinxcontrib-matlabdomain] MatlabDocumenter.import_object modname=%r, objpath=%r, fullname=%r.",
+                self.modname,
+                self.objpath,
+                self.fullname,
+            )
 
             # Handle special case: documenting the root/global namespace
             if self.modname == "" and len(self.objpath) == 0:
                 # Look up the root module in entities_table
                 root_obj = entities_table.get(".")
                 logger.info(
-                    f"[sphinxcontrib-matlabdomain] import_object: Found root module: {root_obj is not None}, type: {type(root_obj).__name__ if root_obj else 'None'}"
+                    "[sphinxcontrib-matlabdomain] import_object: Found root module: %s, type: %s",
+                    root_obj is not None,
+                    type(root_obj).__name__ if root_obj else "None",
                 )
                 self.object = root_obj
                 if self.object is None:
@@ -162,10 +231,16 @@ class MatlabDocumenter(PyDocumenter):
             if len(self.objpath) > 1:
                 lookup_name = ".".join([self.modname, self.objpath[0]])
                 lookup_name = lookup_name.lstrip(".")
+                load_referenced(lookup_name)
                 obj = entities_table[lookup_name]
                 self.object = self.get_attr(obj, self.objpath[1])
+                if self.object is None and self.options.inherited_members:
+                    self.object = inherited_member(obj, self.objpath[1])
+                if self.object is None:
+                    raise AttributeError(self.objpath[1])
             else:
                 lookup_name = self.fullname.lstrip(".")
+                load_referenced(lookup_name, members=self.objtype == "module")
                 self.object = try_get_module_entity_or_default(lookup_name)
             return True
         # this used to only catch SyntaxError, ImportError and AttributeError,
@@ -201,7 +276,7 @@ class MatlabDocumenter(PyDocumenter):
                 # content if desired
                 docstrings.append([])
             if self.env.config.matlab_auto_link:
-                docstrings = self.auto_link(docstrings)
+                docstrings = self.cached_auto_link(docstrings)
             for i, line in enumerate(self.process_doc(docstrings)):
                 self.add_line(line, sourcename, i)
 
@@ -210,22 +285,85 @@ class MatlabDocumenter(PyDocumenter):
             for line, src in zip(more_content.data, more_content.items):
                 self.add_line(line, src[0], src[1])
 
+    def record_dependency(self, filename):
+        # Sphinx considers dependencies that are not files (e.g. module folders)
+        # as missing, which would make the document outdated on every build.
+        if filename and os.path.isfile(filename):
+            self.directive.record_dependencies.add(filename)
+
+    def record_entity(self, name):
+        # The document is read again when the entity *name* changes, is
+        # removed or, if it did not exist, is added. See mat_dependencies.
+        directive = getattr(self, "directive", None)
+        entities = getattr(directive, "matlab_entities", None)
+        if entities is not None:
+            entities.add(name)
+        if self._linked is not None:
+            self._linked.append(name)
+
+    # names recorded while auto-linking, see `cached_auto_link`
+    _linked = None
+
+    def cached_auto_link(self, docstrings):
+        # `auto_link` the *docstrings*, or take the result from the cache in
+        # the environment, which is kept across builds. The links depend on
+        # the docstring, the documented object and its class, the names of all
+        # entities and the configuration of the links.
+        config = self.env.config
+        cls = self.class_object()
+        key = (
+            self.objtype,
+            self.fullname,
+            hashlib.blake2b(repr(docstrings).encode(), digest_size=16).digest(),
+            config.matlab_auto_link,
+            config.matlab_keep_package_prefix,
+            config.matlab_short_links,
+            cls and (cls.fullname(self.env), tuple(cls.methods), tuple(cls.properties)),
+            names_digest(),
+        )
+        cache = docstring_cache(self.env)
+        cached = cache.pop(key, None)
+        if cached is None:
+            self._linked = []
+            try:
+                with span(
+                    f"auto_link {self.fullname}",
+                    "auto-link",
+                    mode=config.matlab_auto_link,
+                ):
+                    docstrings = self.auto_link(docstrings)
+                linked = tuple(self._linked)
+            finally:
+                self._linked = None
+            cache[key] = ([list(lines) for lines in docstrings], linked)
+            size = config.matlab_docstring_cache_size
+            while size is not None and len(cache) > size:
+                # drop the least recently used entry
+                del cache[next(iter(cache))]
+            return docstrings
+        # most recently used last
+        cache[key] = cached
+        lines, linked = cached
+        for name in linked:
+            self.record_entity(name)
+        # `process_doc` changes the lines in place.
+        return [list(docstring) for docstring in lines]
+
     def class_object(self):
         # the associated MatClass object (for class, property and method documenters)
         return None
 
-    def auto_link_basic(self, docstrings):
-        return self.auto_link_see_also(docstrings)
+    def auto_link_basic(self, docstrings, linkable):
+        return self.auto_link_see_also(docstrings, linkable)
 
-    def auto_link_see_also(self, docstrings):
+    def auto_link_see_also(self, docstrings, linkable):
         # autolink known names in See also
-        see_also_re = re.compile(r"(See also:?\s*)(\b.*\b)(.*)", re.IGNORECASE)
-        see_also_cond_re = re.compile(r"(\s*)(\b.*\b)(.*)")
-        class_re = re.compile(r"(.*)\.([^\.]+)")
         is_see_also_line = False
         for i in range(len(docstrings)):
             for j in range(len(docstrings[i])):
                 line = docstrings[i][j]
+                if line and not linkable[i][j]:  # in literal block
+                    continue
                 if line:  # non-blank line
                     if is_see_also_line:
                         # find name
@@ -240,10 +378,11 @@ class MatlabDocumenter(PyDocumenter):
 
                 if is_see_also_line and entries_str:
                     # split on ,
-                    entries = re.split(r"\s*,\s*", entries_str)
+                    entries = see_also_sep_re.split(entries_str)
                     for k in range(len(entries)):
                         if entries[k].endswith("`"):
                             continue
+                        self.record_entity(entries[k])
 
                         # search in entities_table (for matching class or function name)
                         if (
@@ -285,10 +424,11 @@ class MatlabDocumenter(PyDocumenter):
                                 continue
 
                         # see if it is a fully qualified property or method name we recognize
-                        match2 = class_re.search(entries[k])
+                        match2 = class_member_re.search(entries[k])
                         if match2:
                             m1 = match2.group(1)
                             m2 = match2.group(2)
+                            self.record_entity(m1)
                             if (
                                 self.env.config.matlab_keep_package_prefix
                                 and m1 in entities_table
@@ -342,8 +482,31 @@ class MatlabDocumenter(PyDocumenter):
 
         return not_in_literal_block, no_link_state
 
-    def auto_link_all(self, docstrings):
+    def linkable_lines(self, docstrings):
+        # For each line of *docstrings*, True if it is neither blank nor in a
+        # literal block. Auto-linking does not change which lines are blank,
+        # indented or end with "::", so the mask is computed once per
+        # docstring and shared by all auto-linkers.
+        linkable = []
+        no_link_state = 0  # normal mode (no literal block detected)
+        for lines in docstrings:
+            mask = []
+            for line in lines:
+                not_in_literal_block, no_link_state = self.detect_literal_block(
+                    line, no_link_state
+                )
+                mask.append(not_in_literal_block)
+            linkable.append(mask)
+        return linkable
+
+    def auto_link_all(self, docstrings, linkable):
         # auto-link known classes and functions everywhere
+        positions = [
+            (i, j)
+            for i in range(len(docstrings))
+            for j in range(len(docstrings[i]))
+            if linkable[i][j]
+        ]
         for n, o in entities_table.items():
             if isinstance(o, dict):
                 if "class" in o:
@@ -353,79 +516,64 @@ class MatlabDocumenter(PyDocumenter):
             role = o.ref_role()
             if role in ["class", "func"]:
                 nn = n.replace("+", "")  # remove + from name
-                # negative look-behind for ` . + < @ * <non-breaking space>
-                look_behind = r"(?<!(`|\.|\+|<|@|\*| ))\b"
-                # negative look-ahead for ` * or <non-breaking space> or
-                # " Properties:" or " Methods:" or .<alphanum>
-                look_ahead = r"\b(?!(`|\*| |\sProperties:|\sMethods:|\.\w))"
-                look_ahead2 = r"\b(?!(`|\*| |\sProperties:|\sMethods:))"
-                # entity_name is NOT followed by .<property_or_method>
-                pat = look_behind + nn.replace(".", r"\.") + look_ahead
-                p = re.compile(pat)
-                if role == "class":
-                    # entity_name IS followed by .<property_or_method>
-                    pat2 = (
-                        look_behind + nn.replace(".", r"\.") + r"\.(\w+)" + look_ahead2
+                p, p2 = entity_link_patterns(nn)
+                linked = False
+                for i, j in positions:
+                    docstrings[i][j], count = p.subn(
+                        f":{role}:`{nn}`", docstrings[i][j]
                     )
-                    p2 = re.compile(pat2)
-                no_link_state = 0  # normal mode (no literal block detected)
-                for i in range(len(docstrings)):
-                    for j in range(len(docstrings[i])):
-                        not_in_literal_block, no_link_state = self.detect_literal_block(
-                            docstrings[i][j], no_link_state
-                        )
-                        if not_in_literal_block:
-                            docstrings[i][j] = p.sub(
-                                f":{role}:`{nn}`", docstrings[i][j]
-                            )
-                            if role == "class":
-                                if match := p2.search(docstrings[i][j]):
-                                    # if match.group(1) is a property
-                                    #   -> :attr:`{nn}.{match.group(1)}`
-                                    for nnn in o.properties:
-                                        if match.group(2) == nnn:
-                                            docstrings[i][j] = p2.sub(
-                                                f":attr:`{nn}.{nnn}`", docstrings[i][j]
-                                            )
-                                            break
-                                    # if match.group(1) is a method
-                                    #   -> :meth:`{nn}.{match.group(1)}`
-                                    for nnn in o.methods:
-                                        if match.group(2) == nnn:
-                                            docstrings[i][j] = p2.sub(
-                                                f":meth:`{nn}.{nnn}`", docstrings[i][j]
-                                            )
-                                            break
+                    linked = linked or count > 0
+                    if role == "class":
+                        if match := p2.search(docstrings[i][j]):
+                            linked = True
+                            # if match.group(1) is a property
+                            #   -> :attr:`{nn}.{match.group(1)}`
+                            for nnn in o.properties:
+                                if match.group(2) == nnn:
+                                    docstrings[i][j] = p2.sub(
+                                        f":attr:`{nn}.{nnn}`", docstrings[i][j]
+                                    )
+                                    break
+                            # if match.group(1) is a method
+                            #   -> :meth:`{nn}.{match.group(1)}`
+                            for nnn in o.methods:
+                                if match.group(2) == nnn:
+                                    docstrings[i][j] = p2.sub(
+                                        f":meth:`{nn}.{nnn}`", docstrings[i][j]
+                                    )
+                                    break
+                if linked:
+                    self.record_entity(n)
 
         return docstrings
 
     def auto_link(self, docstrings):
+        linkable = self.linkable_lines(docstrings)
+
         # basic auto-linking
         if self.env.config.matlab_auto_link:  # "basic" or "all" (i.e. not None)
-            docstrings = self.auto_link_basic(docstrings)
+            docstrings = self.auto_link_basic(docstrings, linkable)
 
         # auto-link everywhere
         if self.env.config.matlab_auto_link == "all":
-            docstrings = self.auto_link_all(docstrings)
+            docstrings = self.auto_link_all(docstrings, linkable)
 
         return docstrings
 
-    def auto_link_methods(self, class_obj, docstrings):
-        for n in class_obj.methods:
-            # negative look-behind for ` . < @ * <non-breaking space>, then <name>()
-            pat = r"(?<!(`|\.|<|@|\*| ))\b" + n + r"\(\)(?! )"
-            p = re.compile(pat)
-            no_link_state = 0  # normal mode (no literal block detected)
-            for i in range(len(docstrings)):
-                for j in range(len(docstrings[i])):
-                    not_in_literal_block, no_link_state = self.detect_literal_block(
-                        docstrings[i][j], no_link_state
-                    )
-                    if not_in_literal_block:
-                        docstrings[i][j] = p.sub(
-                            f":meth:`{n}() <{class_obj.fullname(self.env)}.{n}>`",
-                            docstrings[i][j],
-                        )
+    def auto_link_methods(self, class_obj, docstrings, linkable):
+        p = class_obj.method_call_pattern()
+        if p is None:
+            return docstrings
+        target = class_obj.fullname(self.env)
+
+        def link_method(match):
+            n = match.group("name")
+            return f":meth:`{n}() <{target}.{n}>`"
+
+        for i in range(len(docstrings)):
+            for j in range(len(docstrings[i])):
+                if linkable[i][j]:
+                    docstrings[i][j] = p.sub(link_method, docstrings[i][j])
 
         return docstrings
 
@@ -459,9 +607,17 @@ class MatlabDocumenter(PyDocumenter):
                             self.fullname,
                         )
         elif self.options.inherited_members:
-            # safe_getmembers() uses dir() which pulls in members from all
-            # base classes
-            members = inspect.get_members(self.object, attr_getter=self.get_attr)
+            # the members defined in the class, then those of all its base
+            # classes that are not overridden
+            members = dict(self.get_attr(self.object, "__dict__", {}))
+            for base, entity in base_classes(self.object):
+                self.record_entity(base)
+                if isinstance(entity, MatClass):
+                    for mname, member in entity.getter("__dict__").items():
+                        # constructors are not inherited
+                        if mname != entity.__name__:
+                            members.setdefault(mname, member)
+            members = list(members.items())
         else:
             # __dict__ contains only the members directly defined in
             # the class (but get them via getattr anyway, to e.g. get
@@ -673,11 +829,6 @@ class MatlabDocumenter(PyDocumenter):
         If *all_members* is True, do all members, else those given by
         *self.options.members*.
         """
-        # set current namespace for finding members
-        self.env.temp_data["autodoc:module"] = self.modname
-        if self.objpath:
-            self.env.temp_data["autodoc:class"] = self.objpath[0]
-
         want_all = (
             all_members or self.options.inherited_members or self.options.members is ALL
         )
@@ -692,9 +843,22 @@ class MatlabDocumenter(PyDocumenter):
                 if membername not in self.options.exclude_members
             ]
 
+        self.document_filtered_members(
+            self.filter_members(members, want_all), members_check_module
+        )
+
+    def document_filtered_members(self, filtered_members, members_check_module):
+        """Generate reST for *filtered_members*, a list of
+        `(membername, member, isattr)` as returned by :meth:`filter_members`.
+        """
+        # set current namespace for finding members
+        self.env.temp_data["autodoc:module"] = self.modname
+        if self.objpath:
+            self.env.temp_data["autodoc:class"] = self.objpath[0]
+
         # document non-skipped members
         memberdocumenters = []
-        for mname, member, isattr in self.filter_members(members, want_all):
+        for mname, member, isattr in filtered_members:
             classes = []
             for name, cls in self.documenters.items():
                 if name.startswith("mat:"):
@@ -793,14 +957,18 @@ class MatlabDocumenter(PyDocumenter):
                 self.analyzer = None
                 # at least add the module.__file__ as a dependency
                 if hasattr(self.module, "__file__") and self.module.__file__:
-                    self.directive.record_dependencies.add(self.module.__file__)
+                    self.record_dependency(self.module.__file__)
             else:
-                self.directive.record_dependencies.add(self.analyzer.srcname)
+                self.record_dependency(self.analyzer.srcname)
         else:
             # Root module has no real module name, so no analyzer needed
             self.analyzer = None
             if hasattr(self.module, "__file__") and self.module.__file__:
-                self.directive.record_dependencies.add(self.module.__file__)
+                self.record_dependency(self.module.__file__)
+
+        # record the file defining the object, such that documents are read
+        # again when that file changes
+        self.record_dependency(entity_source_file(self.object))
 
         # check __module__ of object (for members not given explicitly)
         if check_module:
@@ -974,9 +1142,6 @@ class MatDocstringSignatureMixin(object):
         # the base name must match ours
         if not self.objpath or base != self.objpath[-1]:
             return
-        # re-prepare docstring to ignore indentation after signature
-        docstrings = MatlabDocumenter.get_doc(self)
-        doclines = docstrings[0]
         # ok, now jump over remaining empty lines and set the remaining
         # lines as the new doclines
         i = 1
@@ -1021,6 +1186,34 @@ class MatFunctionDocumenter(MatDocstringSignatureMixin, MatModuleLevelDocumenter
         pass
 
 
+def base_classes(cls):
+    """Yields the names and entities of all base classes of *cls*, nearest
+    first. The entity is None for a base class that was not found."""
+    if not isinstance(cls, MatClass):
+        return
+    bases = list(cls.__bases__.items())
+    seen = set()
+    while bases:
+        base, entity = bases.pop(0)
+        if base in seen:
+            continue
+        seen.add(base)
+        yield base, entity
+        if isinstance(entity, MatClass):
+            bases.extend(entity.__bases__.items())
+
+
+def inherited_member(cls, name):
+    """Returns the member *name* that *cls* inherits from a base class, or
+    None."""
+    for _, entity in base_classes(cls):
+        if isinstance(entity, MatClass) and name != entity.__name__:
+            member = entity.getter(name, None)
+            if member is not None:
+                return member
+    return None
+
+
 def make_baseclass_links(env, obj):
     """Returns list of base class links"""
     obj_bases = obj.__bases__
@@ -1115,6 +1308,8 @@ class MatClassDocumenter(MatModuleLevelDocumenter):
         if not self.doc_as_attr and self.options.show_inheritance:
             self.add_line("", "<autodoc>")
             base_class_links = make_baseclass_links(self.env, self.object)
+            for base in self.object.bases:
+                self.record_entity(base)
             if base_class_links:
                 self.add_line(
                     _("   Bases: %s") % ", ".join(base_class_links), "<autodoc>"
@@ -1171,24 +1366,25 @@ class MatClassDocumenter(MatModuleLevelDocumenter):
         # the associated MatClass object
         return self.object
 
-    def auto_link_basic(self, docstrings):
-        docstrings = MatlabDocumenter.auto_link_basic(self, docstrings)
-        return self.auto_link_class_members(docstrings)
+    def auto_link_basic(self, docstrings, linkable):
+        docstrings = MatlabDocumenter.auto_link_basic(self, docstrings, linkable)
+        return self.auto_link_class_members(docstrings, linkable)
 
-    def auto_link_class_members(self, docstrings):
+    def auto_link_class_members(self, docstrings, linkable):
         # auto link property and method names in class docstring
-        prop_re = re.compile(r"(.* Properties:)", re.IGNORECASE)
-        meth_re = re.compile(r"(.* Methods:)", re.IGNORECASE)
         is_prop_line = False
         is_meth_line = False
         for i in range(len(docstrings)):
             for j in range(len(docstrings[i])):
                 line = docstrings[i][j]
+                if line and not linkable[i][j]:  # in literal block
+                    continue
                 if line:  # non-blank line
-                    if prop_re.search(line):  # line ends with "Properties:"
+                    # line ends with "Properties:"
+                    if properties_section_re.search(line):
                         is_prop_line = True
                         is_meth_line = False
-                    elif meth_re.search(line):  # line ends with "Methods:"
+                    elif methods_section_re.search(line):  # line ends with "Methods:"
                         is_prop_line = False
                         is_meth_line = True
                     elif is_prop_line:
@@ -1206,19 +1402,18 @@ class MatClassDocumenter(MatModuleLevelDocumenter):
 
     def link_member(self, type, line):
         parens = "()" if type == "meth" else ""
-        p = re.compile(r"((\*\s*)?(\b\w*\b))(?=\s*-)")
-        if match := p.search(line):
+        if match := member_item_re.search(line):
             name = match.group(3)
-            line = p.sub(
+            line = member_item_re.sub(
                 f"* :{type}:`{name}{parens} <{self.object.fullname(self.env)}.{name}>`",
                 line,
                 1,
             )
         return line
 
-    def auto_link_all(self, docstrings):
-        docstrings = self.auto_link_methods(self.object, docstrings)
-        return MatlabDocumenter.auto_link_all(self, docstrings)
+    def auto_link_all(self, docstrings, linkable):
+        docstrings = self.auto_link_methods(self.object, docstrings, linkable)
+        return MatlabDocumenter.auto_link_all(self, docstrings, linkable)
 
     def document_members(self, all_members=False):
         if self.doc_as_attr:
@@ -1228,132 +1423,70 @@ class MatClassDocumenter(MatModuleLevelDocumenter):
             all_members or self.options.inherited_members or self.options.members is ALL
         )
         # find out which members are documentable
-        _members_check_module, members = self.get_object_members(want_all)
-
-        # use filtered members to check for empty sections
-        filtered_members = [
-            (membername, member)
-            for (membername, member, isattr) in self.filter_members(members, want_all)
-        ]
+        members_check_module, members = self.get_object_members(want_all)
 
-        # create list of properties
-        prop_names = [
-            membername
-            for (membername, member) in filtered_members
-            if isinstance(member, MatProperty)
-        ]
-        # create list of constructors
-        if self.env.config.autoclass_content in ("both", "init"):
-            # skip constructor section, since its docstring has already been used for the class
-            cons_names = []
-        else:
-            cons_names = [
-                membername
-                for (membername, member) in filtered_members
-                if isinstance(member, MatMethod) and member.name == member.cls.name
-            ]
-        # create list of non-constructor methods
-        meth_names = [
-            membername
-            for (membername, member) in filtered_members
-            if isinstance(member, MatMethod) and member.name != member.cls.name
-        ]
-        # create list of enums
-        enum_names = [
-            membername
-            for (membername, member) in filtered_members
-            if isinstance(member, MatEnumeration)
-        ]
-        # create list of other members
-        other_names = [
-            membername
-            for (membername, member) in filtered_members
-            if not isinstance(member, MatMethod)
-            and not isinstance(member, MatProperty)
-            and not isinstance(member, MatEnumeration)
-            # exclude parent modules with names matching members (as in Myclass.Myclass)
-            and not (hasattr(member, "module") and member.name == member.module)
-        ]
-        # create list of members that are not properties
-        non_properties = [
-            membername
-            for (membername, member) in members
-            if not isinstance(member, MatProperty)
-        ]
-        # create list of members that are not constructors
-        non_constructors = [
-            membername
-            for (membername, member) in members
-            if not isinstance(member, MatMethod) or member.name != member.cls.name
-        ]
-        # create list of members that are not non-constructor methods
-        non_methods = [
-            membername
-            for (membername, member) in members
-            if not isinstance(member, MatMethod) or member.name == member.cls.name
-        ]
-        # create list of members that are not properties
-        non_enums = [
-            membername
-            for (membername, member) in members
-            if not isinstance(member, MatEnumeration)
-        ]
-        # create list of members that are not non-constructor methods
-        non_other = [
-            membername
-            for (membername, member) in members
-            if isinstance(member, (MatMethod, MatProperty))
-        ]
+        # Filter the members once and split them into sections. Sections are
+        # shown if they have members, before the exclude-members option is
+        # applied to their content.
+        exclude_members = self.options.exclude_members or ()
+        skip_constructors = self.env.config.autoclass_content in ("both", "init")
+        shown = set()
+        sections = {"cons": [], "prop": [], "enum": [], "meth": [], "other": []}
+        for membername, member, isattr in self.filter_members(members, want_all):
+            if isinstance(member, MatProperty):
+                shows, keys = "prop", ["prop"]
+            elif isinstance(member, MatMethod) and member.name != member.cls.name:
+                shows, keys = "meth", ["meth"]
+            elif isinstance(member, MatMethod):
+                # skip constructor section, since its docstring has already
+                # been used for the class
+                shows, keys = (None, []) if skip_constructors else ("cons", ["cons"])
+            elif isinstance(member, MatEnumeration):
+                # enumerations are documented under "Other" as well
+                shows, keys = "enum", ["enum", "other"]
+            elif hasattr(member, "module") and member.name == member.module:
+                # parent modules with names matching members (as in
+                # Myclass.Myclass) do not make a section of their own
+                shows, keys = None, ["other"]
+            else:
+                shows, keys = "other", ["other"]
+            if shows:
+                shown.add(shows)
+            if membername not in exclude_members:
+                for key in keys:
+                    sections[key].append((membername, member, isattr))
 
         # container
-        if cons_names or prop_names or meth_names or other_names:
+        if shown & {"cons", "prop", "meth", "other"}:
             self.add_line("", "<autodoc>")
             self.add_line(".. container:: members", "<autodoc>")
             self.add_line("", "<autodoc>")
             self.indent += "   "
 
-        # constructor
-        if cons_names:
-            self.document_member_section(
-                "Constructor Summary", non_constructors, all_members
-            )
-
-        # properties
-        if prop_names:
-            self.document_member_section(
-                "Property Summary", non_properties, all_members
-            )
-
-        # enumss
-        if enum_names:
-            self.document_member_section("Enumeration Values", non_enums, all_members)
-
-        # methods
-        if meth_names:
-            self.document_member_section("Method Summary", non_methods, all_members)
-
-        # other
-        if other_names:
-            self.document_member_section("Other", non_other, all_members)
+        for key, heading in (
+            ("cons", "Constructor Summary"),
+            ("prop", "Property Summary"),
+            ("enum", "Enumeration Values"),
+            ("meth", "Method Summary"),
+            ("other", "Other"),
+        ):
+            if key in shown:
+                self.document_member_section(
+                    heading, sections[key], members_check_module
+                )
 
-    def document_member_section(self, heading, new_excludes, all_members):
-        # save up original indent and exclude_members
+    def document_member_section(self, heading, section_members, members_check_module):
+        # save up original indent
         indent = self.indent
-        exclude_members = self.options.exclude_members or []
 
         # output heading and section content
         self.add_line(heading, "<autodoc>")
         self.indent += "   "
         self.add_line(".. ", "<autodoc>")  # a comment, to force a <dd> in the HTML
-        if exclude_members is EMPTY:
-            self.options.exclude_members = set(new_excludes)
-        else:
-            self.options.exclude_members = set(list(exclude_members) + new_excludes)
-        MatModuleLevelDocumenter.document_members(self, all_members)
+        self.document_filtered_members(section_members, members_check_module)
 
-        # restore original indent and exclude_members
+        # restore original indent
         self.indent = indent
-        self.options.exclude_members = exclude_members
 
 
 class MatExceptionDocumenter(MatlabDocumenter, PyExceptionDocumenter):
@@ -1383,6 +1516,8 @@ class MatMethodDocumenter(MatDocstringSignatureMixin, MatClassLevelDocumenter):
 
     def import_object(self):
         ret = MatClassLevelDocumenter.import_object(self)
+        if not ret:
+            return ret
         if self.object.attrs.get("Static"):
             self.directivetype = "staticmethod"
             # document class and static members before ordinary ones
@@ -1416,18 +1551,12 @@ class MatMethodDocumenter(MatDocstringSignatureMixin, MatClassLevelDocumenter):
         # the associated MatClass object
         return self.object.cls
 
-    def auto_link_self(self, docstrings):
+    def auto_link_self(self, docstrings, linkable):
         name = self.object.name
-        # negative look-behind for ` or . or < or @ or * or <non-breaking space>
-        # and negative look-ahead for * or <non-breaking space> or .<alphanum>
-        p = re.compile(r"(?<!(`|\.|<|@|\*| ))\b" + name + r"\b(?!\*| |\.\w)")
-        no_link_state = 0  # normal mode (no literal block detected)
+        p = method_self_pattern(name)
         for i in range(len(docstrings)):
             for j in range(len(docstrings[i])):
-                not_in_literal_block, no_link_state = self.detect_literal_block(
-                    docstrings[i][j], no_link_state
-                )
-                if not_in_literal_block and docstrings[i][j]:  # also not blank line
+                if linkable[i][j]:
                     if match := p.search(docstrings[i][j]):
                         docstrings[i][j] = p.sub(
                             f":meth:`{name}() <{self.class_object().fullname(self.env)}.{name}>`",
@@ -1435,10 +1564,10 @@ class MatMethodDocumenter(MatDocstringSignatureMixin, MatClassLevelDocumenter):
                         )
         return docstrings
 
-    def auto_link_all(self, docstrings):
-        docstrings = self.auto_link_methods(self.object.cls, docstrings)
-        docstrings = self.auto_link_self(docstrings)
-        return MatlabDocumenter.auto_link_all(self, docstrings)
+    def auto_link_all(self, docstrings, linkable):
+        docstrings = self.auto_link_methods(self.object.cls, docstrings, linkable)
+        docstrings = self.auto_link_self(docstrings, linkable)
+        return MatlabDocumenter.auto_link_all(self, docstrings, linkable)
 
 
 class MatAttributeDocumenter(MatClassLevelDocumenter):
@@ -1526,18 +1655,12 @@ class MatAttributeDocumenter(MatClassLevelDocumenter):
         # the associated MatClass object
         return self.object.cls
 
-    def auto_link_self(self, docstrings):
+    def auto_link_self(self, docstrings, linkable):
         name = self.object.name
-        # negative look-behind for ` or . or < or * or <non-breaking space>
-        # and negative look-ahead for ` * or <non-breaking space>
-        p = re.compile(r"(?<!(`|\.|<|\*| ))\b" + name + r"\b(?!`|\*| )")
-        no_link_state = 0  # normal mode (no literal block detected)
+        p = attribute_self_pattern(name)
         for i in range(len(docstrings)):
             for j in range(len(docstrings[i])):
-                not_in_literal_block, no_link_state = self.detect_literal_block(
-                    docstrings[i][j], no_link_state
-                )
-                if not_in_literal_block and docstrings[i][j]:  # also not blank line
+                if linkable[i][j]:
                     if p.search(docstrings[i][j]):
                         docstrings[i][j] = p.sub(
                             f":attr:`{name} <{self.class_object().fullname(self.env)}.{name}>`",
@@ -1545,10 +1668,10 @@ class MatAttributeDocumenter(MatClassLevelDocumenter):
                         )
         return docstrings
 
-    def auto_link_all(self, docstrings):
-        docstrings = self.auto_link_methods(self.object.cls, docstrings)
-        docstrings = self.auto_link_self(docstrings)
-        return MatlabDocumenter.auto_link_all(self, docstrings)
+    def auto_link_all(self, docstrings, linkable):
+        docstrings = self.auto_link_methods(self.object.cls, docstrings, linkable)
+        docstrings = self.auto_link_self(docstrings, linkable)
+        return MatlabDocumenter.auto_link_all(self, docstrings, linkable)
 
 
 class MatScriptDocumenter(MatModuleLevelDocumenter):
@@ -0,0 +1,408 @@
+"""
+sphinxcontrib.mat_index
+~~~~~~~~~~~~~~~~~~~~~~~
+
+Export the MATLAB entities found by :func:`sphinxcontrib.mat_types.analyze` to
+a SQLite database, and load them from there one at a time.
+
+Written by ``analyze`` if ``matlab_index_file`` is set. Later builds take the
+entities of unchanged files from the database instead of parsing the files,
+and with ``matlab_scan_referenced_only`` only those that are needed. Other
+tools can query the database directly. Its tables are:
+
+``entities``
+    One row per entity by its canonical dotted ``name``, with its ``kind``
+    (module, class, function, script or application), ``module``, ``file``
+    relative to ``matlab_src_dir`` with its ``mtime_ns`` and ``size``,
+    ``partial``, ``docstring`` and a JSON ``definition`` of the fields of its
+    kind, e.g. the return values and arguments of functions.
+``members``
+    Properties, methods and enumerations of classes, by ``entity`` and
+    ``name``, with their ``kind``, ``docstring`` and JSON ``definition``.
+``bases``
+    Base classes of classes, by ``entity`` and ``position``.
+``aliases``
+    Alternative names of entities, e.g. ``package.ClassBar`` for
+    ``target.+package.ClassBar``.
+
+:copyright: Copyright 2025 by the sphinxcontrib-matlabdomain team.
+:license: BSD, see LICENSE for details.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from types import SimpleNamespace
+
+from sphinxcontrib import mat_types
+
+#: Version of the tables, an index of another version is not loaded.
+SCHEMA_VERSION = "1"
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE entities (
+    name TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    module TEXT,
+    file TEXT,
+    mtime_ns INTEGER,
+    size INTEGER,
+    partial INTEGER NOT NULL DEFAULT 0,
+    docstring TEXT,
+    definition TEXT
+);
+CREATE INDEX entities_file ON entities (file);
+CREATE TABLE members (
+    entity TEXT NOT NULL,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    docstring TEXT,
+    definition TEXT,
+    PRIMARY KEY (entity, kind, name)
+);
+CREATE TABLE bases (
+    entity TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    base TEXT NOT NULL,
+    PRIMARY KEY (entity, position)
+);
+CREATE TABLE aliases (
+    alias TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (alias, name)
+);
+"""
+
+
+def entity_kind(entity):
+    """Return the kind of *entity* as stored in the ``entities`` table, or None
+    if it is not stored."""
+    if isinstance(entity, mat_types.MatModule):
+        return "module"
+    if isinstance(entity, mat_types.MatClass):
+        return "class"
+    # Functions of class folders are methods of the class by now.
+    if isinstance(entity, mat_types.MatFunction):
+        return "function"
+    if isinstance(entity, mat_types.MatScript):
+        return "script"
+    if isinstance(entity, mat_types.MatApplication):
+        return "application"
+    return None
+
+
+def dumps(definition):
+    """Return the JSON of *definition*, see :func:`entity_definition`."""
+    return json.dumps(definition, separators=(",", ":"))
+
+
+def _sizes_as_tuples(obj):
+    # JSON has no tuples, sizes of properties and arguments are.
+    size = obj.get("size")
+    if isinstance(size, list):
+        obj["size"] = tuple(size)
+    return obj
+
+
+def loads(definition):
+    """Return the definition in the JSON *definition*, see :func:`dumps`."""
+    return json.loads(definition, object_hook=_sizes_as_tuples)
+
+
+def entity_definition(entity, kind):
+    """
+    Return the fields of *entity* of *kind*, see :func:`entity_kind`, besides
+    its name, module and docstring: a dictionary of the fields of its kind,
+    its members as tuples of name, kind, docstring and dictionary, and its
+    bases. All are JSON serializable, see :func:`build_entity`.
+    """
+    definition = {}
+    members = []
+    bases = []
+    if kind == "module":
+        definition = {"package": entity.package}
+    elif kind == "class":
+        definition = {"attrs": entity.attrs}
+        bases = entity.bases
+        for prop_name, prop in entity.properties.items():
+            members.append((prop_name, "property", prop["docstring"], prop))
+        for meth_name, meth in entity.methods.items():
+            if getattr(meth, "file", None) is not None:
+                # From a class folder, stored as a function of its own.
+                continue
+            meth_def = {"retv": meth.retv, "args": meth.args, "attrs": meth.attrs}
+            members.append((meth_name, "method", meth.docstring, meth_def))
+        for enum_name, enum in entity.enumerations.items():
+            members.append((enum_name, "enumeration", enum["docstring"], enum))
+    elif kind == "function":
+        definition = {"retv": entity.retv, "args": entity.args}
+    return definition, members, bases
+
+
+def build_entity(name, kind, module, docstring, definition, members, bases):
+    """Return the entity of *kind*, other than module, called *name* from the
+    fields returned by :func:`entity_definition`, without parsing anything."""
+    if kind == "class":
+        entity = _new(
+            mat_types.MatClass,
+            name,
+            module=module,
+            attrs=definition["attrs"],
+            bases=list(bases),
+            docstring=docstring,
+            properties={},
+            methods={},
+            enumerations={},
+            rem_tks=None,
+            _fullnames={},
+            _method_call_pattern=((), None),
+        )
+        for member, member_kind, member_doc, member_def in members:
+            if member_kind == "property":
+                entity.properties[member] = member_def
+            elif member_kind == "enumeration":
+                entity.enumerations[member] = member_def
+            else:
+                member_def["docstring"] = member_doc
+                entity.methods[member] = mat_types.MatMethod(
+                    member, SimpleNamespace(**member_def), module, entity
+                )
+    elif kind == "function":
+        entity = _new(
+            mat_types.MatFunction,
+            name,
+            module=module,
+            docstring=docstring,
+            retv=definition["retv"],
+            args=definition["args"],
+            rem_tks=None,
+        )
+    elif kind == "script":
+        entity = _new(
+            mat_types.MatScript,
+            name,
+            module=module,
+            tokens=None,
+            docstring=docstring,
+        )
+    else:
+        entity = mat_types.MatApplication(name, module, docstring)
+    return entity
+
+
+def _entity_rows(name, entity, kind, basedir):
+    source = mat_types.entity_source_file(entity)
+    relfile = os.path.relpath(source, basedir) if source else None
+    signature = (None, None)
+    if kind != "module" and source is not None and os.path.isfile(source):
+        signature = mat_types._file_signature(source)
+    definition, members, bases = entity_definition(entity, kind)
+    row = (
+        name,
+        kind,
+        getattr(entity, "module", None),
+        relfile,
+        signature[0],
+        signature[1],
+        int(getattr(entity, "partial", False)),
+        getattr(entity, "docstring", None),
+        dumps(definition),
+    )
+    members = [
+        (name, member, member_kind, docstring, dumps(member_def))
+        for member, member_kind, docstring, member_def in members
+    ]
+    bases = [(name, position, base) for position, base in enumerate(bases)]
+    return row, members, bases
+
+
+def export_index(filename, registry=None):
+    """
+    Write the entities of *registry*, by default the current one, to the
+    SQLite database *filename*. The file is replaced at once, such that
+    readers never see it half written.
+    """
+    registry = registry or mat_types.current_registry()
+    basedir = registry.basedir
+    table = registry.entities_table
+    canonical = {}
+    entity_rows, member_rows, base_rows = [], [], []
+    for name in registry.name_index.names:
+        entity = table.get(name)
+        kind = entity_kind(entity)
+        if kind is None:
+            continue
+        canonical[id(entity)] = name
+        row, members, bases = _entity_rows(name, entity, kind, basedir)
+        entity_rows.append(row)
+        member_rows.extend(members)
+        base_rows.extend(bases)
+    alias_rows = []
+    for alias, value in table.items():
+        entities = value.values() if isinstance(value, dict) else (value,)
+        for entity in entities:
+            name = canonical.get(id(entity))
+            if name is not None and name != alias:
+                alias_rows.append((alias, name))
+
+    tmpname = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+    connection = sqlite3.connect(tmpname)
+    try:
+        with connection:
+            connection.executescript(SCHEMA)
+            connection.executemany(
+                "INSERT INTO meta VALUES (?, ?)",
+                [
+                    ("schema_version", SCHEMA_VERSION),
+                    ("basedir", basedir),
+                    ("parser_engine", mat_types.parser_engine_name()),
+                ],
+            )
+            connection.executemany(
+                "INSERT INTO entities VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", entity_rows
+            )
+            connection.executemany(
+                "INSERT INTO members VALUES (?, ?, ?, ?, ?)", member_rows
+            )
+            connection.executemany("INSERT INTO bases VALUES (?, ?, ?)", base_rows)
+            connection.executemany("INSERT INTO aliases VALUES (?, ?)", alias_rows)
+    finally:
+        connection.close()
+    os.replace(tmpname, filename)
+    return len(entity_rows)
+
+
+class MatIndex(object):
+    """
+    Read access to an index written by :func:`export_index`. Entities are
+    loaded one at a time, when asked for.
+
+    :param filename: Path of the SQLite database.
+    :type filename: str
+    :raises sqlite3.DatabaseError: If the file is no index of this version.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        uri = "file:" + os.path.abspath(filename).replace("?", "%3f") + "?mode=ro"
+        #: Connection to the database, to query it directly.
+        self.connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+        meta = dict(self._query("SELECT key, value FROM meta"))
+        if meta.get("schema_version") != SCHEMA_VERSION:
+            self.close()
+            raise sqlite3.DatabaseError(
+                f"{filename} has index version {meta.get('schema_version')}, "
+                f"not {SCHEMA_VERSION}"
+            )
+        #: The ``matlab_src_dir`` that was indexed.
+        self.basedir = meta.get("basedir")
+        #: The ``matlab_parser_engine`` the files were parsed with.
+        self.parser_engine = meta.get("parser_engine")
+
+    def close(self):
+        self.connection.close()
+
+    def _query(self, sql, *args):
+        with self._lock:
+            return self.connection.execute(sql, args).fetchall()
+
+    def names(self, kind=None):
+        """Return the canonical names of all entities, or of those of *kind*."""
+        if kind is None:
+            rows = self._query("SELECT name FROM entities ORDER BY name")
+        else:
+            rows = self._query(
+                "SELECT name FROM entities WHERE kind = ? ORDER BY name", kind
+            )
+        return [name for (name,) in rows]
+
+    def lookup(self, name):
+        """Return the canonical names of the entities called *name*, which may
+        be an alias."""
+        rows = self._query(
+            "SELECT name FROM entities WHERE name = ? "
+            "UNION SELECT name FROM aliases WHERE alias = ?",
+            name,
+            name,
+        )
+        return [name for (name,) in rows]
+
+    def entity(self, name):
+        """Return the entity of the canonical *name*, or None. Unlike
+        :meth:`load` its file is not checked for changes."""
+        rows = self._query("SELECT * FROM entities WHERE name = ?", name)
+        if not rows:
+            return None
+        return self._build(rows[0], os.path.join(self.basedir, rows[0][3] or ""))
+
+    def is_current(self, mfile):
+        """Return True if the index holds the entity of *mfile*, a full path,
+        and the file did not change since."""
+        return self._current_row(mfile) is not None
+
+    def load(self, mfile):
+        """Return the entity of *mfile*, a full path, or None if it is not
+        indexed or changed since."""
+        row = self._current_row(mfile)
+        if row is None:
+            return None
+        return self._build(row, mfile)
+
+    def _current_row(self, mfile):
+        relfile = os.path.relpath(mfile, mat_types.MatObject.basedir)
+        rows = self._query(
+            "SELECT * FROM entities WHERE file = ? AND kind != 'module'", relfile
+        )
+        if len(rows) != 1:
+            return None
+        row = rows[0]
+        try:
+            signature = mat_types._file_signature(mfile)
+        except OSError:
+            return None
+        if (row[4], row[5]) != tuple(signature):
+            return None
+        return row
+
+    def _build(self, row, source):
+        name, kind, module, _, _, _, partial, docstring, definition = row
+        definition = loads(definition)
+        short_name = name.rpartition(".")[2]
+        if kind == "module":
+            return mat_types.MatModule(short_name, source, definition["package"])
+        bases = []
+        members = []
+        if kind == "class":
+            bases = [
+                base
+                for (base,) in self._query(
+                    "SELECT base FROM bases WHERE entity = ? ORDER BY position",
+                    name,
+                )
+            ]
+            members = [
+                (member, member_kind, member_doc, loads(member_def))
+                for member, member_kind, member_doc, member_def in self._query(
+                    "SELECT name, kind, docstring, definition FROM members "
+                    "WHERE entity = ? ORDER BY rowid",
+                    name,
+                )
+            ]
+        entity = build_entity(
+            short_name, kind, module, docstring, definition, members, bases
+        )
+        entity.file = source
+        if kind != "application":
+            entity.partial = bool(partial)
+        return entity
+
+
+def _new(cls, name, **attrs):
+    # An entity of *cls* with the given fields, without parsing anything.
+    entity = cls.__new__(cls)
+    mat_types.MatObject.__init__(entity, name)
+    entity.__dict__.update(attrs)
+    return entity
@@ -0,0 +1,243 @@
+"""
+sphinxcontrib.mat_profile
+~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Memory profile of the analysis and the build, enabled with
+``matlab_memory_profile``.
+
+:mod:`tracemalloc` traces the allocations from the start of the build. At
+each stage boundary, after walking the source tree, after parsing, after
+``populate_entities_table``, after computing the aliases and after reading
+each document, the resident set size (RSS) and the traced memory are recorded
+with the allocation sites that grew most since the previous stage. At the end
+of the build, the stages are logged with the top allocation sites and the
+memory held by the docstrings, properties and methods of the entities.
+
+:copyright: Copyright 2025 by the sphinxcontrib-matlabdomain team.
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+import sys
+import tracemalloc
+from collections import namedtuple
+
+from sphinx.util.logging import getLogger
+
+from sphinxcontrib import mat_types
+
+logger = getLogger("matlab-domain")
+
+#: Number of allocation sites shown per stage and at the end.
+TOP_SITES = 10
+
+#: Memory at the end of a stage: RSS and traced bytes, None if not
+#: available, and the allocation sites that grew most since the previous
+#: stage as ``(site, size_diff, count_diff)``.
+MemoryStage = namedtuple("MemoryStage", "name rss traced peak growth")
+
+
+def rss():
+    """Return the resident set size of this process in bytes, or None if it
+    cannot be determined. Where the current size is not available, the peak
+    size is returned."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes, but bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _take_snapshot():
+    # without the snapshots kept by the profile itself
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)]
+    )
+
+
+def _site(statistic):
+    frame = statistic.traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+class MemoryProfile(object):
+    """
+    Memory recorded at the stages of a build, see the module documentation.
+    Traces allocations from creation until :meth:`stop`.
+    """
+
+    def __init__(self):
+        #: :class:`MemoryStage` in the order recorded
+        self.stages = []
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start()
+        self._snapshot = _take_snapshot()
+
+    def mark(self, name):
+        """Record the memory at the end of the stage *name*."""
+        if not tracemalloc.is_tracing():
+            return
+        snapshot = _take_snapshot()
+        growth = [
+            (_site(stat), stat.size_diff, stat.count_diff)
+            for stat in snapshot.compare_to(self._snapshot, "lineno")[:TOP_SITES]
+            if stat.size_diff > 0
+        ]
+        self._snapshot = snapshot
+        traced, peak = tracemalloc.get_traced_memory()
+        self.stages.append(MemoryStage(name, rss(), traced, peak, growth))
+
+    def top_sites(self, limit=TOP_SITES):
+        """Return the allocation sites holding the most memory as
+        ``(site, size, count)``."""
+        return [
+            (_site(stat), stat.size, stat.count)
+            for stat in self._snapshot.statistics("lineno")[:limit]
+        ]
+
+    def stop(self):
+        """Stop tracing allocations, if started by this profile."""
+        if self._started and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started = False
+
+    def report(self, registry=None):
+        """Return the recorded stages, the top allocation sites and
+        :func:`entity_memory` of *registry* as text."""
+        mib = 1024.0 * 1024.0
+
+        def fmt(size):
+            return "-" if size is None else f"{size / mib:.1f}"
+
+        lines = ["Memory by stage (MiB):"]
+        lines.append(f"  {'stage':<40} {'RSS':>9} {'traced':>9} {'peak':>9}")
+        for stage in self.stages:
+            lines.append(
+                f"  {stage.name:<40} {fmt(stage.rss):>9} "
+                f"{fmt(stage.traced):>9} {fmt(stage.peak):>9}"
+            )
+        growing = max(
+            self.stages,
+            key=lambda stage: sum(size for _, size, _ in stage.growth),
+            default=None,
+        )
+        if growing is not None and growing.growth:
+            lines.append(f"Largest growth in stage {growing.name}:")
+            for site, size, count in growing.growth:
+                lines.append(f"  {site}: +{size / 1024:.1f} KiB in {count:+d} blocks")
+        lines.append("Top allocation sites:")
+        for site, size, count in self.top_sites():
+            lines.append(f"  {site}: {size / 1024:.1f} KiB in {count} blocks")
+        if registry is not None:
+            lines.append("Memory of entities (MiB):")
+            for part, size in entity_memory(registry).items():
+                lines.append(f"  {part:<12} {size / mib:.2f}")
+        return "\n".join(lines)
+
+
+def _deep_size(obj, seen):
+    # Size of *obj* and what it holds, skipping other entities and what is
+    # in *seen*.
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += _deep_size(key, seen) + _deep_size(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += _deep_size(item, seen)
+    elif isinstance(obj, mat_types.MatObject):
+        for key, value in vars(obj).items():
+            if key in ("cls", "registry") or isinstance(value, mat_types.MatModule):
+                continue
+            size += _deep_size(key, seen) + _deep_size(value, seen)
+    return size
+
+
+def entity_memory(registry):
+    """
+    Return the bytes held by the entities of *registry* as a dictionary of
+    ``docstrings``, ``properties`` and ``methods`` of classes, including
+    enumerations, and ``other`` fields. Docstrings of members count as
+    docstrings only.
+    """
+    entities = [
+        entity
+        for entity in map(registry.entities_table.get, registry.name_index.names)
+        if isinstance(entity, mat_types.MatObject)
+        and not isinstance(entity, mat_types.MatModule)
+    ]
+    seen = set()
+    totals = dict.fromkeys(("docstrings", "properties", "methods", "other"), 0)
+    for entity in entities:
+        docstrings = [getattr(entity, "docstring", None)]
+        if isinstance(entity, mat_types.MatClass):
+            docstrings += [meth.docstring for meth in entity.methods.values()]
+            docstrings += [prop.get("docstring") for prop in entity.properties.values()]
+            docstrings += [
+                enum.get("docstring") for enum in entity.enumerations.values()
+            ]
+        for docstring in docstrings:
+            if docstring is not None:
+                totals["docstrings"] += _deep_size(docstring, seen)
+    for entity in entities:
+        if isinstance(entity, mat_types.MatClass):
+            totals["properties"] += _deep_size(entity.properties, seen)
+            totals["properties"] += _deep_size(entity.enumerations, seen)
+            totals["methods"] += _deep_size(entity.methods, seen)
+        totals["other"] += _deep_size(entity, seen)
+    return totals
+
+
+def memory_profile():
+    """Return the :class:`MemoryProfile` of the current registry, or None if
+    memory is not profiled."""
+    return mat_types.current_registry().memory_profile
+
+
+def mark(name):
+    """Record the memory at the end of the stage *name*, if profiled."""
+    profile = memory_profile()
+    if profile is not None:
+        profile.mark(name)
+
+
+def builder_inited(app):
+    # Start before `analyze`, such that the analysis is traced.
+    registry = mat_types.registry_for(app)
+    if getattr(app.config, "matlab_memory_profile", False):
+        if registry.memory_profile is None:
+            registry.memory_profile = MemoryProfile()
+    elif registry.memory_profile is not None:
+        registry.memory_profile.stop()
+        registry.memory_profile = None
+
+
+def doctree_read(app, doctree):
+    profile = mat_types.registry_for(app).memory_profile
+    if profile is not None:
+        profile.mark(f"read {app.env.docname}")
+
+
+def build_finished(app, exception):
+    registry = mat_types.registry_for(app)
+    profile = registry.memory_profile
+    if profile is None:
+        return
+    logger.info(
+        "[sphinxcontrib-matlabdomain] %s",
+        profile.report(registry),
+    )
+    profile.stop()
+    registry.memory_profile = None
@@ -0,0 +1,116 @@
+"""
+sphinxcontrib.mat_scan
+~~~~~~~~~~~~~~~~~~~~~~
+
+Find the MATLAB entities that the Sphinx source documents refer to.
+
+Used by :func:`sphinxcontrib.mat_types.analyze` to parse only these entities,
+instead of all of ``matlab_src_dir``, if ``matlab_scan_referenced_only`` is
+set. The documents are scanned with regular expressions before Sphinx reads
+them, anything that is missed is loaded on demand.
+
+:copyright: Copyright 2025 by the sphinxcontrib-matlabdomain team.
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+import re
+
+from sphinx.util.matching import Matcher
+
+directive_re = re.compile(r"^[ \t]*\.\.[ \t]+(?:(\w+):)?([\w-]+)::[ \t]*(.*)$", re.M)
+role_re = re.compile(r":(?:(\w+):)?(\w+):`([^`]+)`")
+
+#: directives that set the current module, like they do for Python
+module_directives = ("module", "currentmodule", "automodule")
+
+#: roles that refer to MATLAB entities
+entity_roles = ("mod", "func", "class", "meth", "attr", "scpt", "app", "obj")
+
+
+def source_documents(app):
+    """Yield the paths of the source documents of *app*."""
+    suffixes = app.config.source_suffix
+    suffixes = (suffixes,) if isinstance(suffixes, str) else tuple(suffixes)
+    excluded = Matcher(app.config.exclude_patterns)
+    build_dirs = {os.path.abspath(app.outdir), os.path.abspath(app.doctreedir)}
+    for dirpath, dirnames, filenames in os.walk(app.srcdir):
+        dirnames[:] = [
+            d
+            for d in dirnames
+            if not d.startswith(".")
+            and os.path.abspath(os.path.join(dirpath, d)) not in build_dirs
+        ]
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            relpath = os.path.relpath(path, app.srcdir).replace(os.sep, "/")
+            if filename.endswith(suffixes) and not excluded(relpath):
+                yield path
+
+
+def entity_name(target):
+    """Entity name of a directive argument or role target."""
+    if "<" in target and target.endswith(">"):
+        # :class:`title <target>`
+        target = target[target.rindex("<") + 1 : -1]
+    target = target.lstrip("~!").strip()
+    # autofunction:: name(args)
+    return target.split("(")[0]
+
+
+def referenced_entities(text, primary_domain=None):
+    """
+    Find the entities that the document *text* refers to.
+
+    :param primary_domain: Default domain of the document, unprefixed
+        directives and roles are MATLAB ones if it is ``"mat"``.
+    :returns: List of ``(candidates, members)`` tuples. *candidates* are the
+        dotted names the entity may have, relative to the current module
+        first. *members* is True for ``automodule``, which documents all
+        members of the module.
+    """
+    current = None
+    domain = primary_domain
+    found = []
+    # Directives and roles, in the order they appear in the document.
+    events = [(m.start(), "directive", m) for m in directive_re.finditer(text)]
+    events += [(m.start(), "role", m) for m in role_re.finditer(text)]
+    for _, kind, match in sorted(events, key=lambda event: event[0]):
+        prefix, name, argument = match.groups()
+        if kind == "directive" and name == "default-domain":
+            domain = argument.strip() or None
+            continue
+        if (prefix or domain) != "mat":
+            continue
+        if kind == "role" and name not in entity_roles:
+            continue
+        if kind == "directive" and not (
+            name.startswith("auto") or name in module_directives
+        ):
+            continue
+
+        target = entity_name(argument)
+        if kind == "directive" and name in module_directives:
+            # Module names are absolute.
+            current = None if target in ("", ".", "None") else target
+            if name == "automodule":
+                found.append(([current or ""], True))
+            continue
+        if not target:
+            continue
+        candidates = [target]
+        if current:
+            candidates.insert(0, f"{current}.{target}")
+        found.append((candidates, False))
+    return found
+
+
+def referenced_in_documents(app):
+    """Entities the source documents of *app* refer to, see
+    :func:`referenced_entities`."""
+    found = []
+    for path in source_documents(app):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            text = f.read()
+        found.extend(referenced_entities(text, app.config.primary_domain))
+    return found
@@ -0,0 +1,170 @@
+"""
+sphinxcontrib.mat_trace
+~~~~~~~~~~~~~~~~~~~~~~~
+
+Trace of the build phases in the Trace Event Format, enabled with
+``matlab_trace_file``. The file can be opened in https://ui.perfetto.dev or
+``chrome://tracing``.
+
+Spans are recorded for walking ``matlab_src_dir``, parsing each file, the
+alias passes, each autodoc directive, the auto-linking of each docstring and
+the resolution of each cross-reference. Each span carries the process and
+thread it ran in, such that the threads of ``matlab_parse_workers`` and the
+worker processes of ``sphinx-matlab-cache`` show up as rows of one timeline.
+
+:copyright: Copyright 2025 by the sphinxcontrib-matlabdomain team.
+:license: BSD, see LICENSE for details.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from sphinx.util.logging import getLogger
+
+from sphinxcontrib import mat_types
+
+logger = getLogger("matlab-domain")
+
+
+def _now():
+    # Microseconds of a clock shared by the processes of a machine.
+    return time.perf_counter_ns() // 1000
+
+
+class Tracer(object):
+    """
+    Spans recorded for the trace file, as Trace Event Format "complete"
+    events. Threads may record spans concurrently.
+    """
+
+    def __init__(self):
+        #: recorded events
+        self.events = []
+        #: process the tracer was created in
+        self.pid = os.getpid()
+        self._threads = set()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name, cat, **args):
+        """Context manager that records a span *name* of the category *cat*
+        for the time the block runs, with the arguments *args*."""
+        start = _now()
+        try:
+            yield
+        finally:
+            self.add(name, cat, start, _now() - start, args)
+
+    def add(self, name, cat, start, duration, args=None):
+        """Record the span *name* that started at *start* and took
+        *duration* microseconds, in the running thread."""
+        pid = os.getpid()
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": start,
+            "dur": duration,
+            "pid": pid,
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            if (pid, thread.ident) not in self._threads:
+                self._threads.add((pid, thread.ident))
+                self.events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": pid,
+                        "tid": thread.ident,
+                        "args": {"name": thread.name},
+                    }
+                )
+            self.events.append(event)
+
+    def extend(self, events):
+        """Add the *events* recorded by another tracer, e.g. in a worker
+        process, see :meth:`take_events`."""
+        with self._lock:
+            self.events.extend(events)
+
+    def take_events(self):
+        """Remove and return the events recorded in this process since it
+        was forked from the process of the tracer, if it was."""
+        pid = os.getpid()
+        with self._lock:
+            taken = [event for event in self.events if event["pid"] == pid]
+            self.events = [event for event in self.events if event["pid"] != pid]
+        return taken
+
+    def write(self, filename):
+        """Write all events to *filename*, replacing it at once."""
+        processes = sorted({event["pid"] for event in self.events})
+        metadata = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": "sphinx" if pid == self.pid else f"worker {pid}"},
+            }
+            for pid in processes
+        ]
+        tmpname = f"{filename}.{os.getpid()}.tmp"
+        with open(tmpname, "w", encoding="utf-8") as f:
+            json.dump(
+                {"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}, f
+            )
+        os.replace(tmpname, filename)
+
+
+def tracer():
+    """Return the :class:`Tracer` of the current registry, or None if not
+    tracing."""
+    return mat_types.current_registry().tracer
+
+
+def span(name, cat, **args):
+    """Context manager that records a span with the tracer of the current
+    registry, if any, see :meth:`Tracer.span`."""
+    current = tracer()
+    if current is None:
+        return nullcontext()
+    return current.span(name, cat, **args)
+
+
+def trace_file(app):
+    """Return the full path of ``matlab_trace_file``, or None if not set."""
+    filename = getattr(app.config, "matlab_trace_file", None)
+    if not filename:
+        return None
+    return os.path.join(app.confdir, filename)
+
+
+def builder_inited(app):
+    # Start before `analyze`, such that the analysis is traced.
+    registry = mat_types.registry_for(app)
+    if trace_file(app):
+        if registry.tracer is None:
+            registry.tracer = Tracer()
+    else:
+        registry.tracer = None
+
+
+def build_finished(app, exception):
+    registry = mat_types.registry_for(app)
+    filename = trace_file(app)
+    if registry.tracer is None or filename is None:
+        return
+    registry.tracer.write(filename)
+    logger.info(
+        "[sphinxcontrib-matlabdomain] Wrote %d trace events to %s.",
+        len(registry.tracer.events),
+        filename,
+    )
+    registry.tracer = None
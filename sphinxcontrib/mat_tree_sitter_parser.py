@@ -1,4 +1,8 @@
 import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
 from importlib.metadata import version
 
 import tree_sitter_matlab as tsml
@@ -43,14 +47,107 @@ MATLAB_ATTRIBUTE_DEFAULTS = {
 }
 
 
-tree_sitter_ver = tuple([int(sec) for sec in version("tree_sitter").split(".")])
-if tree_sitter_ver[1] == 21:
-    ML_LANG = Language(tsml.language(), "matlab")
-else:
+def tree_sitter_is_0_21():
+    """Check if tree-sitter is v0.21.* in order to use the correct language initialization and syntax."""
+    if not hasattr(tree_sitter_is_0_21, "is_21"):
+        tree_sitter_ver = tuple([int(sec) for sec in version("tree_sitter").split(".")])
+        tree_sitter_is_0_21.is_21 = tree_sitter_ver[1] == 21  # memoize
+    return tree_sitter_is_0_21.is_21
+
+
+try:
     ML_LANG = Language(tsml.language())
+except TypeError:
+    # tree-sitter v0.21.* requires a name. Checked by signature rather than
+    # with `tree_sitter_is_0_21`, which reads package metadata on import.
+    ML_LANG = Language(tsml.language(), "matlab")
+
+
+class ParseTimeout(Exception):
+    """Raised when extracting the definitions of a file takes longer than the
+    budget set with :func:`time_budget`."""
+
+
+# Deadline of the parsers in this thread, see `time_budget`.
+_budget = threading.local()
+
+
+@contextmanager
+def time_budget(seconds):
+    """
+    Context manager that limits the time the parsers in the current thread
+    may take to *seconds*, or not at all if *seconds* is None. Checked before
+    each query and each node walked by :func:`iter_children`, so a query
+    running over a huge node is not interrupted, but the next step raises
+    :class:`ParseTimeout`.
+    """
+    _budget.deadline = time.monotonic() + seconds if seconds else None
+    try:
+        yield
+    finally:
+        _budget.deadline = None
+
+
+def check_time_budget():
+    """Raise :class:`ParseTimeout` if the :func:`time_budget` is exceeded."""
+    deadline = getattr(_budget, "deadline", None)
+    if deadline is not None and time.monotonic() > deadline:
+        raise ParseTimeout()
+
+
+# Held while compiling a query. Also held while running one if the GIL is
+# disabled, as tree-sitter may use one query cursor for all queries.
+_query_lock = threading.RLock()
+
+
+def gil_enabled():
+    """Return False on free-threaded CPython running without the GIL."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is None or is_gil_enabled()
+
+
+class LazyQuery:
+    """
+    A tree-sitter query on :data:`ML_LANG` that is compiled on first use.
+
+    Compiling all queries takes a noticeable part of the import time, which
+    every Sphinx build pays, whether or not MATLAB sources are parsed.
+    Attributes, e.g. ``matches`` and ``captures``, are those of the compiled
+    query. The compiled query is shared by all threads.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self._query = None
+
+    @property
+    def query(self):
+        if self._query is None:
+            with _query_lock:
+                if self._query is None:
+                    self._query = ML_LANG.query(self.source)
+        return self._query
+
+    def matches(self, *args, **kwargs):
+        check_time_budget()
+        if gil_enabled():
+            return self.query.matches(*args, **kwargs)
+        with _query_lock:
+            return self.query.matches(*args, **kwargs)
+
+    def captures(self, *args, **kwargs):
+        check_time_budget()
+        if gil_enabled():
+            return self.query.captures(*args, **kwargs)
+        with _query_lock:
+            return self.query.captures(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.query, name)
+
 
 # QUERIES
-q_classdef = ML_LANG.query(
+q_classdef = LazyQuery(
     """(class_definition
     .
     "classdef"
@@ -70,7 +167,7 @@ q_classdef = ML_LANG.query(
 """
 )
 
-q_attributes = ML_LANG.query(
+q_attributes = LazyQuery(
     """(attribute
     (identifier) @name
     [
@@ -84,9 +181,9 @@ q_attributes = ML_LANG.query(
     """
 )
 
-q_supers = ML_LANG.query("""[(identifier) @secs "."]+ """)
+q_supers = LazyQuery("""[(identifier) @secs "."]+ """)
 
-q_properties = ML_LANG.query(
+q_properties = LazyQuery(
     """(properties
     .
     (attributes
@@ -97,7 +194,7 @@ q_properties = ML_LANG.query(
 """
 )
 
-q_methods = ML_LANG.query(
+q_methods = LazyQuery(
     """(methods
     (attributes
         [(attribute) @attrs _]+
@@ -107,14 +204,14 @@ q_methods = ML_LANG.query(
 """
 )
 
-q_enumerations = ML_LANG.query(
+q_enumerations = LazyQuery(
     """(enumeration
     [(enum) @enums _]+
     ) @enum_block
 """
 )
 
-q_events = ML_LANG.query(
+q_events = LazyQuery(
     """(events
     (attributes
         [(attribute) @attrs _]+
@@ -124,7 +221,7 @@ q_events = ML_LANG.query(
 """
 )
 
-q_property = ML_LANG.query(
+q_property = LazyQuery(
     """
     (property name: (identifier) @name
      (dimensions
@@ -142,7 +239,7 @@ q_property = ML_LANG.query(
 """
 )
 
-q_old_property = ML_LANG.query(
+q_old_property = LazyQuery(
     """
     (property name: (identifier) @name
      (identifier) @type
@@ -153,7 +250,7 @@ q_old_property = ML_LANG.query(
 """
 )
 
-q_enum = ML_LANG.query(
+q_enum = LazyQuery(
     """(enum
     .
     (identifier) @name
@@ -162,7 +259,7 @@ q_enum = ML_LANG.query(
 """
 )
 
-q_fun = ML_LANG.query(
+q_fun = LazyQuery(
     """(function_definition
     _*
     (function_output
@@ -187,7 +284,7 @@ q_fun = ML_LANG.query(
 """
 )
 
-q_argblock = ML_LANG.query(
+q_argblock = LazyQuery(
     """
     (arguments_statement
     .
@@ -200,7 +297,7 @@ q_argblock = ML_LANG.query(
 """
 )
 
-q_arg = ML_LANG.query(
+q_arg = LazyQuery(
     """
     (property name:
         [
@@ -222,7 +319,7 @@ q_arg = ML_LANG.query(
 """
 )
 
-q_script = ML_LANG.query(
+q_script = LazyQuery(
     """
     (source_file
         (comment)? @docstring
@@ -230,9 +327,14 @@ q_script = ML_LANG.query(
     """
 )
 
-q_get_set = ML_LANG.query("""["get." "set."]""")
+q_get_set = LazyQuery("""["get." "set."]""")
 
-q_line_continuation = ML_LANG.query("(line_continuation) @lc")
+q_line_continuation = LazyQuery("(line_continuation) @lc")
+
+# assume that functions and classes always start with a keyword
+q_is_function = LazyQuery(r"""(source_file [(comment) "\n"]* (function_definition))""")
+
+q_is_class = LazyQuery("(class_definition)")
 
 
 re_percent_remove = re.compile(r"^[ \t]*% ?", flags=re.M)
@@ -240,14 +342,6 @@ re_trim_line = re.compile(r"^[ \t]*", flags=re.M)
 re_assign_remove = re.compile(r"^=[ \t]*")
 
 
-def tree_sitter_is_0_21():
-    """Check if tree-sitter is v0.21.* in order to use the correct language initialization and syntax."""
-    if not hasattr(tree_sitter_is_0_21, "is_21"):
-        tree_sitter_ver = tuple([int(sec) for sec in version("tree_sitter").split(".")])
-        tree_sitter_is_0_21.is_21 = tree_sitter_ver[1] == 21  # memoize
-    return tree_sitter_is_0_21.is_21
-
-
 def get_row(point):
     """Get row from point. This api changed from v0.21.3 to v0.22.0"""
     if tree_sitter_is_0_21():
@@ -308,7 +402,7 @@ class MatFunctionParser:
     def __init__(self, root_node, encoding):
         """Parse Function definition"""
         self.encoding = encoding
-        _, fun_match = q_fun.matches(root_node)[0]
+        fun_match = self._match_function(root_node)
         self.name = fun_match.get("name").text.decode(
             self.encoding, errors="backslashreplace"
         )
@@ -363,8 +457,17 @@ class MatFunctionParser:
             docstring = None
         self.docstring = docstring
 
+    def _match_function(self, node):
+        return q_fun.matches(node)[0][1]
+
+    def _match_argblock(self, argblock_node):
+        return q_argblock.matches(argblock_node)[0][1]
+
+    def _match_arg(self, arg_node):
+        return q_arg.matches(arg_node)[0][1]
+
     def _parse_argument_section(self, argblock_node):
-        _, argblock_match = q_argblock.matches(argblock_node)[0]
+        argblock_match = self._match_argblock(argblock_node)
         attrs_nodes = argblock_match.get("attrs")
         attrs = self._parse_attributes(attrs_nodes)
 
@@ -378,7 +481,7 @@ class MatFunctionParser:
         #      might be a good idea to extract common code here.
         for arg in arguments:
             # match property to extract details
-            _, arg_match = q_arg.matches(arg)[0]
+            arg_match = self._match_arg(arg)
 
             # extract name (this is always available so no need for None check)
             name = [
@@ -539,6 +642,9 @@ class MatFunctionParser:
 
 
 class MatClassParser:
+    #: parser of the methods of the class
+    function_parser = MatFunctionParser
+
     def __init__(self, root_node, encoding):
         # DATA
         self.encoding = encoding
@@ -554,10 +660,10 @@ class MatClassParser:
         self.root_node = root_node
 
         # Parse class basics
-        class_matches = q_classdef.matches(root_node)
+        class_match = self._match_class(root_node)
 
         # Bug fix: Handle empty matches gracefully
-        if not class_matches:
+        if class_match is None:
             logger.warning(
                 "[sphinxcontrib-matlabdomain] No class definition found in file, skipping"
             )
@@ -572,7 +678,6 @@ class MatClassParser:
             self.enumerations = {}
             return
 
-        _, class_match = class_matches[0]
         self.cls = class_match.get("class")
         self.name = class_match.get("name")
 
@@ -583,7 +688,7 @@ class MatClassParser:
         supers_nodes = class_match.get("supers")
         if supers_nodes is not None:
             for super_node in supers_nodes:
-                _, super_match = q_supers.matches(super_node)[0]
+                super_match = self._match_supers(super_node)
                 super_cls = [
                     sec.text.decode(self.encoding, errors="backslashreplace")
                     for sec in super_match.get("secs")
@@ -609,20 +714,44 @@ class MatClassParser:
                     )
         self.docstring = docstring
 
-        prop_matches = q_properties.matches(self.cls)
-        method_matches = q_methods.matches(self.cls)
-        enum_matches = q_enumerations.matches(self.cls)
-        event_matches = q_events.matches(self.cls)
-
-        for _, prop_match in prop_matches:
+        sections = self._match_sections(self.cls)
+        for prop_match in sections["properties"]:
             self._parse_property_section(prop_match)
-        for _, enum_match in enum_matches:
+        for enum_match in sections["enumeration"]:
             self._parse_enum_section(enum_match)
-        for _, method_match in method_matches:
+        for method_match in sections["methods"]:
             self._parse_method_section(method_match)
-        for _, event_match in event_matches:
+        for event_match in sections["events"]:
             self._parse_event_section(event_match)
 
+    def _match_class(self, root_node):
+        class_matches = q_classdef.matches(root_node)
+        return class_matches[0][1] if class_matches else None
+
+    def _match_supers(self, super_node):
+        return q_supers.matches(super_node)[0][1]
+
+    def _match_sections(self, cls):
+        """Matches of the properties, methods, enumeration and events blocks."""
+        return {
+            "properties": [match for _, match in q_properties.matches(cls)],
+            "methods": [match for _, match in q_methods.matches(cls)],
+            "enumeration": [match for _, match in q_enumerations.matches(cls)],
+            "events": [match for _, match in q_events.matches(cls)],
+        }
+
+    def _match_property(self, prop):
+        return q_property.matches(prop)[0][1]
+
+    def _match_enum(self, enum):
+        return q_enum.matches(enum)[0][1]
+
+    def _match_attribute(self, attr_node):
+        return q_attributes.matches(attr_node)[0][1]
+
+    def _is_getter_or_setter(self, method):
+        return len(q_get_set.matches(method)) > 0
+
     def _parse_property_section(self, props_match):
         properties = props_match.get("properties")
         if properties is None:
@@ -632,7 +761,7 @@ class MatClassParser:
         attrs = self._parse_attributes(attrs_nodes)
         for prop in properties:
             # match property to extract details
-            _, prop_match = q_property.matches(prop)[0]
+            prop_match = self._match_property(prop)
             # extract name (this is always available so no need for None check)
             name = prop_match.get("name").text.decode(
                 self.encoding, errors="backslashreplace"
@@ -792,11 +921,10 @@ class MatClassParser:
         attrs_nodes = methods_match.get("attrs")
         attrs = self._parse_attributes(attrs_nodes)
         for method in methods:
-            is_set_get = q_get_set.matches(method)
             # Skip getter and setter
-            if len(is_set_get) > 0:
+            if self._is_getter_or_setter(method):
                 continue
-            parsed_function = MatFunctionParser(method, self.encoding)
+            parsed_function = self.function_parser(method, self.encoding)
             self.methods[parsed_function.name] = parsed_function
             self.methods[parsed_function.name].attrs = attrs
 
@@ -805,7 +933,7 @@ class MatClassParser:
         if enums is None:
             return
         for enum in enums:
-            _, enum_match = q_enum.matches(enum)[0]
+            enum_match = self._match_enum(enum)
             name = enum_match.get("name").text.decode(
                 self.encoding, errors="backslashreplace"
             )
@@ -929,7 +1057,7 @@ class MatClassParser:
         attrs = {}
         if attrs_nodes is not None:
             for attr_node in attrs_nodes:
-                _, attr_match = q_attributes.matches(attr_node)[0]
+                attr_match = self._match_attribute(attr_node)
                 name = attr_match.get("name").text.decode(
                     self.encoding, errors="backslashreplace"
                 )
@@ -949,3 +1077,257 @@ class MatClassParser:
                     attrs[name] = MATLAB_ATTRIBUTE_DEFAULTS.get(name)
 
         return attrs
+
+
+def iter_children(node):
+    """Yield ``(field_name, child)`` for the children of `node`, walking them
+    with a single :class:`tree_sitter.TreeCursor`."""
+    check_time_budget()
+    cursor = node.walk()
+    if not cursor.goto_first_child():
+        return
+    yield cursor.field_name, cursor.node
+    while cursor.goto_next_sibling():
+        yield cursor.field_name, cursor.node
+
+
+def named_children_of_type(node, *types):
+    """Children of `node` with one of the node `types`, or None if there are none."""
+    return [child for _, child in iter_children(node) if child.type in types] or None
+
+
+def match_property_node(node, dotted_name=False, size_type=False, default_types=None):
+    """
+    Cursor equivalent of :data:`q_property` and :data:`q_arg`.
+
+    :param dotted_name: Capture the name as list of identifiers, which allows
+        dotted names, e.g. ``opts.name`` in arguments blocks.
+    :param size_type: Capture the old style size type, e.g. ``vector`` in
+        ``pos@double vector``, as ``size_type``.
+    :param default_types: Only capture defaults with a value of these node
+        types, all defaults if None.
+    :returns: Dictionary of captures like ``Query.matches`` returns.
+    """
+    match = {}
+    prev = None
+    for field, child in iter_children(node):
+        if not child.is_named:
+            continue
+        if field == "name":
+            if not dotted_name:
+                match["name"] = child
+            elif child.type == "property_name":
+                match["name"] = named_children_of_type(child, "identifier")
+            else:
+                match["name"] = [child]
+        elif child.type == "dimensions":
+            match["dims"] = named_children_of_type(child, "spread_operator", "number")
+        elif child.type == "identifier":
+            if "type" not in match:
+                match["type"] = child
+            elif size_type and "size_type" not in match and prev is match["type"]:
+                match["size_type"] = child
+        elif child.type == "validation_functions":
+            match["validation_functions"] = named_children_of_type(
+                child, "identifier", "function_call"
+            )
+        elif child.type == "default_value":
+            if default_types is None or named_children_of_type(child, *default_types):
+                match["default"] = child
+        elif child.type == "comment" and "docstring" not in match:
+            match["docstring"] = child
+        prev = child
+    return match
+
+
+class MatFunctionCursorParser(MatFunctionParser):
+    """
+    Parse a function definition like :class:`MatFunctionParser`, but walk the
+    syntax tree with a :class:`tree_sitter.TreeCursor` instead of running a
+    query per node.
+    """
+
+    def _match_function(self, node):
+        if node.type != "function_definition":
+            # A function file, its first function is the main function.
+            node = next(
+                child
+                for _, child in iter_children(node)
+                if child.type == "function_definition"
+            )
+        match = {}
+        for field, child in iter_children(node):
+            if field == "name":
+                match["name"] = child
+            elif child.type == "function_output":
+                outputs = []
+                for _, output in iter_children(child):
+                    if output.type == "identifier":
+                        outputs.append(output)
+                    elif output.type == "multioutput_variable":
+                        outputs.extend(
+                            named_children_of_type(
+                                output, "identifier", "ignored_argument"
+                            )
+                            or []
+                        )
+                match["outputs"] = outputs or None
+            elif child.type == "function_arguments":
+                match["params"] = named_children_of_type(
+                    child, "identifier", "ignored_argument"
+                )
+            elif child.type == "arguments_statement":
+                match.setdefault("argblocks", []).append(child)
+            elif (
+                child.type == "comment" and "name" in match and "docstring" not in match
+            ):
+                match["docstring"] = child
+        return match
+
+    def _match_argblock(self, argblock_node):
+        match = {}
+        for _, child in iter_children(argblock_node):
+            if child.type == "attributes":
+                match["attrs"] = named_children_of_type(child, "identifier")
+            elif child.type == "property":
+                match.setdefault("args", []).append(child)
+        return match
+
+    def _match_arg(self, arg_node):
+        return match_property_node(
+            arg_node, dotted_name=True, default_types=("number", "identifier")
+        )
+
+
+class MatClassCursorParser(MatClassParser):
+    """
+    Parse a class definition like :class:`MatClassParser`, but walk the
+    class definition once with a :class:`tree_sitter.TreeCursor` instead of
+    running a query per block and per member.
+
+    Selected with ``matlab_parser_engine = "cursor"``. Only blocks that are
+    direct children of the class definition are parsed.
+    """
+
+    function_parser = MatFunctionCursorParser
+
+    #: member node types of the class blocks
+    section_members = {
+        "properties": "property",
+        "methods": "function_definition",
+        "enumeration": "enum",
+        "events": "identifier",
+    }
+
+    #: node types of the section match keys, see the corresponding queries
+    section_keys = {
+        "properties": "properties",
+        "methods": "methods",
+        "enumeration": "enums",
+        "events": "events",
+    }
+
+    def _match_class(self, root_node):
+        cls = next(
+            (
+                child
+                for _, child in iter_children(root_node)
+                if child.type == "class_definition"
+            ),
+            None,
+        )
+        if cls is None:
+            return None
+
+        match = {"class": cls}
+        sections = {section: [] for section in self.section_members}
+        header = True
+        for field, child in iter_children(cls):
+            if not child.is_named:
+                continue
+            if field == "name":
+                match["name"] = child
+            elif child.type == "attributes" and "name" not in match:
+                match["attrs"] = named_children_of_type(child, "attribute")
+            elif child.type == "superclasses" and header:
+                match["supers"] = named_children_of_type(child, "property_name")
+            elif child.type in sections:
+                sections[child.type].append(self._match_section(child))
+            elif child.type == "comment" and header and "name" in match:
+                match["docstring"] = child
+            # The docstring must follow the name or superclasses directly.
+            if "name" in match and child.type not in ("identifier", "superclasses"):
+                header = False
+        self._sections = sections
+        return match
+
+    def _match_section(self, section):
+        members = self.section_members[section.type]
+        match = {}
+        items = []
+        for _, child in iter_children(section):
+            if child.type == "attributes":
+                match["attrs"] = named_children_of_type(child, "attribute")
+            elif child.type == members:
+                items.append(child)
+        match[self.section_keys[section.type]] = items or None
+        return match
+
+    def _match_supers(self, super_node):
+        return {"secs": named_children_of_type(super_node, "identifier")}
+
+    def _match_sections(self, cls):
+        return self._sections
+
+    def _match_property(self, prop):
+        return match_property_node(prop, size_type=True)
+
+    def _match_enum(self, enum):
+        match = {}
+        args = []
+        for _, child in iter_children(enum):
+            if not child.is_named:
+                continue
+            if "name" in match:
+                args.append(child)
+            elif child.type == "identifier":
+                match["name"] = child
+            else:
+                break
+        match["args"] = args or None
+        return match
+
+    def _match_attribute(self, attr_node):
+        match = {}
+        for _, child in iter_children(attr_node):
+            if not child.is_named:
+                continue
+            if "name" not in match:
+                if child.type == "identifier":
+                    match["name"] = child
+                continue
+            if child.type in ("identifier", "string", "metaclass_operator"):
+                match["rhs"] = child
+                match["value"] = [child]
+            elif child.type == "cell":
+                row = next(
+                    (row for _, row in iter_children(child) if row.type == "row"),
+                    None,
+                )
+                if row is not None:
+                    match["rhs"] = child
+                    match["value"] = named_children_of_type(
+                        row, "metaclass_operator"
+                    ) or named_children_of_type(row, "string")
+            break
+        return match
+
+    def _is_getter_or_setter(self, method):
+        return any(child.type in ("get.", "set.") for _, child in iter_children(method))
+
+
+#: class and function parsers by ``matlab_parser_engine``
+PARSER_ENGINES = {
+    "query": (MatClassParser, MatFunctionParser),
+    "cursor": (MatClassCursorParser, MatFunctionCursorParser),
+}
@@ -8,20 +8,36 @@ Types for MATLAB.
 :license: BSD, see LICENSE for details.
 """
 
+import hashlib
+import mmap
 import os
+import re
+import sqlite3
+import threading
+import time
 import xml.etree.ElementTree as ET
-from importlib.metadata import version
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from io import open  # for opening files with encoding in Python 2
+from types import SimpleNamespace
 from zipfile import ZipFile
 
 from sphinx.util.logging import getLogger
+from sphinx.util.matching import Matcher
 from tree_sitter import Parser
 
+from sphinxcontrib import mat_cache, mat_index, mat_profile, mat_scan, mat_trace
 from sphinxcontrib.mat_tree_sitter_parser import (
     ML_LANG,
-    MatClassParser,
-    MatFunctionParser,
+    PARSER_ENGINES,
     MatScriptParser,
+    ParseTimeout,
+    q_is_class,
+    q_is_function,
+    time_budget,
+    tree_sitter_is_0_21,
 )
 
 logger = getLogger("matlab-domain")
@@ -100,18 +116,234 @@ MATLAB_METHOD_ATTRIBUTE_TYPES = {
     "TestTags": list,
 }
 
+
+class _CurrentTable(object):
+    # Module-level stand-in for the table *name* of the current `Registry`,
+    # see `current_registry`. Code that reads a table often should get it from
+    # the registry once instead.
+    __slots__ = ("_name",)
+
+    def __init__(self, name):
+        self._name = name
+
+    def _table(self):
+        return getattr(current_registry(), self._name)
+
+    def __getattr__(self, attr):
+        return getattr(self._table(), attr)
+
+    def __getitem__(self, key):
+        return self._table()[key]
+
+    def __setitem__(self, key, value):
+        self._table()[key] = value
+
+    def __delitem__(self, key):
+        del self._table()[key]
+
+    def __contains__(self, key):
+        return key in self._table()
+
+    def __iter__(self):
+        return iter(self._table())
+
+    def __len__(self):
+        return len(self._table())
+
+    def __bool__(self):
+        return bool(self._table())
+
+    def __eq__(self, other):
+        return self._table() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self._table())
+
+
 # Dictionary containing all MATLAB entities that are found in `matlab_src_dir`.
 # The dictionary keys are both the full dotted path, relative to the root.
 # Further, "short names" are added. Example:
 #   Given a dotted path of: target.+package.ClassBar
 #   Will result in a short name of: package.ClassBar
-entities_table = {}
+entities_table = _CurrentTable("entities_table")
 
 # Dictionary containing a map of names WITHOUT '+' in package names to
 # the corresponding names WITH '+' in the package name. This is only
 # used if "matlab_auto_link" is on AND "matlab_keep_package_prefix"
 # is True AND a docstring with "see also" is encountered.
-entities_name_map = {}
+entities_name_map = _CurrentTable("entities_name_map")
+
+#: Alternative names of one entity in `entities_table`, see `NameIndex`.
+EntityNames = namedtuple(
+    "EntityNames", ["canonical", "short", "class_folder", "stripped"]
+)
+
+
+class NameIndex(object):
+    """
+    Alternative names of the entities in ``entities_table``.
+
+    The names are computed once, while ``populate_entities_table`` traverses
+    the entity hierarchy, and are then looked up in constant time by the class
+    folder and short name passes of :func:`analyze`.
+    """
+
+    def __init__(self):
+        #: :class:`EntityNames` by canonical dotted path
+        self.names = {}
+        #: canonical dotted paths of class folder modules, in traversal order
+        self.class_folders = []
+
+    def clear(self):
+        self.names.clear()
+        self.class_folders.clear()
+
+    def add(self, name, entity):
+        """Index the names of *entity* found at the canonical path *name*."""
+        self.names[name] = self.compute(name)
+        if _is_class_folder_module(name, entity) and name not in self.class_folders:
+            self.class_folders.append(name)
+
+    def discard(self, name):
+        self.names.pop(name, None)
+        if name in self.class_folders:
+            self.class_folders.remove(name)
+
+    def get(self, name):
+        """Return the :class:`EntityNames` of *name*, indexed or not."""
+        names = self.names.get(name)
+        if names is None:
+            names = self.compute(name)
+        return names
+
+    @staticmethod
+    def compute(name):
+        return EntityNames(
+            name,
+            shortest_name(name),
+            classfolder_class_name(name),
+            strip_package_prefix(name),
+        )
+
+
+name_index = _CurrentTable("name_index")
+
+# Snapshot of `matlab_src_dir`, see `snapshot_tree`, taken when the entities in
+# `entities_table` were last brought up to date. Maps the base directory to
+# its snapshot, such that a later `analyze` of the same directory only has to
+# re-parse what changed.
+tree_snapshots = _CurrentTable("tree_snapshots")
+
+# Folders on the MATLAB path by the names of their entries, see `_path_folders`.
+path_index = _CurrentTable("path_index")
+
+# Files for which parsing exceeded `matlab_parse_timeout`, by their full path,
+# with their (mtime_ns, size) at that time. Kept in the Sphinx environment, so
+# later builds go straight to the header of unchanged files.
+slow_files = _CurrentTable("slow_files")
+
+# Entities parsed ahead by `prefetch_mfiles`, by the full path of their file.
+prefetched = _CurrentTable("prefetched")
+
+# Paths relative to `MatObject.basedir` skipped by `matlab_exclude_patterns`,
+# see `is_excluded`.
+excluded_paths = _CurrentTable("excluded_paths")
+
+
+class Registry(object):
+    """
+    The entities of one MATLAB source tree and the context they are analyzed
+    in.
+
+    The module-level tables, e.g. ``entities_table``, and the class attributes
+    :attr:`MatObject.basedir`, :attr:`MatObject.sphinx_env` and
+    :attr:`MatObject.sphinx_app` are those of the registry that is current in
+    the running thread, see :meth:`activated`. Without one, the
+    ``default_registry`` is current. Each Sphinx application has a registry of
+    its own, see :func:`registry_for`.
+
+    :param basedir: Folder with the MATLAB sources.
+    :type basedir: str
+    :param env: Sphinx environment, or any object with a ``config`` holding
+        the ``matlab_*`` config values.
+    :param app: Sphinx application, None outside of Sphinx.
+    """
+
+    def __init__(self, basedir=None, env=None, app=None):
+        self.basedir = basedir
+        self.env = env
+        self.app = app
+        #: see the module-level tables of the same names
+        self.entities_table = {}
+        self.entities_name_map = {}
+        self.name_index = NameIndex()
+        self.tree_snapshots = {}
+        self.path_index = {}
+        self.slow_files = {}
+        self.slow_files_lock = threading.Lock()
+        self.prefetched = {}
+        self.excluded_paths = set()
+        #: see :class:`MatModuleAnalyzer`
+        self.analyzer_cache = {}
+        #: :class:`mat_index.MatIndex` of ``matlab_index_file``, see
+        #: :func:`open_index`
+        self.index = None
+        #: True if entities were parsed rather than taken from ``index``, see
+        #: :func:`index_outdated`
+        self.index_outdated = False
+        #: see :func:`names_digest`, None if not computed
+        self.names_digest = None
+        #: :class:`mat_cache.ParseCache` of ``matlab_cache_dir``, see
+        #: :func:`parse_cache`
+        self.parse_cache = None
+        #: :class:`mat_profile.MemoryProfile` if ``matlab_memory_profile``
+        self.memory_profile = None
+        #: :class:`mat_trace.Tracer` if ``matlab_trace_file``
+        self.tracer = None
+
+    def activate(self):
+        """Make this registry current in the running thread, until another is
+        activated, e.g. in a worker process of its own. Prefer
+        :meth:`activated`, which does not keep the registry alive."""
+        _current.registry = self
+
+    @contextmanager
+    def activated(self):
+        """Context manager that makes this registry current in the running
+        thread."""
+        previous = getattr(_current, "registry", None)
+        _current.registry = self
+        try:
+            yield self
+        finally:
+            _current.registry = previous
+
+
+_current = threading.local()
+
+#: Registry used when no other is current.
+default_registry = Registry()
+
+
+def current_registry():
+    """Return the :class:`Registry` that is current in the running thread."""
+    return getattr(_current, "registry", None) or default_registry
+
+
+def registry_for(app):
+    """
+    Return the :class:`Registry` of the Sphinx application *app*, created on
+    first use. Each application has a registry of its own, such that several
+    applications can be built in one process, also in threads. The registry
+    lives as long as the application, and a rebuild of it only re-parses what
+    changed.
+    """
+    registry = getattr(app, "matlab_registry", None)
+    if registry is None:
+        registry = app.matlab_registry = Registry(app=app)
+    return registry
 
 
 def shortest_name(dotted_path):
@@ -164,6 +396,381 @@ def recursive_find_all(obj):
                 recursive_find_all(o)
 
 
+def debug_enabled():
+    """Return True if Sphinx shows debug messages, i.e. runs with ``-vv``.
+
+    Used to skip building debug messages that are expensive to format.
+    """
+    app = MatObject.sphinx_app
+    return app is not None and app.verbosity >= 2
+
+
+def parser_engine_name():
+    """Return the name of the parsers selected by ``matlab_parser_engine``."""
+    env = MatObject.sphinx_env
+    engine = getattr(env.config, "matlab_parser_engine", "query") if env else "query"
+    return engine if engine in PARSER_ENGINES else "query"
+
+
+def parser_engine():
+    """Return the class and function parsers selected by ``matlab_parser_engine``."""
+    return PARSER_ENGINES[parser_engine_name()]
+
+
+def scan_referenced_only():
+    """Return True if only entities the documents refer to are loaded, i.e.
+    ``matlab_scan_referenced_only`` is set. See :func:`load_entity`."""
+    env = MatObject.sphinx_env
+    return bool(env and getattr(env.config, "matlab_scan_referenced_only", False))
+
+
+def mmap_threshold():
+    """Return the size in bytes from which MATLAB files are memory-mapped, i.e.
+    ``matlab_mmap_threshold``, or None if they are always read."""
+    env = MatObject.sphinx_env
+    if env is None:
+        return None
+    return getattr(env.config, "matlab_mmap_threshold", None)
+
+
+@contextmanager
+def read_source(mfile):
+    """
+    Context manager that yields the contents of *mfile* for the parser.
+
+    Files of at least :func:`mmap_threshold` bytes are memory-mapped instead of
+    read into a :class:`bytes` object, tree-sitter parses the mapped pages
+    without a copy. The mapping is closed on exit, so nodes of a tree parsed
+    from it must not be used after the ``with`` block.
+    """
+    with open(mfile, "rb") as code_f:
+        threshold = mmap_threshold()
+        size = os.fstat(code_f.fileno()).st_size
+        # tree-sitter v0.21.* only parses bytes, empty files cannot be mapped
+        if threshold is None or size == 0 or size < threshold or tree_sitter_is_0_21():
+            yield code_f.read()
+            return
+        with mmap.mmap(code_f.fileno(), 0, access=mmap.ACCESS_READ) as code:
+            yield code
+
+
+@lru_cache(maxsize=8)
+def _path_matcher(patterns):
+    return Matcher(patterns)
+
+
+def _relative_path(path):
+    # *path* relative to `MatObject.basedir`, with "/" as separator like in
+    # Sphinx' exclude_patterns.
+    return os.path.relpath(path, MatObject.basedir).replace(os.sep, "/")
+
+
+def is_excluded(path):
+    """
+    Return True if *path* matches one of ``matlab_exclude_patterns``, which are
+    relative to :attr:`MatObject.basedir`. Excluded folders are not descended
+    into. Each excluded path is logged once and collected in
+    ``excluded_paths``.
+    """
+    env = MatObject.sphinx_env
+    patterns = getattr(env.config, "matlab_exclude_patterns", None) if env else None
+    if not patterns or MatObject.basedir is None:
+        return False
+    relpath = _relative_path(path)
+    if not _path_matcher(tuple(patterns))(relpath):
+        return False
+    if relpath not in excluded_paths:
+        excluded_paths.add(relpath)
+        logger.debug(
+            "[sphinxcontrib-matlabdomain] Excluded %s by matlab_exclude_patterns.",
+            relpath,
+        )
+    return True
+
+
+def header_only(mfile):
+    """
+    Return True if only the header of *mfile* is parsed, i.e. the file has at
+    least ``matlab_header_only_size`` bytes or its path, relative to
+    :attr:`MatObject.basedir`, matches one of ``matlab_header_only_patterns``.
+    """
+    env = MatObject.sphinx_env
+    if env is None:
+        return False
+    limit = getattr(env.config, "matlab_header_only_size", None)
+    if limit is not None and os.path.getsize(mfile) >= limit:
+        return True
+    patterns = getattr(env.config, "matlab_header_only_patterns", None)
+    if not patterns or MatObject.basedir is None:
+        return False
+    return _path_matcher(tuple(patterns))(_relative_path(mfile))
+
+
+# first statement of a function or class file
+header_re = re.compile(rb"(classdef|function)\b")
+
+
+def read_header(mfile):
+    """
+    Read the leading comments, the first ``classdef`` or ``function``
+    statement and the docstring that follows it from *mfile*. The statement is
+    closed with ``end``, such that the header parses like a file without
+    members or body. For scripts, read up to the end of the first comment.
+    Reading stops at the first line after the docstring, the rest of the file
+    is never read.
+    """
+    lines = []
+    header = False  # classdef or function statement read
+    code = False  # script code read
+    comment = False  # comment before the first statement read
+    docstring = False  # comment after the first statement read
+    block = False  # inside a %{ ... %} block comment
+    with open(mfile, "rb") as code_f:
+        for line in code_f:
+            stripped = line.strip()
+            if block:
+                block = stripped != b"%}"
+            elif stripped.startswith(b"%"):
+                block = stripped == b"%{"
+                if header or code:
+                    docstring = True
+                else:
+                    comment = True
+            elif not stripped:
+                if docstring:
+                    break
+            elif header or docstring:
+                break
+            elif header_re.match(stripped) and not code:
+                header = True
+                # the statement may continue over several lines
+                while b"..." in line:
+                    lines.append(line)
+                    line = next(code_f, b"")
+            elif comment:
+                # a script documented by its leading comment
+                break
+            else:
+                code = True
+            lines.append(line)
+    if header:
+        lines.append(b"\nend\n")
+    return b"".join(lines)
+
+
+_thread_state = threading.local()
+
+
+def thread_parser():
+    """Return the tree-sitter parser of the current thread, created on first
+    use. Parsers are not thread-safe, compiled queries are shared."""
+    parser = getattr(_thread_state, "parser", None)
+    if parser is None:
+        if tree_sitter_is_0_21():
+            parser = Parser()
+            parser.set_language(ML_LANG)
+        else:
+            parser = Parser(ML_LANG)
+        _thread_state.parser = parser
+    return parser
+
+
+def parse_timeout():
+    """Return the number of seconds parsing a file may take, i.e.
+    ``matlab_parse_timeout``, or None if there is no limit."""
+    env = MatObject.sphinx_env
+    return getattr(env.config, "matlab_parse_timeout", None) if env else None
+
+
+def set_parser_timeout(parser, seconds):
+    """Limit the time tree-sitter takes to parse with *parser*, None for no
+    limit."""
+    micros = max(1, int(seconds * 1e6)) if seconds else 0
+    if tree_sitter_is_0_21():
+        parser.set_timeout_micros(micros)
+    else:
+        parser.timeout_micros = micros
+
+
+def index_file():
+    """Return the full path of ``matlab_index_file``, or None if not set.
+    Relative paths are relative to the Sphinx configuration directory."""
+    env = MatObject.sphinx_env
+    filename = getattr(env.config, "matlab_index_file", None) if env else None
+    if not filename:
+        return None
+    app = MatObject.sphinx_app
+    return os.path.join(app.confdir if app else os.getcwd(), filename)
+
+
+def open_index(filename):
+    """
+    Open the index *filename* written by :func:`save_index`, if it exists, and
+    use it for the current registry. :meth:`MatObject.matlabify` then takes
+    the entities of files that did not change from the index, instead of
+    parsing them. Returns the index or None.
+    """
+    registry = current_registry()
+    index = registry.index
+    if index is not None:
+        if index.filename == filename:
+            return index
+        index.close()
+        registry.index = None
+    if filename is None or not os.path.isfile(filename):
+        return None
+    try:
+        index = mat_index.MatIndex(filename)
+    except sqlite3.DatabaseError as exc:
+        logger.warning(
+            "[sphinxcontrib-matlabdomain] Not using matlab_index_file %s: %s",
+            filename,
+            exc,
+        )
+        return None
+    if index.parser_engine != parser_engine_name():
+        # Written with other parsers, whose entities may differ.
+        index.close()
+        return None
+    registry.index = index
+    return index
+
+
+def index_outdated():
+    """Return True if the index of the current registry does not hold the
+    entities found, i.e. some were parsed rather than taken from it, or it
+    holds other names."""
+    registry = current_registry()
+    if registry.index is None or registry.index_outdated:
+        return True
+    names = {
+        name
+        for name in name_index.names
+        if mat_index.entity_kind(entities_table.get(name)) is not None
+    }
+    return names != set(registry.index.names())
+
+
+def save_index(filename):
+    """Write the entities of the current registry to the index *filename*, see
+    :func:`mat_index.export_index`, and use it from now on."""
+    registry = current_registry()
+    if registry.index is not None:
+        # Release the file before it is replaced.
+        registry.index.close()
+        registry.index = None
+    count = mat_index.export_index(filename, registry)
+    logger.debug(
+        "[sphinxcontrib-matlabdomain] Wrote %d entities to %s.", count, filename
+    )
+    open_index(filename)
+
+
+def parse_cache():
+    """Return the :class:`mat_cache.ParseCache` of ``matlab_cache_dir`` for the
+    current registry, or None if not set. Relative paths are relative to the
+    Sphinx configuration directory."""
+    env = MatObject.sphinx_env
+    directory = getattr(env.config, "matlab_cache_dir", None) if env else None
+    if not directory:
+        return None
+    app = MatObject.sphinx_app
+    directory = os.path.join(app.confdir if app else os.getcwd(), directory)
+    registry = current_registry()
+    cache = registry.parse_cache
+    if cache is None or cache.directory != directory:
+        max_size = getattr(env.config, "matlab_cache_size", mat_cache.DEFAULT_SIZE)
+        cache = registry.parse_cache = mat_cache.ParseCache(directory, max_size)
+    return cache
+
+
+def indexed_entity(mfile):
+    """Return the entity of *mfile* from the index of the current registry, or
+    None if it is not indexed, changed since or is to be parsed otherwise."""
+    index = current_registry().index
+    if index is None:
+        return None
+    entity = index.load(mfile)
+    if entity is None or entity.partial != (header_only(mfile) or is_slow_file(mfile)):
+        return None
+    return entity
+
+
+def _file_signature(mfile):
+    st = os.stat(mfile)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def is_slow_file(mfile):
+    """Return True if parsing *mfile* timed out before and it is unchanged
+    since, see ``slow_files``."""
+    if mfile not in slow_files:
+        return False
+    return slow_files[mfile] == _file_signature(mfile)
+
+
+def remember_slow_file(mfile):
+    """Remember that parsing *mfile* timed out, see :func:`is_slow_file`."""
+    registry = current_registry()
+    with registry.slow_files_lock:
+        registry.slow_files[mfile] = _file_signature(mfile)
+
+
+def parse_workers():
+    """Return the number of threads that parse MATLAB files ahead of
+    :func:`analyze`, i.e. ``matlab_parse_workers``. 0 or 1 parses serially."""
+    env = MatObject.sphinx_env
+    workers = getattr(env.config, "matlab_parse_workers", 0) if env else 0
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def prefetch_mfiles(relpaths, workers):
+    """
+    Parse the MATLAB files *relpaths*, relative to :attr:`MatObject.basedir`,
+    in a pool of *workers* threads and store the entities in ``prefetched``.
+    :meth:`MatObject.matlabify` takes entities from there instead of parsing
+    the files again, such that walking the tree stays serial.
+
+    tree-sitter parses outside the interpreter, the threads run in parallel if
+    the bindings release the GIL or on free-threaded CPython. Unlike a process
+    pool, the entities need not be pickled. Files that fail to parse are left
+    to :meth:`MatObject.matlabify`, which reports the error.
+    """
+    registry = current_registry()
+    basedir = registry.basedir
+    mfiles = [p for p in relpaths if p.endswith(".m")]
+    if registry.index is not None:
+        # Taken from the index by `matlabify`.
+        mfiles = [
+            p for p in mfiles if not registry.index.is_current(os.path.join(basedir, p))
+        ]
+
+    def parse(relpath):
+        path, filename = os.path.split(relpath)
+        name = os.path.splitext(filename)[0]
+        mfile = os.path.join(basedir, relpath)
+        with registry.activated():
+            entity = MatObject.parse_mfile(mfile, name, path, MatObject.encoding)
+        return mfile, entity
+
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="matlab-parse"
+    ) as executor:
+        futures = [executor.submit(parse, relpath) for relpath in mfiles]
+        for future in futures:
+            if future.exception() is None:
+                mfile, entity = future.result()
+                registry.prefetched[mfile] = entity
+    logger.debug(
+        "[sphinxcontrib-matlabdomain] Parsed %d of %d files with %d threads.",
+        len(registry.prefetched),
+        len(mfiles),
+        workers,
+    )
+
+
 def recursive_log_debug(obj, indent=""):
     # Traverse the object hierarchy and log to debug
     # Bug fix: Check if obj.entities exists and is not None
@@ -171,16 +778,12 @@ def recursive_log_debug(obj, indent=""):
         return
 
     for n, o in obj.entities:
-        logger.debug(
-            "[sphinxcontrib-matlabdomain] %s Name=%s, Entity=%s", indent, n, str(o)
-        )
+        logger.debug("[sphinxcontrib-matlabdomain] %s Name=%s, Entity=%s", indent, n, o)
         if isinstance(o, MatModule):
             if o.entities:
                 indent = indent + " "
                 names = [n_ for n_, o_ in o.entities]
-                logger.debug(
-                    "[sphinxcontrib-matlabdomain] %s Names=%s", indent, str(names)
-                )
+                logger.debug("[sphinxcontrib-matlabdomain] %s Names=%s", indent, names)
                 # print(indent + f"{names=}")
                 recursive_log_debug(o, indent)
                 indent = indent[:-1]
@@ -188,8 +791,8 @@ def recursive_log_debug(obj, indent=""):
             logger.debug(
                 "[sphinxcontrib-matlabdomain] %s -> name=%s, methods=%s",
                 indent,
-                str(o.name),
-                str(o.methods),
+                o.name,
+                o.methods,
             )
 
 
@@ -202,13 +805,41 @@ def populate_entities_table(obj, path=""):
     for n, o in obj.entities:
         fullpath = path + "." + o.name
         fullpath = fullpath.lstrip(".")
-        entities_table[fullpath] = o
-        entities_name_map[strip_package_prefix(fullpath)] = fullpath
+        register_entity(fullpath, o)
         if isinstance(o, MatModule):
             if o.entities:
                 populate_entities_table(o, fullpath)
 
 
+def register_entity(name, entity):
+    # Add *entity* under its canonical dotted path *name*.
+    current_registry().names_digest = None
+    name_index.add(name, entity)
+    entities_table[name] = entity
+    entities_name_map[name_index.names[name].stripped] = name
+
+
+def names_digest():
+    """
+    Return a digest of the names in ``entities_table``, the roles of their
+    entities and the members of classes, i.e. of what auto-links may refer to.
+    Computed once per state of the current registry.
+    """
+    registry = current_registry()
+    if registry.names_digest is None:
+        digest = hashlib.blake2b(digest_size=16)
+        table = registry.entities_table
+        for name in sorted(table):
+            value = table[name]
+            for entity in value.values() if isinstance(value, dict) else (value,):
+                digest.update(f"{name}\0{entity.ref_role()}\0".encode())
+                if isinstance(entity, MatClass):
+                    members = [*entity.methods, "", *entity.properties, ""]
+                    digest.update("\0".join(members).encode())
+        registry.names_digest = digest.digest()
+    return registry.names_digest
+
+
 def try_get_module_entity_or_default(entity_name):
     maybe_mod = entities_table.get(entity_name)
     if isinstance(maybe_mod, dict):
@@ -216,65 +847,431 @@ def try_get_module_entity_or_default(entity_name):
     return maybe_mod
 
 
-def analyze(app):
-    # Using the "MatObject.matlabify" and "MatModule.safe_getmembers" the
-    # `matlab_src_dir` is recursively scanned for MATLAB objects only once.
-    # All entities found are stored in globally available `entities_table`
+def entity_source_file(entity):
+    """Return the path of the file (or folder) that *entity* was parsed from.
 
-    try:
-        if app.env.config.matlab_src_dir is None:
-            logger.debug(
-                "[sphinxcontrib-matlabdomain] matlab_src_dir is None, skipping parsing."
+    Members (properties, methods and enumerations defined in a ``classdef``)
+    report the file of their class. Returns ``None`` if unknown.
+    """
+    if isinstance(entity, MatModule):
+        return entity.path
+    source_file = getattr(entity, "file", None)
+    if source_file is None and getattr(entity, "cls", None) is not None:
+        source_file = getattr(entity.cls, "file", None)
+    return source_file
+
+
+def snapshot_tree(basedir):
+    """Take a snapshot of the MATLAB source tree below *basedir*.
+
+    Returns a dictionary mapping paths, relative to *basedir*, to a
+    ``(mtime_ns, size)`` tuple for MATLAB files. Folders are included with a
+    value of ``None``, such that only their creation or removal is detected.
+    The same folders and files as in :meth:`MatModule.safe_getmembers` are
+    skipped.
+    """
+    snapshot = {}
+    for root, dirs, files in os.walk(basedir):
+        dirs[:] = [
+            d
+            for d in dirs
+            if not (d.startswith(".") or d.startswith("_"))
+            and not is_excluded(os.path.join(root, d))
+        ]
+        relroot = os.path.relpath(root, basedir)
+        for d in dirs:
+            snapshot[os.path.normpath(os.path.join(relroot, d))] = None
+        for f in files:
+            if not (f.endswith(".m") or f.endswith(".mlapp")):
+                continue
+            if is_excluded(os.path.join(root, f)):
+                continue
+            try:
+                st = os.stat(os.path.join(root, f))
+            except OSError:
+                continue
+            snapshot[os.path.normpath(os.path.join(relroot, f))] = (
+                st.st_mtime_ns,
+                st.st_size,
             )
-            return
+    return snapshot
 
-        # Interpret `matlab_src_dir` relative to the sphinx source directory.
-        basedir = os.path.normpath(
-            os.path.join(app.env.srcdir, app.env.config.matlab_src_dir)
-        )
-        MatObject.basedir = basedir  # set MatObject base directory
-        MatObject.sphinx_env = app.env  # pass env to MatObject cls
-        MatObject.sphinx_app = app  # pass app to MatObject cls
 
-        entities_table.clear()
-        entities_name_map.clear()
+def diff_snapshots(old, new):
+    """Compare two snapshots made by :func:`snapshot_tree`.
 
-        # Set the root object and get root members.
-        logger.debug("[sphinxcontrib-matlabdomain] Starting matlabify")
-        root = MatObject.matlabify("")
-        if not root:
-            logger.debug("[sphinxcontrib-matlabdomain] root is None, returning")
-            return
+    Returns a sorted list of the relative paths that were added, removed or
+    modified.
+    """
+    changed = old.keys() ^ new.keys()
+    changed.update(
+        path for path, stat in new.items() if path in old and old[path] != stat
+    )
+    return sorted(changed)
+
+
+def _entity_name_for_path(relpath):
+    # Dotted entity name for a path relative to `MatObject.basedir`. Files in
+    # class folders resolve to the class folder, as the methods of a class
+    # folder are merged into its class.
+    parts = relpath.split(os.sep)
+    parts[-1] = os.path.splitext(parts[-1])[0]
+    for idx, part in enumerate(parts[:-1]):
+        if part.startswith("@"):
+            return ".".join(parts[: idx + 1])
+    return ".".join(parts)
+
+
+def _lookup_module(name):
+    if not name:
+        return entities_table.get(".")
+    entity = try_get_module_entity_or_default(name)
+    if isinstance(entity, MatModule):
+        return entity
+    return None
+
+
+def _collect_subtree(entity):
+    # The entity and, if it is a module, all entities below it.
+    found = [entity]
+    if isinstance(entity, MatModule) and entity.entities:
+        for _, o in entity.entities:
+            found.extend(_collect_subtree(o))
+    return found
+
+
+def _purge_entities(removed):
+    # Remove all keys in `entities_table` and `entities_name_map` that refer
+    # to one of the *removed* entities.
+    current_registry().names_digest = None
+    removed_ids = {id(e) for e in removed}
+    removed_keys = set()
+    for key, value in list(entities_table.items()):
+        if isinstance(value, dict):
+            kept = {r: e for r, e in value.items() if id(e) not in removed_ids}
+            if not kept:
+                del entities_table[key]
+                removed_keys.add(key)
+            elif len(kept) == 1:
+                entities_table[key] = next(iter(kept.values()))
+            elif len(kept) != len(value):
+                entities_table[key] = kept
+        elif id(value) in removed_ids:
+            del entities_table[key]
+            removed_keys.add(key)
+    for key, value in list(entities_name_map.items()):
+        if value in removed_keys:
+            del entities_name_map[key]
+    for key in removed_keys:
+        name_index.discard(key)
+
+
+def _refresh_entity(name):
+    # Re-read entity *name* from disk and patch it into the entity tables.
+    # Returns the names added to `entities_table`.
+    parent_name, _, stem = name.rpartition(".")
+    parent = _lookup_module(parent_name)
+    if parent is None:
+        # The parent folder is new as well, refreshing it covers this entity.
+        parent_path = os.path.join(MatObject.basedir, *parent_name.split("."))
+        if parent_name and os.path.isdir(parent_path):
+            return _refresh_entity(parent_name)
+        return []
+
+    index = None
+    for idx, (n, o) in enumerate(parent.entities):
+        if n == stem:
+            index = idx
+            _purge_entities(_collect_subtree(o))
+            break
+    if index is None and not parent.listed:
+        # Not loaded before, see `load_entity`.
+        return []
+
+    entity = MatObject.matlabify(name)
+    if entity is None:
+        if index is not None:
+            del parent.entities[index]
+        return []
+
+    if index is not None:
+        parent.entities[index] = (stem, entity)
+    else:
+        parent.entities.append((stem, entity))
 
-        logger.debug(
-            f"[sphinxcontrib-matlabdomain] root={root}, root.entities={getattr(root, 'entities', 'NO ENTITIES ATTR')}"
-        )
-        root.safe_getmembers()
-        logger.debug(
-            f"[sphinxcontrib-matlabdomain] After safe_getmembers, root.entities={getattr(root, 'entities', 'NO ENTITIES ATTR')}"
-        )
+    register_entity(name, entity)
+    if isinstance(entity, MatModule):
+        entity.safe_getmembers()
+        recursive_find_all(entity)
+        populate_entities_table(entity, name)
+    return [k for k in entities_table if k == name or k.startswith(name + ".")]
 
-        logger.debug("[sphinxcontrib-matlabdomain] Starting recursive_find_all")
-        recursive_find_all(root)
-        logger.debug("[sphinxcontrib-matlabdomain] Finished recursive_find_all")
 
-        # Print the hierarchy of entities to the log.
-        logger.debug("[sphinxcontrib-matlabdomain] Found the following entities:")
-        recursive_log_debug(root)
+def update_entities(paths):
+    """Patch ``entities_table`` and ``entities_name_map`` in place.
 
-        logger.debug("[sphinxcontrib-matlabdomain] Starting populate_entities_table")
-        populate_entities_table(root)
-        logger.debug("[sphinxcontrib-matlabdomain] Finished populate_entities_table")
-        entities_table["."] = root
-    except Exception as e:
-        import traceback
+    :param paths: Paths relative to ``matlab_src_dir`` that were added,
+        removed or modified, e.g. as returned by :func:`diff_snapshots`.
+    :type paths: list
 
-        logger.error(f"[sphinxcontrib-matlabdomain] ERROR in analyze: {e}")
-        logger.error(
-            f"[sphinxcontrib-matlabdomain] Traceback: {traceback.format_exc()}"
+    Only the entities for the given paths are re-parsed. Class folder
+    transformation is redone for these entities, alternative names for all
+    entities that compete with them for a short name.
+    """
+    if entities_table.get(".") is None:
+        return
+
+    path_index.clear()
+    before = set(entities_table)
+    names = sorted({_entity_name_for_path(p) for p in paths})
+    refreshed = []
+    new_names = []
+    for name in names:
+        # Refreshing a folder also refreshes everything below it.
+        if any(name.startswith(r + ".") for r in refreshed):
+            continue
+        refreshed.append(name)
+        new_names.extend(_refresh_entity(name))
+
+    _add_entities(new_names, before.difference(entities_table))
+
+    # Attribute docs are cached per module.
+    MatModuleAnalyzer.cache.clear()
+
+
+def _short_names(names):
+    # The short names of an entity, see `short_name_aliases`, under its
+    # canonical name and, in a class folder, under its class folder alias.
+    if names.class_folder == names.canonical:
+        return (names.short,)
+    return names.short, name_index.get(names.class_folder).short
+
+
+def _add_entities(new_names, removed=()):
+    # Transform the class folders among the entities added to
+    # `entities_table` under *new_names* and recompute the alternative names
+    # of all entities whose short name is one of those of the added entities
+    # or of the *removed* names, as `analyze_tree` would.
+    for name in new_names:
+        entity = entities_table.get(name)
+        if _is_class_folder_module(name, entity):
+            transform_class_folder(entity)
+
+    current_registry().names_digest = None
+    affected = set(removed)
+    for name in [*new_names, *removed]:
+        affected.update(_short_names(name_index.get(name)))
+    competing = [
+        name
+        for name, names in name_index.names.items()
+        if not affected.isdisjoint(_short_names(names))
+    ]
+    aliases = class_folder_aliases(competing)
+    # Drop the short name aliases, which may now refer to other entities.
+    for key in affected:
+        if key in entities_table and key not in name_index.names:
+            del entities_table[key]
+            if entities_name_map.get(key) == key:
+                del entities_name_map[key]
+    entities_table.update(aliases)
+    competing = set(competing).union(aliases)
+    entities_table.update(
+        short_name_aliases([name for name in entities_table if name in competing])
+    )
+
+
+def _resolve_parts(name):
+    # Folder and file names of the longest prefix of dotted *name* that exists
+    # below `MatObject.basedir`. The "+" and "@" prefixes of packages and class
+    # folders may be omitted in *name*, e.g. "target.package.ClassBar" gives
+    # ["target", "+package", "ClassBar"]. Folders take precedence over files,
+    # like in `MatObject.matlabify`.
+    parts = []
+    path = MatObject.basedir
+    for part in name.split("."):
+        candidates = (part,) if part[:1] in "+@" else (part, "+" + part, "@" + part)
+        folder = next(
+            (
+                c
+                for c in candidates
+                if os.path.isdir(os.path.join(path, c))
+                and not is_excluded(os.path.join(path, c))
+            ),
+            None,
         )
-        raise
+        if folder is not None:
+            parts.append(folder)
+            path = os.path.join(path, folder)
+            continue
+        if any(
+            os.path.isfile(os.path.join(path, part + ext))
+            and not is_excluded(os.path.join(path, part + ext))
+            for ext in (".m", ".mlapp")
+        ):
+            parts.append(part)
+        break
+    return parts
+
+
+def _path_folders(name):
+    # Dotted names of the folders on the MATLAB path that contain *name*, i.e.
+    # a folder, package, class folder or file with that name. All folders below
+    # `MatObject.basedir`, except packages, class folders and private folders,
+    # are on the path. The folders are listed once, on first use.
+    if not path_index:
+        basedir = MatObject.basedir
+        for dirpath, dirnames, filenames in os.walk(basedir):
+            dirnames[:] = sorted(
+                d
+                for d in dirnames
+                if d[0] not in "._" and not is_excluded(os.path.join(dirpath, d))
+            )
+            relpath = os.path.relpath(dirpath, basedir)
+            folder = "" if relpath == "." else relpath.replace(os.sep, ".")
+            names = [d.lstrip("+@") for d in dirnames]
+            names += [
+                os.path.splitext(f)[0]
+                for f in filenames
+                if f.endswith((".m", ".mlapp"))
+                and not is_excluded(os.path.join(dirpath, f))
+            ]
+            for entry in names:
+                path_index.setdefault(entry, []).append(folder)
+            dirnames[:] = [d for d in dirnames if d[0] not in "+@" and d != "private"]
+    return path_index.get(name, [])
+
+
+def _find_parts(name):
+    # `_resolve_parts` of *name*, looked up in `MatObject.basedir` first and
+    # then in the other folders on the path, like MATLAB does. A missing last
+    # component may be a class member. Returns None if not found.
+    components = name.split(".")
+    parts = _resolve_parts(name)
+    missing = len(components) - len(parts)
+    if missing == 0 or (missing == 1 and _may_have_members(parts)):
+        return parts
+    for folder in _path_folders(components[0].lstrip("+@")):
+        if not folder:
+            continue
+        prefix = folder.split(".")
+        parts = _resolve_parts(".".join([*prefix, *components]))
+        missing = len(prefix) + len(components) - len(parts)
+        if missing == 0 or (missing == 1 and _may_have_members(parts)):
+            return parts
+    return None
+
+
+def _may_have_members(parts):
+    # True if *parts*, see `_resolve_parts`, end with a file or class folder.
+    return bool(parts) and (
+        parts[-1].startswith("@")
+        or not os.path.isdir(os.path.join(MatObject.basedir, *parts))
+    )
+
+
+def _load_members(module, name, new_names):
+    # List all members of *module*, found at *name*, and the members of the
+    # class folders among them.
+    module.safe_getmembers()
+    for _, o in module.entities:
+        fullname = f"{name}.{o.name}".lstrip(".")
+        if fullname not in name_index.names:
+            register_entity(fullname, o)
+            new_names.append(fullname)
+        if _is_class_folder_module(fullname, o) and not o.listed:
+            _load_members(o, fullname, new_names)
+
+
+def load_entity(name, members=False):
+    """Load entity *name* and the modules containing it into ``entities_table``.
+
+    Used instead of parsing all of ``matlab_src_dir`` if
+    ``matlab_scan_referenced_only`` is set, see :func:`analyze`. Only the
+    files of *name*, of its base classes and, with *members*, of the members
+    of a module are parsed. Modules containing *name* keep their other members
+    unlisted.
+
+    :param name: Dotted name relative to ``matlab_src_dir`` or to a folder on
+        the MATLAB path. May end with the name of a class member, e.g.
+        ``target.ClassExample.mymethod``.
+    :type name: str
+    :param members: Also load the members of a module.
+    :type members: bool
+    :returns: The loaded entity, or None if *name* is not found.
+    """
+    root = entities_table.get(".")
+    if root is None:
+        return None
+    parts = _find_parts(name) if name else []
+    if parts is None:
+        return None
+
+    new_names = []
+    if members and not parts and not root.listed:
+        _load_members(root, "", new_names)
+    entity = root
+    for idx, part in enumerate(parts):
+        entity = entity.getter(part, None)
+        if entity is None:
+            return None
+        fullname = ".".join(parts[: idx + 1])
+        if fullname not in name_index.names:
+            register_entity(fullname, entity)
+            new_names.append(fullname)
+        if not isinstance(entity, MatModule) or entity.listed:
+            continue
+        # The methods in a class folder are part of its class.
+        if _is_class_folder_module(fullname, entity) or (
+            members and idx == len(parts) - 1
+        ):
+            _load_members(entity, fullname, new_names)
+
+    _add_entities(new_names)
+    for new_name in new_names:
+        new_entity = entities_table.get(new_name)
+        if isinstance(new_entity, MatClass):
+            for base in new_entity.bases:
+                if try_get_module_entity_or_default(base) is None:
+                    load_entity(base)
+    return entity
+
+
+def load_referenced(name, members=False):
+    """Load *name* on demand, if ``matlab_scan_referenced_only`` is set and
+    :func:`analyze` did not find a reference to it in the documents."""
+    if not scan_referenced_only():
+        return
+    entity = try_get_module_entity_or_default(name)
+    if entity is None or (
+        members and isinstance(entity, MatModule) and not entity.listed
+    ):
+        load_entity(name, members)
+
 
+def refresh_entities(basedir):
+    """Bring ``entities_table`` up to date with the source tree in *basedir*.
+
+    Compares the tree with the snapshot stored in ``tree_snapshots`` and
+    patches the entities of the added, removed or modified paths with
+    :func:`update_entities`. Returns the changed paths.
+    """
+    snapshot = snapshot_tree(basedir)
+    changed = diff_snapshots(tree_snapshots.get(basedir, {}), snapshot)
+    tree_snapshots[basedir] = snapshot
+    if changed:
+        update_entities(changed)
+    return changed
+
+
+def _is_class_folder_module(name, entity):
+    if not isinstance(entity, MatModule):
+        return False
+
+    parts = name.split(".")
+    return parts[-1].startswith("@")
+
+
+def transform_class_folder(cf_entity):
     # Transform Class Folders classes from
     #
     # @ClassFolder (Module)
@@ -286,47 +1283,40 @@ def analyze(app):
     #
     # ClassFolder (Class) with the method1 and method2 add to the ClassFolder Class.
 
-    def isClassFolderModule(name, entity):
-        if not isinstance(entity, MatModule):
-            return False
+    # Bug fix: Check if cf_entity has entities and they're not None
+    if not hasattr(cf_entity, "entities") or cf_entity.entities is None:
+        return
 
-        parts = name.split(".")
-        return parts[-1].startswith("@")
+    # Find the class entity class.
+    class_entities = [e for e in cf_entity.entities if isinstance(e[1], MatClass)]
+    func_entities = [e for e in cf_entity.entities if isinstance(e[1], MatFunction)]
 
-    class_folder_modules = {
-        k: v for k, v in entities_table.items() if isClassFolderModule(k, v)
-    }
-    # For each Class Folder module
-    for cf_entity in class_folder_modules.values():
-        # Bug fix: Check if cf_entity has entities and they're not None
-        if not hasattr(cf_entity, "entities") or cf_entity.entities is None:
-            continue
-
-        # Find the class entity class.
-        class_entities = [e for e in cf_entity.entities if isinstance(e[1], MatClass)]
-        func_entities = [e for e in cf_entity.entities if isinstance(e[1], MatFunction)]
+    if not class_entities:
+        return
+    assert len(class_entities) == 1
+    cls = class_entities[0][1]
 
-        if not class_entities:
-            continue
-        assert len(class_entities) == 1
-        cls = class_entities[0][1]
+    # Add functions to class
+    for func_name, func in func_entities:
+        func.__class__ = MatMethod
+        func.cls = cls
+        # TODO: Find the method attributes defined in classfolder class definition.
+        func.attrs = {}
+        cls.methods[func.name] = func
 
-        # Add functions to class
-        for func_name, func in func_entities:
-            func.__class__ = MatMethod
-            func.cls = cls
-            # TODO: Find the method attributes defined in classfolder class definition.
-            func.attrs = {}
-            cls.methods[func.name] = func
 
+def class_folder_aliases(names):
     # Transform @ClassFolder names. Specifically
+    # target.@ClassFolder.ClassFolder -> target.ClassFolder
     class_folder_names = {}
-    for name, entity in entities_table.items():
-        alt_name = classfolder_class_name(name)
+    for name in names:
+        alt_name = name_index.get(name).class_folder
         if name != alt_name:
-            class_folder_names[alt_name] = entity
-    entities_table.update(class_folder_names)
+            class_folder_names[alt_name] = entities_table[name]
+    return class_folder_names
 
+
+def short_name_aliases(names):
     # Find alternative names to entities
     # target.+package.+sub.Class -> package.sub.Class
     # folder.subfolder.Class -> Class
@@ -334,13 +1324,18 @@ def analyze(app):
     # NOTE: Does not yet work with class folders
     short_names = {}
     long_names = entities_table.keys()
-    for name, entity in entities_table.items():
-        short_name = shortest_name(name)
+    for name in names:
+        entity = entities_table[name]
+        if isinstance(entity, dict):
+            # Already resolved as an alternative name of another entity.
+            continue
+        short_name = name_index.get(name).short
         if (
             short_name != name and not (short_name in long_names and name in long_names)
         ) or (
             short_name in long_names
             and (entity.ref_role() == "func" or entity.ref_role() == "class")
+            and not isinstance(entities_table[short_name], dict)
             and entities_table[short_name].ref_role() == "mod"
         ):
             # Only handle the below special case when overwriting entries in entities_table will not
@@ -355,10 +1350,229 @@ def analyze(app):
             else:
                 short_names[short_name] = entity
             entities_name_map[short_name] = short_name
+    return short_names
+
+
+def analyze(app):
+    # Using the "MatObject.matlabify" and "MatModule.safe_getmembers" the
+    # `matlab_src_dir` is recursively scanned for MATLAB objects only once.
+    # All entities found are stored in the `entities_table` of the registry
+    # of `app`, see `registry_for`.
+    registry = registry_for(app)
 
-    entities_table.update(short_names)
+    if app.env.config.matlab_src_dir is None:
+        logger.debug(
+            "[sphinxcontrib-matlabdomain] matlab_src_dir is None, skipping parsing."
+        )
+        return
+
+    # Interpret `matlab_src_dir` relative to the sphinx source directory.
+    registry.basedir = os.path.normpath(
+        os.path.join(app.env.srcdir, app.env.config.matlab_src_dir)
+    )
+    registry.env = app.env  # pass env to MatObject cls
+    registry.app = app  # pass app to MatObject cls
+    # Files that timed out in earlier builds, see `is_slow_file`.
+    registry.slow_files.update(getattr(app.env, "matlab_slow_files", {}))
+    app.env.matlab_slow_files = registry.slow_files
+
+    with registry.activated():
+        referenced = None
+        if scan_referenced_only():
+            # Only what the documents refer to, anything else is loaded on
+            # demand by the documenters.
+            referenced = mat_scan.referenced_in_documents(app)
+        analyze_tree(referenced)
+
+
+def analyze_tree(referenced=None):
+    """
+    Find the MATLAB entities in :attr:`MatObject.basedir` and store them in
+    the tables of the current :class:`Registry`.
 
+    :param referenced: Names referred to, as returned by
+        :func:`mat_scan.referenced_in_documents`. If given, only these are
+        loaded, anything else is loaded on demand.
+    """
+    basedir = MatObject.basedir
+    filename = index_file()
+    open_index(filename)
+    try:
+        if basedir in tree_snapshots and entities_table.get(".") is not None:
+            # Same source tree as before, only re-parse what changed.
+            with mat_trace.span("refresh", "analyze"):
+                changed = refresh_entities(basedir)
+            logger.debug(
+                "[sphinxcontrib-matlabdomain] Updated entities of %d changed paths.",
+                len(changed),
+            )
+            mat_profile.mark("refresh")
+            if changed and filename:
+                save_index(filename)
+            return
 
+        entities_table.clear()
+        entities_name_map.clear()
+        name_index.clear()
+        tree_snapshots.clear()
+        path_index.clear()
+        excluded_paths.clear()
+        prefetched.clear()
+        current_registry().index_outdated = False
+
+        if referenced is not None:
+            # The tree is not snapshotted, as this is cheap to redo.
+            entities_table["."] = MatObject.matlabify("")
+            for candidates, members in referenced:
+                for name in candidates:
+                    if load_entity(name, members) is not None:
+                        break
+            logger.debug(
+                "[sphinxcontrib-matlabdomain] Loaded %d entities for %d references, "
+                "excluded %d paths.",
+                len(name_index.names),
+                len(referenced),
+                len(excluded_paths),
+            )
+            mat_profile.mark("load referenced")
+            return
+
+        # Taken before parsing, such that files changed while parsing are
+        # picked up next time.
+        with mat_trace.span("walk", "analyze"):
+            snapshot = snapshot_tree(basedir)
+        mat_profile.mark("walk")
+
+        workers = parse_workers()
+        if workers > 1:
+            with mat_trace.span("prefetch", "analyze", workers=workers):
+                prefetch_mfiles(snapshot, workers)
+
+        # Set the root object and get root members.
+        logger.debug("[sphinxcontrib-matlabdomain] Starting matlabify")
+        root = MatObject.matlabify("")
+        if not root:
+            logger.debug("[sphinxcontrib-matlabdomain] root is None, returning")
+            return
+
+        with mat_trace.span("find entities", "analyze"):
+            root.safe_getmembers()
+            logger.debug(
+                "[sphinxcontrib-matlabdomain] root %s has %d entities.",
+                root.name,
+                len(root.entities or ()),
+            )
+
+            logger.debug("[sphinxcontrib-matlabdomain] Starting recursive_find_all")
+            recursive_find_all(root)
+        logger.debug("[sphinxcontrib-matlabdomain] Finished recursive_find_all")
+        mat_profile.mark("parse")
+
+        # Print the hierarchy of entities to the log. Walking and formatting
+        # the whole tree is expensive, so only do it if debug is shown.
+        if debug_enabled():
+            logger.debug("[sphinxcontrib-matlabdomain] Found the following entities:")
+            recursive_log_debug(root)
+
+        logger.debug("[sphinxcontrib-matlabdomain] Starting populate_entities_table")
+        with mat_trace.span("populate_entities_table", "analyze"):
+            populate_entities_table(root)
+        logger.debug("[sphinxcontrib-matlabdomain] Finished populate_entities_table")
+        mat_profile.mark("populate_entities_table")
+        entities_table["."] = root
+        # Files shadowed by a folder of the same name were parsed for nothing.
+        prefetched.clear()
+        if excluded_paths:
+            logger.debug(
+                "[sphinxcontrib-matlabdomain] Excluded %d paths by "
+                "matlab_exclude_patterns.",
+                len(excluded_paths),
+            )
+    except Exception as e:
+        import traceback
+
+        logger.error(f"[sphinxcontrib-matlabdomain] ERROR in analyze_tree: {e}")
+        logger.error(
+            f"[sphinxcontrib-matlabdomain] Traceback: {traceback.format_exc()}"
+        )
+        raise
+
+    # Transform Class Folders classes, see `transform_class_folder`. The class
+    # folder modules were collected while populating `entities_table`.
+    with mat_trace.span("transform_class_folder", "aliases"):
+        for name in name_index.class_folders:
+            transform_class_folder(entities_table[name])
+
+    with mat_trace.span("class_folder_aliases", "aliases"):
+        entities_table.update(class_folder_aliases(list(name_index.names)))
+    with mat_trace.span("short_name_aliases", "aliases"):
+        entities_table.update(short_name_aliases(list(entities_table)))
+    mat_profile.mark("aliases")
+    tree_snapshots[basedir] = snapshot
+    if filename and index_outdated():
+        save_index(filename)
+
+
+class Analyzer(object):
+    """
+    Finds the MATLAB entities of a source tree without Sphinx, e.g. in scripts
+    or in worker processes. Each analyzer has a :class:`Registry` of its own,
+    so analyzers of different trees can be used side by side, also in
+    threads::
+
+        registry = Analyzer("src", {"matlab_parse_workers": 4}).analyze()
+        cls = registry.entities_table["target.ClassExample"]
+
+    :param src_dir: Folder with the MATLAB sources.
+    :type src_dir: str
+    :param options: ``matlab_*`` config values, see ``analysis_defaults`` for
+        those used and their defaults.
+    :type options: dict
+    """
+
+    #: Config values used by the analysis, with their defaults.
+    analysis_defaults = {
+        "matlab_cache_dir": None,
+        "matlab_cache_size": mat_cache.DEFAULT_SIZE,
+        "matlab_exclude_patterns": [],
+        "matlab_header_only_patterns": [],
+        "matlab_header_only_size": None,
+        "matlab_index_file": None,
+        "matlab_mmap_threshold": 1048576,
+        "matlab_parse_timeout": None,
+        "matlab_parse_workers": 0,
+        "matlab_parser_engine": "query",
+    }
+
+    def __init__(self, src_dir, options=None):
+        config = SimpleNamespace(**{**self.analysis_defaults, **(options or {})})
+        self.registry = Registry(
+            basedir=os.path.normpath(os.path.abspath(src_dir)),
+            env=SimpleNamespace(config=config),
+        )
+
+    def analyze(self, referenced=None):
+        """
+        Find the entities and return the :class:`Registry` holding them.
+        Analyzing again only re-parses what changed in the meantime.
+
+        :param referenced: Candidate names and whether their members are
+            needed, ``[(("target.ClassExample",), True)]``. If given, only
+            these are loaded.
+        """
+        with self.registry.activated():
+            analyze_tree(referenced)
+        return self.registry
+
+    @contextmanager
+    def activated(self):
+        """Context manager that makes the registry of this analyzer current,
+        e.g. to call :meth:`MatObject.matlabify` or :func:`load_entity`."""
+        with self.registry.activated():
+            yield self.registry
+
+
+@lru_cache(maxsize=4096)
 def strip_package_prefix(varname):
     """Remove the leading '+' prefix on package names"""
 
@@ -368,7 +1582,47 @@ def strip_package_prefix(varname):
     return ".".join([s.lstrip("+") for s in varname.split(".")])
 
 
-class MatObject(object):
+class _MatObjectType(type):
+    # The analysis context of MatObject is that of the current `Registry`.
+
+    @property
+    def basedir(cls):
+        return current_registry().basedir
+
+    @basedir.setter
+    def basedir(cls, value):
+        current_registry().basedir = value
+
+    @basedir.deleter
+    def basedir(cls):
+        current_registry().basedir = None
+
+    @property
+    def sphinx_env(cls):
+        return current_registry().env
+
+    @sphinx_env.setter
+    def sphinx_env(cls, value):
+        current_registry().env = value
+
+    @sphinx_env.deleter
+    def sphinx_env(cls):
+        current_registry().env = None
+
+    @property
+    def sphinx_app(cls):
+        return current_registry().app
+
+    @sphinx_app.setter
+    def sphinx_app(cls, value):
+        current_registry().app = value
+
+    @sphinx_app.deleter
+    def sphinx_app(cls):
+        current_registry().app = None
+
+
+class MatObject(object, metaclass=_MatObjectType):
     """
     Base MATLAB object to which all others are subclassed.
 
@@ -385,14 +1639,15 @@ class MatObject(object):
     :class:`MatApplication` must be a ``.mlapp`` file.
     """
 
-    basedir = None
     encoding = None
-    sphinx_env = None
-    sphinx_app = None
+    #: True if the object was parsed from the header of its file only
+    partial = False
 
     def __init__(self, name):
         #: name of MATLAB object
         self.name = name
+        #: :class:`Registry` the object was found for
+        self.registry = current_registry()
 
     def ref_role(self):
         """Returns role to use for references to this object (e.g. when generating auto-links)"""
@@ -413,7 +1668,7 @@ class MatObject(object):
             logger.debug(
                 '[sphinxcontrib-matlabdomain] Warning attribute "%s" was not found in %s.',
                 name,
-                self,
+                self.name,
             )
             return None
         elif len(defargs) == 1:
@@ -441,7 +1696,9 @@ class MatObject(object):
         over the mfile.
         """
         # no object name given
-        logger.debug(f"[sphinxcontrib-matlabdomain] enter matlabify {objname=}.")
+        logger.debug(
+            "[sphinxcontrib-matlabdomain] enter matlabify objname=%r.", objname
+        )
 
         if objname is None:
             return None
@@ -463,7 +1720,10 @@ class MatObject(object):
             fullpath = os.path.join(MatObject.basedir, objname)  # objname fullpath
 
         logger.debug(
-            f"[sphinxcontrib-matlabdomain] matlabify {package=}, {objname=}, {fullpath=}"
+            "[sphinxcontrib-matlabdomain] matlabify package=%r, objname=%r, fullpath=%r",
+            package,
+            objname,
+            fullpath,
         )
         # package folders imported over mfile with same name
         if os.path.isdir(fullpath):
@@ -477,22 +1737,38 @@ class MatObject(object):
                 return mod
             else:
                 logger.debug(
-                    f"[sphinxcontrib-matlabdomain] matlabify MatModule {package=}, {fullpath=}"
+                    "[sphinxcontrib-matlabdomain] matlabify MatModule package=%r, fullpath=%r",
+                    package,
+                    fullpath,
                 )
                 return MatModule(name, fullpath, package)  # import package
         elif os.path.isfile(fullpath + ".m"):
             mfile = fullpath + ".m"
             logger.debug(
-                f"[sphinxcontrib-matlabdomain] matlabify parse_mfile {package=}, {mfile=}"
+                "[sphinxcontrib-matlabdomain] matlabify parse_mfile package=%r, mfile=%r",
+                package,
+                mfile,
             )
+            entity = indexed_entity(mfile)
+            if entity is not None:
+                return entity
+            current_registry().index_outdated = True
+            entity = prefetched.pop(mfile, None)
+            if entity is not None:
+                return entity
             return MatObject.parse_mfile(
                 mfile, name, path, MatObject.encoding
             )  # parse mfile
         elif os.path.isfile(fullpath + ".mlapp"):
             mlappfile = fullpath + ".mlapp"
             logger.debug(
-                f"[sphinxcontrib-matlabdomain] matlabify parse_mlappfile {package=}, {mlappfile=}"
+                "[sphinxcontrib-matlabdomain] matlabify parse_mlappfile package=%r, mlappfile=%r",
+                package,
+                mlappfile,
             )
+            index = current_registry().index
+            if index is None or not index.is_current(mlappfile):
+                current_registry().index_outdated = True
             return MatObject.parse_mlappfile(mlappfile, name, path)
         return None
 
@@ -521,30 +1797,90 @@ class MatObject(object):
         # read mfile code
         if encoding is None:
             encoding = "utf-8"
-        with open(mfile, "rb") as code_f:
-            code = code_f.read()
-
+        partial = header_only(mfile) or is_slow_file(mfile)
+        # take the entity from ``matlab_cache_dir`` if parsed before
+        cache = parse_cache()
+        key = None
+        if cache is not None:
+            key = cache.key(mfile, name, encoding, partial, parser_engine_name())
+            entity = cache.get(key, path.replace(os.sep, "."))
+            if entity is not None:
+                entity.file = mfile
+                return entity
         # parse the file
-        tree_sitter_ver = tuple([int(sec) for sec in version("tree_sitter").split(".")])
-        if tree_sitter_ver[1] == 21:
-            parser = Parser()
-            parser.set_language(ML_LANG)
-        else:
-            parser = Parser(ML_LANG)
-        tree = parser.parse(code)
+        with mat_trace.span(f"parse {name}", "parse", file=mfile):
+            parser = thread_parser()
+            entity = None
+            if not partial:
+                entity = MatObject._parse_within_budget(
+                    parser, mfile, name, path, encoding
+                )
+                partial = entity is None
+                if partial:
+                    # timed out, left out of the cache
+                    key = None
+            if partial:
+                logger.debug(
+                    "[sphinxcontrib-matlabdomain] parsing only the header of %s.",
+                    mfile,
+                )
+                tree = parser.parse(read_header(mfile))
+                entity = MatObject._entity_from_tree(tree, name, path, encoding)
+
+        #: file the entity was parsed from
+        entity.file = mfile
+        #: True if only the header of the file was parsed, see :func:`header_only`
+        #: and ``matlab_parse_timeout``
+        entity.partial = partial
+        if key is not None:
+            cache.put(key, entity)
+        return entity
 
+    @staticmethod
+    def _parse_within_budget(parser, mfile, name, path, encoding):
+        """Parse *mfile* within ``matlab_parse_timeout``. Returns None if it
+        takes longer, after logging and remembering the file as slow."""
+        timeout = parse_timeout()
+        start = time.monotonic()
+        set_parser_timeout(parser, timeout)
+        try:
+            with read_source(mfile) as code, time_budget(timeout):
+                try:
+                    tree = parser.parse(code)
+                except ValueError:
+                    if timeout is None:
+                        raise
+                    # tree-sitter's timeout expired
+                    raise ParseTimeout() from None
+                return MatObject._entity_from_tree(tree, name, path, encoding)
+        except ParseTimeout:
+            # Start the next parse from scratch.
+            parser.reset()
+        finally:
+            set_parser_timeout(parser, None)
+        elapsed = time.monotonic() - start
+        logger.warning(
+            "[sphinxcontrib-matlabdomain] Parsing %s was stopped after %.2f s, "
+            "matlab_parse_timeout is %g s. Only its header is documented.",
+            mfile,
+            elapsed,
+            timeout,
+        )
+        remember_slow_file(mfile)
+        return None
+
+    @staticmethod
+    def _entity_from_tree(tree, name, path, encoding):
+        """Return the :class:`MatObject` defined by the syntax *tree* of the
+        file *name* in the folder *path*."""
         modname = path.replace(os.sep, ".")  # module name
 
         # assume that functions and classes always start with a keyword
         def isFunction(tree):
-            q_is_function = ML_LANG.query(
-                r"""(source_file [(comment) "\n"]* (function_definition))"""
-            )
             matches = q_is_function.matches(tree.root_node)
             return bool(matches)
 
         def isClass(tree):
-            q_is_class = ML_LANG.query("(class_definition)")
             matches = q_is_class.matches(tree.root_node)
             return bool(matches)
 
@@ -554,18 +1890,17 @@ class MatObject(object):
                 name,
                 modname,
             )
-            return MatClass(name, modname, tree.root_node, encoding)
+            entity = MatClass(name, modname, tree.root_node, encoding)
         elif isFunction(tree):
             logger.debug(
                 "[sphinxcontrib-matlabdomain] parsing function %s from %s.",
                 name,
                 modname,
             )
-            return MatFunction(name, modname, tree.root_node, encoding)
+            entity = MatFunction(name, modname, tree.root_node, encoding)
         else:
-            return MatScript(name, modname, tree.root_node, encoding)
-
-        return None
+            entity = MatScript(name, modname, tree.root_node, encoding)
+        return entity
 
     @staticmethod
     def parse_mlappfile(mlappfile, name, path):
@@ -615,7 +1950,9 @@ class MatObject(object):
 
         modname = path.replace(os.sep, ".")  # module name
 
-        return MatApplication(name, modname, docstring)
+        entity = MatApplication(name, modname, docstring)
+        entity.file = mlappfile
+        return entity
 
 
 # TODO: get docstring and __all__ from contents.m if exists
@@ -641,6 +1978,9 @@ class MatModule(MatObject):
         self.package = package
         #: entities found in the module: class, function, module (subpath and +package)
         self.entities = []
+        #: True once all members on disk were added to `entities`, which may
+        #: hold only some of them before, see `load_entity`
+        self.listed = False
 
     def ref_role(self):
         """Returns role to use for references to this object (e.g. when generating auto-links)"""
@@ -648,9 +1988,12 @@ class MatModule(MatObject):
 
     def safe_getmembers(self):
         logger.debug(
-            f"[sphinxcontrib-matlabdomain] MatModule.safe_getmembers {self.name=}, {self.path=}, {self.package=}"
+            "[sphinxcontrib-matlabdomain] MatModule.safe_getmembers name=%r, path=%r, package=%r",
+            self.name,
+            self.path,
+            self.package,
         )
-        if self.entities:
+        if self.listed:
             return self.entities
 
         results = []
@@ -667,6 +2010,9 @@ class MatModule(MatObject):
                 key.endswith(".m") or key.endswith(".mlapp")
             ):
                 continue
+            # Nor what matches `matlab_exclude_patterns`
+            if is_excluded(path):
+                continue
             # trim file extension
             if os.path.isfile(path):
                 key, _ = os.path.splitext(key)
@@ -675,6 +2021,7 @@ class MatModule(MatObject):
                 if value:
                     results.append((key, value))
         self.entities = results
+        self.listed = True
         # results.sort()
         return results
 
@@ -721,7 +2068,7 @@ class MatModule(MatObject):
         elif name == "__module__":
             logger.debug(
                 "[sphinxcontrib-matlabdomain] mod %s is a package does not have __module__.",
-                self,
+                self.name,
             )
             return None
         else:
@@ -730,7 +2077,7 @@ class MatModule(MatObject):
                 if name == entity_name:
                     logger.debug(
                         "[sphinxcontrib-matlabdomain] mod %s already has entity %s.",
-                        self,
+                        self.name,
                         name,
                     )
                     return entity_content
@@ -739,7 +2086,9 @@ class MatModule(MatObject):
             if entity:
                 self.entities.append((name, entity))
                 logger.debug(
-                    f"[sphinxcontrib-matlabdomain] entity {name=} imported from {self=}"
+                    "[sphinxcontrib-matlabdomain] entity %r imported from %s",
+                    name,
+                    self.name,
                 )
                 return entity
 
@@ -758,7 +2107,8 @@ class MatFunction(MatObject):
 
     def __init__(self, name, modname, tokens, encoding):
         super(MatFunction, self).__init__(name)
-        parsed_function = MatFunctionParser(tokens, encoding)
+        _, function_parser = parser_engine()
+        parsed_function = function_parser(tokens, encoding)
         #: Path of folder containing :class:`MatObject`.
         self.module = modname
         #: docstring
@@ -807,7 +2157,8 @@ class MatClass(MatObject):
 
     def __init__(self, name, modname, tokens, encoding):
         super(MatClass, self).__init__(name)
-        parsed_class = MatClassParser(tokens, encoding)
+        class_parser, _ = parser_engine()
+        parsed_class = class_parser(tokens, encoding)
         #: Path of folder containing :class:`MatObject`.
         self.module = modname
         #: dictionary of class attributes
@@ -827,6 +2178,10 @@ class MatClass(MatObject):
         self.enumerations = parsed_class.enumerations
         #: remaining tokens after main class definition is parsed
         self.rem_tks = None
+        # link targets by (matlab_short_links, matlab_keep_package_prefix)
+        self._fullnames = {}
+        # method names and the pattern built for them by `method_call_pattern`
+        self._method_call_pattern = ((), None)
 
     def ref_role(self):
         """Returns role to use for references to this object (e.g. when generating auto-links)"""
@@ -834,9 +2189,16 @@ class MatClass(MatObject):
 
     def fullname(self, env):
         """Returns full name for class object, for use as link target"""
+        key = (env.config.matlab_short_links, env.config.matlab_keep_package_prefix)
+        fullname = self._fullnames.get(key)
+        if fullname is None:
+            fullname = self._fullnames[key] = self._make_fullname(*key)
+        return fullname
+
+    def _make_fullname(self, short_links, keep_package_prefix):
         modname = self.__module__
         classname = self.name
-        if env.config.matlab_short_links:
+        if short_links:
             # modname is only used for package names
             # - "target.+package" => "package"
             # - "target" => ""
@@ -844,11 +2206,36 @@ class MatClass(MatObject):
             parts = [part for part in parts if part.startswith("+")]
             modname = ".".join(parts)
 
-        if not env.config.matlab_keep_package_prefix:
+        if not keep_package_prefix:
             modname = strip_package_prefix(modname)
 
         return f"{modname}.{classname}".lstrip(".")
 
+    def method_call_pattern(self):
+        """
+        Returns a compiled pattern matching calls ``<method>()`` of any method
+        of the class, or ``None`` if the class has no methods. The method name
+        is in the group ``name``.
+
+        The pattern is built once and rebuilt only if methods are added, e.g.
+        from a class folder.
+        """
+        names = tuple(self.methods)
+        if names != self._method_call_pattern[0]:
+            pattern = None
+            if names:
+                # longest names first, such that no method matches the prefix
+                # of another one.
+                alternatives = "|".join(
+                    re.escape(n) for n in sorted(names, key=len, reverse=True)
+                )
+                # negative look-behind for ` . < @ * <non-breaking space>, then <name>()
+                pattern = re.compile(
+                    r"(?<!(`|\.|<|@|\*| ))\b(?P<name>" + alternatives + r")\(\)(?! )"
+                )
+            self._method_call_pattern = (names, pattern)
+        return self._method_call_pattern[1]
+
     def link(self, env, name=None):
         """Returns link for class object"""
         target = self.fullname(env)
@@ -868,14 +2255,14 @@ class MatClass(MatObject):
     @property
     def __bases__(self):
         bases_ = dict.fromkeys(list(self.bases))  # make copy of bases
-        class_entity_table = {}
-        for name, entity in entities_table.items():
-            if isinstance(entity, MatClass) or "@" in name:
-                class_entity_table[name] = entity
-
+        # Look up the bases where the class was found, which need not be the
+        # current registry.
+        table = self.registry.entities_table
         for base in bases_:
-            if base in class_entity_table:
-                bases_[base] = class_entity_table[base]
+            if base in table:
+                entity = table[base]
+                if isinstance(entity, MatClass) or "@" in base:
+                    bases_[base] = entity
 
         return bases_
 
@@ -984,8 +2371,9 @@ class MatScript(MatObject):
         parsed_script = MatScriptParser(tks, encoding)
         #: Path of folder containing :class:`MatScript`.
         self.module = modname
-        #: List of tokens parsed from mfile by Pygments.
-        self.tokens = tks
+        #: Not kept, the syntax tree holds the whole file, which may be mapped
+        #: by :func:`read_source` and closed after parsing.
+        self.tokens = None
         #: docstring
         self.docstring = parsed_script.docstring
 
@@ -1046,9 +2434,15 @@ class MatcodeError(Exception):
         return res
 
 
+class _AnalyzerCache(object):
+    # The `Registry.analyzer_cache` of the current registry.
+    def __get__(self, obj, cls):
+        return current_registry().analyzer_cache
+
+
 class MatModuleAnalyzer(object):
     # cache for analyzer objects -- caches both by module and file name
-    cache = {}
+    cache = _AnalyzerCache()
 
     @classmethod
     def for_folder(cls, dirname, modname):
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+sphinx-matlab-watch
+~~~~~~~~~~~~~~~~~~~
+
+Keep a Sphinx application alive and rebuild the documentation when MATLAB
+sources in ``matlab_src_dir`` change.
+
+Only the changed files are parsed again. The entities are patched into
+``entities_table`` in place and Sphinx reads only the documents that depend on
+the changed files.
+
+:copyright: Copyright 2025 by the sphinxcontrib-matlabdomain team.
+:license: BSD, see LICENSE for details.
+"""
+
+import argparse
+import contextlib
+import sys
+import time
+from pathlib import Path
+
+from sphinx.application import Sphinx
+from sphinx.environment import CONFIG_OK
+
+from sphinxcontrib import mat_types
+
+
+class MatSourceWatcher(object):
+    """
+    Polling watcher for a MATLAB source tree.
+
+    :param basedir: Folder to watch, usually ``MatObject.basedir``.
+    :type basedir: str
+    """
+
+    def __init__(self, basedir):
+        self.basedir = basedir
+        self.snapshot = mat_types.tree_snapshots.get(basedir)
+        if self.snapshot is None:
+            self.snapshot = mat_types.snapshot_tree(basedir)
+
+    def poll(self):
+        """Return the relative paths changed since the previous poll."""
+        snapshot = mat_types.snapshot_tree(self.basedir)
+        changed = mat_types.diff_snapshots(self.snapshot, snapshot)
+        self.snapshot = snapshot
+        # The changes are handed to `rebuild`, a later `analyze` of the same
+        # tree does not have to re-parse them.
+        mat_types.tree_snapshots[self.basedir] = snapshot
+        return changed
+
+
+def rebuild(app, changed):
+    """Patch the entities of the *changed* paths and rebuild outdated documents."""
+    with mat_types.registry_for(app).activated():
+        mat_types.update_entities(changed)
+    # The environment is in sync with the configuration after the first
+    # build, otherwise Sphinx reads all documents again.
+    app.env.config_status = CONFIG_OK
+    app.build(force_all=False)
+
+
+def watch(app, interval=1.0, max_polls=None):
+    """Poll ``matlab_src_dir`` of *app* every *interval* seconds and rebuild.
+
+    Runs until interrupted or, if given, *max_polls* polls have been done.
+    """
+    registry = mat_types.registry_for(app)
+    with registry.activated():
+        watcher = MatSourceWatcher(registry.basedir)
+    polls = 0
+    while max_polls is None or polls < max_polls:
+        time.sleep(interval)
+        polls += 1
+        with registry.activated():
+            changed = watcher.poll()
+        if not changed:
+            continue
+        print(f"Changed: {', '.join(changed)}")
+        start = time.perf_counter()
+        rebuild(app, changed)
+        print(f"Rebuilt in {time.perf_counter() - start:.2f} s")
+
+
+def main(argv=None):
+    """Main entry point for sphinx-matlab-watch."""
+    parser = argparse.ArgumentParser(
+        description="Build Sphinx documentation and rebuild it when MATLAB sources change.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Example usage:
+  sphinx-matlab-watch docs docs/_build/html
+  sphinx-matlab-watch -b dirhtml --interval 0.5 docs docs/_build/dirhtml
+        """,
+    )
+    parser.add_argument("source_dir", type=Path, help="Path to Sphinx source directory")
+    parser.add_argument("output_dir", type=Path, help="Path to output directory")
+    parser.add_argument(
+        "-b", "--builder", default="html", help="Builder to use (default: html)"
+    )
+    parser.add_argument(
+        "-d",
+        "--doctree-dir",
+        type=Path,
+        default=None,
+        help="Directory for doctree and environment files "
+        "(default: OUTPUT_DIR/.doctrees)",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Seconds between polls of matlab_src_dir (default: 1.0)",
+    )
+
+    args = parser.parse_args(argv)
+
+    if not args.source_dir.is_dir():
+        print(
+            f"Error: Source path is not a directory: {args.source_dir}", file=sys.stderr
+        )
+        return 1
+
+    doctree_dir = args.doctree_dir or args.output_dir / ".doctrees"
+    app = Sphinx(
+        str(args.source_dir),
+        str(args.source_dir),
+        str(args.output_dir),
+        str(doctree_dir),
+        args.builder,
+    )
+    if app.config.matlab_src_dir is None:
+        print("Error: matlab_src_dir is not set in conf.py", file=sys.stderr)
+        return 1
+
+    app.build()
+    print(f"Watching {mat_types.registry_for(app).basedir} (press Ctrl+C to stop)")
+    with contextlib.suppress(KeyboardInterrupt):
+        watch(app, args.interval)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,6 +13,7 @@ import re
 from docutils import nodes
 from docutils.parsers.rst import Directive, directives
 from sphinx import addnodes
+from sphinx.config import ENUM
 from sphinx.directives import ObjectDescription
 from sphinx.domains import Domain, Index, ObjType
 from sphinx.locale import _ as translation
@@ -21,7 +22,14 @@ from sphinx.util.docfields import Field, GroupedField, TypedField
 from sphinx.util.logging import getLogger
 from sphinx.util.nodes import make_refnode
 
-from . import mat_directives, mat_types
+from . import (
+    mat_cache,
+    mat_dependencies,
+    mat_directives,
+    mat_profile,
+    mat_trace,
+    mat_types,
+)
 from . import mat_documenters as doc
 
 logger = getLogger("matlab-domain")
@@ -824,7 +832,11 @@ class MATLABDomain(Domain):
         modname = node.get("mat:module")
         clsname = node.get("mat:class")
         searchmode = (node.hasattr("refspecific") and 1) or 0
-        matches = self.find_obj(env, modname, clsname, target, type, searchmode)
+        with (
+            mat_types.registry_for(env.app).activated(),
+            mat_trace.span(f"resolve {target}", "xref", type=type, docname=fromdocname),
+        ):
+            matches = self.find_obj(env, modname, clsname, target, type, searchmode)
         if not matches:
             return None
         elif len(matches) > 1:
@@ -888,7 +900,16 @@ def ensure_configuration(app, env):
 
 def setup(app):
     app.connect("config-inited", ensure_configuration)
+    # before `analyze`, to trace it
+    app.connect("builder-inited", mat_profile.builder_inited, priority=400)
+    app.connect("builder-inited", mat_trace.builder_inited, priority=400)
     app.connect("builder-inited", analyze)
+    app.connect("env-before-read-docs", mat_dependencies.env_before_read_docs)
+    app.connect("env-purge-doc", mat_dependencies.env_purge_doc)
+    app.connect("env-get-outdated", mat_dependencies.env_get_outdated)
+    app.connect("doctree-read", mat_profile.doctree_read)
+    app.connect("build-finished", mat_profile.build_finished)
+    app.connect("build-finished", mat_trace.build_finished)
 
     app.add_domain(MATLABDomain)
     # autodoc
@@ -899,7 +920,27 @@ def setup(app):
     app.add_config_value("matlab_show_property_specs", False, "env")
     app.add_config_value("matlab_short_links", False, "env")
     app.add_config_value("matlab_auto_link", None, "env")
+    app.add_config_value(
+        "matlab_docstring_cache_size", doc.DOCSTRING_CACHE_SIZE, "", [int, type(None)]
+    )
     app.add_config_value("matlab_class_signature", False, "env")
+    app.add_config_value("matlab_exclude_patterns", [], "env")
+    app.add_config_value("matlab_scan_referenced_only", False, "env")
+    app.add_config_value("matlab_mmap_threshold", 1024 * 1024, "", [int, type(None)])
+    app.add_config_value("matlab_parse_workers", 0, "", [int, type(None)])
+    app.add_config_value("matlab_parse_timeout", None, "env", [int, float, type(None)])
+    app.add_config_value("matlab_header_only_size", None, "env", [int, type(None)])
+    app.add_config_value("matlab_header_only_patterns", [], "env")
+    app.add_config_value("matlab_index_file", None, "", [str, type(None)])
+    app.add_config_value("matlab_cache_dir", None, "", [str, type(None)])
+    app.add_config_value(
+        "matlab_cache_size", mat_cache.DEFAULT_SIZE, "", [int, type(None)]
+    )
+    app.add_config_value("matlab_memory_profile", False, "")
+    app.add_config_value("matlab_trace_file", None, "", [str, type(None)])
+    app.add_config_value(
+        "matlab_parser_engine", "query", "env", ENUM(*mat_types.PARSER_ENGINES)
+    )
 
     app.registry.add_documenter("mat:module", doc.MatModuleDocumenter)
     app.add_directive_to_domain(
@@ -17,27 +17,50 @@ import os
 import sys
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sphinx.util.matching import Matcher
 
 MATLAB_EXTENSIONS = {".m", ".mlapp"}
 MAX_FILES_PER_PAGE = 50
 
 
-def find_matlab_files(source_dir: Path) -> List[Path]:
-    """Find all MATLAB files in the source directory."""
+def find_matlab_files(
+    source_dir: Path,
+    exclude_patterns: Sequence[str] = (),
+    excluded: Optional[List[Path]] = None,
+) -> List[Path]:
+    """Find all MATLAB files in the source directory.
+
+    Folders and files whose path relative to `source_dir` matches one of the
+    glob-style `exclude_patterns` are skipped, folders without descending into
+    them. Skipped paths are appended to `excluded` if given.
+    """
+    matcher = Matcher(exclude_patterns)
+
+    def is_excluded(path: Path) -> bool:
+        if not exclude_patterns or not matcher(path.relative_to(source_dir).as_posix()):
+            return False
+        if excluded is not None:
+            excluded.append(path)
+        return True
+
     matlab_files = []
     for root, dirs, files in os.walk(source_dir):
         # Skip hidden directories and common non-source directories
         dirs[:] = [
             d
             for d in dirs
-            if not d.startswith(".") and d not in ["private", "__pycache__"]
+            if not d.startswith(".")
+            and d not in ["private", "__pycache__"]
+            and not is_excluded(Path(root) / d)
         ]
 
         for file in files:
             if any(file.endswith(ext) for ext in MATLAB_EXTENSIONS):
                 file_path = Path(root) / file
-                matlab_files.append(file_path)
+                if not is_excluded(file_path):
+                    matlab_files.append(file_path)
 
     return sorted(matlab_files)
 
@@ -291,6 +314,7 @@ def main():
 Example usage:
   sphinx-matlab-apidoc -o docs/source /path/to/matlab/code
   sphinx-matlab-apidoc -o docs/source /path/to/matlab/code --dry-run
+  sphinx-matlab-apidoc -o docs/source /path/to/matlab/code -e tests -e "**/examples"
         """,
     )
 
@@ -319,6 +343,15 @@ Example usage:
         default=50,
         help=f"Maximum files per page (default: 50)",
     )
+    parser.add_argument(
+        "-e",
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Glob-style pattern, relative to source_dir, of folders and files "
+        "to skip. May be given several times",
+    )
 
     args = parser.parse_args()
 
@@ -352,7 +385,12 @@ Example usage:
     print(f"Scanning MATLAB files in: {args.source_dir}")
 
     # Find all MATLAB files
-    matlab_files = find_matlab_files(args.source_dir)
+    excluded: List[Path] = []
+    matlab_files = find_matlab_files(args.source_dir, args.exclude, excluded)
+    if excluded:
+        print(f"Excluded {len(excluded)} path(s):")
+        for path in excluded:
+            print(f"  {path.relative_to(args.source_dir).as_posix()}")
 
     if not matlab_files:
         print("Warning: No MATLAB files found!")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark of reading large generated MATLAB files.
+
+Generates a tree with many multi-megabyte functions that embed data tables
+and analyzes it once with ``matlab_mmap_threshold = None``, which reads every
+file into memory, and once with memory-mapped files. Prints the peak of the
+memory allocated by Python and checks that mapping the files lowers it.
+tree-sitter allocates its trees through Python, so the peak includes the tree
+of the largest file, mapping saves the copy of the file next to it.
+
+To run this benchmark:
+    pytest test_slow/test_mmap_benchmark.py -v -s -m slow
+"""
+
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+
+from sphinxcontrib import mat_types
+
+FILES = 20
+ROWS = 40000  # about 2.5 MB per file
+
+
+def data_table(name: str, rows: int) -> str:
+    """Generate a function returning a `rows` x 4 table."""
+    lines = [
+        f"function t = {name}()",
+        f"% {name.upper()} Generated lookup table",
+        "%",
+        f"% Returns a {rows}x4 matrix.",
+        "t = [",
+    ]
+    lines += [f"    {i} {i * 0.5:.6f} {i % 7} {-i * 1.25:.6f}" for i in range(rows)]
+    lines += ["];", "end", ""]
+    return "\n".join(lines)
+
+
+@pytest.fixture(scope="module")
+def tree(tmp_path_factory):
+    tree = tmp_path_factory.mktemp("tables")
+    for i in range(FILES):
+        name = f"table{i}"
+        (tree / f"{name}.m").write_text(data_table(name, ROWS))
+    return tree
+
+
+def analyze(tree, threshold, monkeypatch):
+    config = SimpleNamespace(matlab_mmap_threshold=threshold)
+    monkeypatch.setattr(
+        mat_types.MatObject, "sphinx_env", SimpleNamespace(config=config)
+    )
+    tracemalloc.start()
+    start = time.perf_counter()
+    entities = [
+        mat_types.MatObject.parse_mfile(str(mfile), mfile.stem, "tables")
+        for mfile in sorted(tree.glob("*.m"))
+    ]
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(entities) == FILES
+    assert all(e.docstring.startswith("TABLE") for e in entities)
+    return peak, elapsed
+
+
+def test_mmap_benchmark(tree, monkeypatch):
+    size = sum(mfile.stat().st_size for mfile in tree.glob("*.m"))
+    read_peak, read_time = analyze(tree, None, monkeypatch)
+    mmap_peak, mmap_time = analyze(tree, 0, monkeypatch)
+    print(
+        f"\n{FILES} files, {size / 2**20:.1f} MiB: "
+        f"read peak {read_peak / 2**20:.2f} MiB in {read_time:.2f} s, "
+        f"mmap peak {mmap_peak / 2**20:.2f} MiB in {mmap_time:.2f} s"
+    )
+    # Reading holds at least one file in memory, mapping does not.
+    assert mmap_peak < read_peak
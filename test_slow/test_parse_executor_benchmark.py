@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark of parsing a synthetic MATLAB tree serially, in threads and in
+processes.
+
+Threads use :func:`sphinxcontrib.mat_types.prefetch_mfiles`, i.e.
+``matlab_parse_workers``. The process pool is only measured for comparison.
+Entities cannot be pickled, their ``__module__`` is a property, so the
+processes send plain definitions back to the parent. This leaves out the cost
+of rebuilding entities from them. Prints the timings and checks that the
+threads are not slower than the processes.
+
+To run this benchmark:
+    pytest test_slow/test_parse_executor_benchmark.py -v -s -m slow
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from sphinxcontrib import mat_types
+
+FOLDERS = 8
+CLASSES = 25
+MEMBERS = 40
+WORKERS = 4
+
+
+def synthetic_class(name: str, members: int) -> str:
+    lines = [f"classdef {name} < handle", f"    % {name} A synthetic class", "    properties"]
+    for i in range(members):
+        lines.append(f"        Prop{i} (1,1) double = {i} % Property {i}")
+    lines += ["    end", "    methods"]
+    for i in range(members):
+        lines += [
+            f"        function out = method{i}(obj, x)",
+            f"            % Method {i}",
+            "            out = obj.Prop0 + x;",
+            "        end",
+        ]
+    lines += ["    end", "end", ""]
+    return "\n".join(lines)
+
+
+@pytest.fixture(scope="module")
+def tree(tmp_path_factory):
+    tree = tmp_path_factory.mktemp("synthetic")
+    relpaths = []
+    for f in range(FOLDERS):
+        folder = tree / f"folder{f}"
+        folder.mkdir()
+        for c in range(CLASSES):
+            name = f"Class{f}x{c}"
+            (folder / f"{name}.m").write_text(synthetic_class(name, MEMBERS))
+            relpaths.append(os.path.join(f"folder{f}", f"{name}.m"))
+    return str(tree), relpaths
+
+
+def parse(basedir, relpath):
+    path, filename = os.path.split(relpath)
+    name = os.path.splitext(filename)[0]
+    return mat_types.MatObject.parse_mfile(os.path.join(basedir, relpath), name, path)
+
+
+def definition(entity):
+    return {
+        "name": entity.name,
+        "bases": entity.bases,
+        "docstring": entity.docstring,
+        "properties": entity.properties,
+        "methods": {
+            name: (meth.retv, meth.args, meth.docstring, meth.attrs)
+            for name, meth in entity.methods.items()
+        },
+    }
+
+
+def parse_definition(basedir, relpath):
+    return definition(parse(basedir, relpath))
+
+
+def summary(definitions):
+    return sorted((d["name"], len(d["properties"]), len(d["methods"])) for d in definitions)
+
+
+def test_parse_executor_benchmark(tree, monkeypatch):
+    basedir, relpaths = tree
+    monkeypatch.setattr(mat_types.MatObject, "basedir", basedir)
+    timings = {}
+
+    start = time.perf_counter()
+    serial = [parse(basedir, relpath) for relpath in relpaths]
+    timings["serial"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    mat_types.prefetch_mfiles(relpaths, WORKERS)
+    threaded = list(mat_types.prefetched.values())
+    timings["thread"] = time.perf_counter() - start
+    mat_types.prefetched.clear()
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=WORKERS) as executor:
+        processed = list(
+            executor.map(
+                parse_definition, [basedir] * len(relpaths), relpaths, chunksize=8
+            )
+        )
+    timings["process"] = time.perf_counter() - start
+
+    serial = [definition(e) for e in serial]
+    assert summary(definition(e) for e in threaded) == summary(serial)
+    assert summary(processed) == summary(serial)
+    print(
+        f"\n{len(relpaths)} files, {WORKERS} workers, {os.cpu_count()} CPUs: "
+        + ", ".join(f"{mode} {t:.2f} s" for mode, t in timings.items())
+    )
+    assert timings["thread"] <= timings["process"]
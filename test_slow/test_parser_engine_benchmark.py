@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the class parser engines on large generated classes.
+
+Compares the ``matlab_parser_engine`` values "query" and "cursor", prints the
+timings and checks that the cursor engine is not slower.
+
+To run this benchmark:
+    pytest test_slow/test_parser_engine_benchmark.py -v -s -m slow
+"""
+
+import timeit
+
+import pytest
+from tree_sitter import Parser
+
+from sphinxcontrib.mat_tree_sitter_parser import (
+    ML_LANG,
+    PARSER_ENGINES,
+    tree_sitter_is_0_21,
+)
+
+
+def large_class(members: int) -> bytes:
+    """Generate a class with `members` documented properties and methods."""
+    lines = ["classdef Large < handle", "    % A large class", "    properties"]
+    for i in range(members):
+        lines += [
+            f"        % Property {i}",
+            f"        Prop{i} (1,1) double {{mustBeFinite}} = {i} % inline {i}",
+        ]
+    lines += ["    end", "    methods"]
+    for i in range(members):
+        lines += [
+            f"        function out = method{i}(obj, x)",
+            f"            % Method {i}",
+            "            arguments",
+            "                obj",
+            "                x (1,1) double = 1",
+            "            end",
+            "            for k = 1:10",
+            "                out = obj.Prop0 + x * k;",
+            "            end",
+            "        end",
+        ]
+    lines += ["    end", "end", ""]
+    return "\n".join(lines).encode()
+
+
+def parse_tree(code: bytes):
+    if tree_sitter_is_0_21():
+        parser = Parser()
+        parser.set_language(ML_LANG)
+    else:
+        parser = Parser(ML_LANG)
+    return parser.parse(code)
+
+
+@pytest.mark.parametrize("members", [100, 1000])
+def test_cursor_engine_benchmark(members):
+    root = parse_tree(large_class(members)).root_node
+    timings = {}
+    for engine, (class_parser, _) in PARSER_ENGINES.items():
+        parsed = class_parser(root, "utf-8")
+        assert len(parsed.properties) == members
+        assert len(parsed.methods) == members
+        timings[engine] = min(
+            timeit.repeat(lambda: class_parser(root, "utf-8"), number=1, repeat=3)
+        )
+
+    print(
+        f"\n{members} members: "
+        + ", ".join(f"{engine} {t:.3f} s" for engine, t in timings.items())
+    )
+    assert timings["cursor"] <= timings["query"]
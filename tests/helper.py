@@ -7,10 +7,16 @@ sphinxcontrib.test.helper
 :license: BSD, see LICENSE for details.
 """
 
+import inspect
 import os.path
+import shutil
+import threading
 
+import pytest
 from sphinx import version_info as sphinx_version_info
 
+from sphinxcontrib import mat_types
+
 isVersion72OrNewer = (
     sphinx_version_info[0] >= 7 and sphinx_version_info[1] >= 2
 ) or sphinx_version_info[0] >= 8
@@ -28,3 +34,50 @@ else:
 
     def rootdir(the_file):
         return sphinx_path(os.path.dirname(__file__)).abspath()
+
+
+def copy_root(tmp_path, name="test_autodoc"):
+    """Copy the test root *name* to *tmp_path*, to change its files."""
+    srcdir = tmp_path / name
+    shutil.copytree(rootdir(__file__) / "roots" / name, srcdir)
+    return srcdir
+
+
+@pytest.fixture
+def srcdir(tmp_path):
+    """A copy of the ``test_autodoc`` root, see :func:`copy_root`."""
+    return copy_root(tmp_path)
+
+
+class Calls(list):
+    """The names of the files parsed, with the threads parsing them."""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def clear(self):
+        super().clear()
+        self.threads.clear()
+
+
+@pytest.fixture
+def parsed(request, monkeypatch):
+    """Records the names of all files parsed, as :class:`Calls`.
+
+    Records the calls of ``MatObject.parse_mfile``, or of the ``MatObject``
+    method given by indirect parametrization, e.g. ``_parse_within_budget`` to
+    leave out files found in the parse cache.
+    """
+    method = getattr(request, "param", "parse_mfile")
+    original = getattr(mat_types.MatObject, method)
+    signature = inspect.signature(original)
+    calls = Calls()
+
+    def recording(*args, **kwargs):
+        calls.append(signature.bind(*args, **kwargs).arguments["name"])
+        calls.threads.append(threading.current_thread())
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(mat_types.MatObject, method, staticmethod(recording))
+    return calls
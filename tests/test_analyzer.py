@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+test_analyzer
+~~~~~~~~~~~~~
+
+Test that :class:`Analyzer` finds the MATLAB entities without Sphinx, each
+analyzer in a registry of its own.
+
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import helper
+import pytest
+from sphinx.testing.fixtures import make_app, test_params  # noqa: F811;
+
+from sphinxcontrib import mat_types
+
+DIRNAME = os.path.abspath(os.path.dirname(__file__))
+TESTDATA_ROOT = os.path.join(DIRNAME, "test_data")
+
+
+@pytest.fixture
+def srcdir():
+    return str(helper.rootdir(__file__) / "roots" / "test_autodoc")
+
+
+def entities(registry):
+    return {
+        name: (type(entity), getattr(entity, "docstring", None))
+        for name, entity in registry.entities_table.items()
+        if not isinstance(entity, dict)
+    }
+
+
+def test_analyzer(srcdir):
+    mat_types.entities_table.clear()
+    registry = mat_types.Analyzer(srcdir).analyze()
+    cls = registry.entities_table["target.ClassExample"]
+    assert isinstance(cls, mat_types.MatClass)
+    assert cls.docstring.startswith("Example class")
+    assert "mymethod" in cls.methods
+    assert registry.entities_table["ClassExample"] is cls
+    assert registry.basedir == srcdir
+    # The current registry, e.g. that of Sphinx, is left alone.
+    assert mat_types.entities_table == {}
+
+
+def test_analyzer_matches_sphinx(make_app, srcdir):
+    mat_types.entities_table.clear()
+    try:
+        app = make_app(srcdir=helper.rootdir(__file__) / "roots" / "test_autodoc")
+        expected = entities(mat_types.registry_for(app))
+    finally:
+        mat_types.entities_table.clear()
+    assert entities(mat_types.Analyzer(srcdir).analyze()) == expected
+
+
+def test_analyzers_in_threads(srcdir):
+    def analyze(src_dir, options):
+        return mat_types.Analyzer(src_dir, options).analyze()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        autodoc = executor.submit(analyze, srcdir, {"matlab_parse_workers": 2})
+        testdata = executor.submit(
+            analyze, TESTDATA_ROOT, {"matlab_exclude_patterns": ["+package"]}
+        )
+        autodoc, testdata = autodoc.result(), testdata.result()
+    assert "target.ClassExample" in autodoc.entities_table
+    assert "ClassWithEnumMethod" not in autodoc.entities_table
+    assert "ClassWithEnumMethod" in testdata.entities_table
+    assert "target.ClassExample" not in testdata.entities_table
+    assert testdata.excluded_paths == {"+package"}
+    assert autodoc.excluded_paths == set()
+
+
+def test_referenced_only(srcdir):
+    analyzer = mat_types.Analyzer(srcdir)
+    registry = analyzer.analyze([(("target.submodule.ClassMeow",), False)])
+    assert "target.submodule.ClassMeow" in registry.entities_table
+    assert "target.ClassExample" not in registry.entities_table
+    with analyzer.activated():
+        assert mat_types.load_entity("target.ClassExample") is not None
+    assert "target.ClassExample" in registry.entities_table
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+test_app_registry
+~~~~~~~~~~~~~~~~~
+
+Test that Sphinx applications in one process each keep their own MATLAB
+entities.
+
+:license: BSD, see LICENSE for details.
+"""
+
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import helper
+import pytest
+from sphinx.testing.fixtures import make_app, test_params  # noqa: F811;
+
+from sphinxcontrib import mat_types
+
+
+@pytest.fixture(scope="module")
+def rootdir():
+    return helper.rootdir(__file__)
+
+
+def target_text(app):
+    content = pickle.loads((app.doctreedir / "index_target.doctree").read_bytes())
+    return content[0].astext()
+
+
+def test_interleaved_apps(make_app, rootdir):
+    autodoc = make_app(srcdir=rootdir / "roots" / "test_autodoc")
+    autodoc.builder.build_all()
+    expected = target_text(autodoc)
+
+    # Another application analyzes its own tree in between.
+    other = make_app(srcdir=rootdir / "roots" / "test_module_class_names")
+    assert mat_types.registry_for(other) is not mat_types.registry_for(autodoc)
+    # Neither is left current once it analyzed its tree.
+    assert mat_types.current_registry() is mat_types.default_registry
+    assert "target.ClassExample" not in mat_types.registry_for(other).entities_table
+
+    autodoc.builder.build_all()
+    assert target_text(autodoc) == expected
+    assert "ClassExample" in expected
+    assert "target.ClassExample" in mat_types.registry_for(autodoc).entities_table
+
+
+def test_apps_in_threads(make_app, rootdir):
+    roots = ["test_autodoc", "test_module_class_names"] * 2
+
+    def build(root):
+        app = make_app(srcdir=rootdir / "roots" / root)
+        assert mat_types.current_registry() is mat_types.default_registry
+        with mat_types.registry_for(app).activated():
+            return app, set(mat_types.entities_table)
+
+    with ThreadPoolExecutor(max_workers=len(roots)) as executor:
+        results = list(executor.map(build, roots))
+    for (app, names), root in zip(results, roots):
+        assert names == set(mat_types.registry_for(app).entities_table)
+        assert ("target.ClassExample" in names) == (root == "test_autodoc")
+    assert results[0][1] == results[2][1]
+    assert results[1][1] == results[3][1]
+
+
+def test_bases_from_own_registry(rootdir):
+    registry = mat_types.Analyzer(rootdir / "roots" / "test_autodoc").analyze()
+    cls = registry.entities_table["target.submodule.ClassMeow"]
+    base = registry.entities_table["package.ClassBar"]
+    with mat_types.Registry().activated():
+        assert mat_types.entities_table == {}
+        assert cls.__bases__ == {"package.ClassBar": base}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
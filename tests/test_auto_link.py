@@ -0,0 +1,104 @@
+from types import SimpleNamespace
+
+import helper
+import pytest
+from sphinx.testing.fixtures import make_app, test_params  # noqa: F811;
+
+from sphinxcontrib import mat_documenters as doc
+from sphinxcontrib import mat_types
+
+
+@pytest.fixture
+def app(make_app):
+    srcdir = helper.rootdir(__file__) / "roots" / "test_autodoc"
+    app = make_app(srcdir=srcdir)
+    with mat_types.registry_for(app).activated():
+        yield app
+
+
+def test_method_call_pattern(app):
+    cls = mat_types.entities_table["target.ClassExample"]
+    p = cls.method_call_pattern()
+    assert p is cls.method_call_pattern()
+
+    line = "Calls mymethod(), but not `mymethod()`, obj.mymethod() or mymethodx()."
+    assert [m.group("name") for m in p.finditer(line)] == ["mymethod"]
+
+
+def test_method_call_pattern_follows_methods(app):
+    cls = mat_types.entities_table["target.ClassExample"]
+    p = cls.method_call_pattern()
+    cls.methods["my"] = cls.methods["mymethod"]
+    try:
+        p_my = cls.method_call_pattern()
+        assert p_my is not p
+        names = [m.group("name") for m in p_my.finditer("my() and mymethod()")]
+        assert names == ["my", "mymethod"]
+    finally:
+        del cls.methods["my"]
+
+
+def test_class_without_methods():
+    cls = mat_types.MatClass.__new__(mat_types.MatClass)
+    cls.methods = {}
+    cls._method_call_pattern = ((), None)
+    assert cls.method_call_pattern() is None
+
+
+def test_entity_link_patterns_are_shared():
+    p, p2 = doc.entity_link_patterns("package.ClassBar")
+    assert doc.entity_link_patterns("package.ClassBar") == (p, p2)
+    assert p.search("See package.ClassBar for details")
+    assert not p.search("See package.ClassBar.prop for details")
+    assert p2.search("See package.ClassBar.prop for details").group(2) == "prop"
+
+
+def function_documenter(auto_link):
+    documenter = object.__new__(doc.MatFunctionDocumenter)
+    config = SimpleNamespace(
+        matlab_auto_link=auto_link, matlab_keep_package_prefix=False
+    )
+    documenter.env = SimpleNamespace(config=config)
+    return documenter
+
+
+DOCSTRING = [
+    [
+        "Uses ClassExample.",
+        "",
+        "Example::",
+        "",
+        "    obj = ClassExample();",
+        "",
+        "See also ClassExample",
+    ]
+]
+
+
+def test_linkable_lines():
+    documenter = function_documenter("all")
+    linkable = documenter.linkable_lines(DOCSTRING)
+    assert linkable == [[True, False, False, False, False, False, True]]
+
+
+def test_literal_block_detected_once_per_line(app, monkeypatch):
+    documenter = function_documenter("all")
+    lines = []
+    detect_literal_block = doc.MatlabDocumenter.detect_literal_block
+
+    def counting_detect_literal_block(self, line, no_link_state):
+        lines.append(line)
+        return detect_literal_block(self, line, no_link_state)
+
+    monkeypatch.setattr(
+        doc.MatlabDocumenter, "detect_literal_block", counting_detect_literal_block
+    )
+    docstrings = documenter.auto_link([list(DOCSTRING[0])])
+    assert lines == DOCSTRING[0]
+    assert docstrings[0][0] == "Uses :class:`ClassExample`."
+    assert docstrings[0][4] == "    obj = ClassExample();"
+    assert docstrings[0][6] == "See also :class:`ClassExample`"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -330,5 +330,20 @@ def test_root_class_signature(make_app, rootdir):
     )
 
 
+def test_class_members_filtered_once(make_app, rootdir):
+    srcdir = rootdir / "roots" / "test_autodoc"
+    app = make_app(srcdir=srcdir)
+    skipped = []
+    app.connect(
+        "autodoc-skip-member",
+        lambda app, what, name, obj, skip, options: skipped.append((what, name)),
+    )
+    app.builder.build_all()
+
+    class_members = sorted(name for what, name in skipped if what == "class")
+    assert "mymethod" in class_members
+    assert len(class_members) == len(set(class_members))
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
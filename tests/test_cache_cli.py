@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+test_cache_cli
+~~~~~~~~~~~~~~
+
+Test sphinx-matlab-cache, which fills ``matlab_cache_dir`` ahead of builds.
+
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+
+import helper
+import pytest
+
+from sphinxcontrib import mat_cache, mat_types
+
+
+@pytest.fixture
+def srcdir(tmp_path):
+    srcdir = helper.copy_root(tmp_path)
+    with open(srcdir / "conf.py", "a") as f:
+        f.write('matlab_cache_dir = "_cache"\n')
+    return srcdir
+
+
+def test_fill_and_check(srcdir, capsys):
+    assert mat_cache.main([str(srcdir), "--check", "-j", "1"]) == 1
+    assert "Not cached: target/ClassExample.m" in capsys.readouterr().out
+
+    assert mat_cache.main([str(srcdir), "-j", "2"]) == 0
+    out = capsys.readouterr()
+    assert "were cached already" in out.out
+    assert "files/s" in out.err
+    assert mat_cache.main([str(srcdir), "--check", "-j", "1"]) == 0
+    assert "Not cached" not in capsys.readouterr().out
+
+    path = srcdir / "target" / "ClassExample.m"
+    path.write_text(path.read_text() + "\n% changed\n")
+    assert mat_cache.main([str(srcdir), "--check", "-j", "1"]) == 1
+    assert capsys.readouterr().out.startswith("Not cached: target/ClassExample.m\n")
+
+
+def test_found_entries_are_used(srcdir):
+    mat_cache.main([str(srcdir), "-j", "1"])
+    cache = mat_cache.ParseCache(str(srcdir / "_cache"))
+    for path, _, _ in cache.entries():
+        os.utime(path, (0, 0))
+    # Looking the entries up keeps them from being pruned first.
+    assert mat_cache.main([str(srcdir), "--check", "-j", "1"]) == 0
+    assert all(last_use > 0 for _, _, last_use in cache.entries())
+
+
+def test_build_uses_filled_cache(srcdir, monkeypatch):
+    mat_cache.main([str(srcdir), "-j", "1"])
+    parsed = []
+    monkeypatch.setattr(
+        mat_types.MatObject,
+        "_parse_within_budget",
+        staticmethod(lambda parser, mfile, *args: parsed.append(mfile)),
+    )
+    src_dir, options = mat_cache.read_options(srcdir)
+    assert options == {"matlab_cache_dir": str(srcdir / "_cache")}
+    registry = mat_types.Analyzer(src_dir, options).analyze()
+    assert parsed == []
+    assert "target.ClassExample" in registry.entities_table
+
+
+def test_prune(srcdir, capsys):
+    mat_cache.main([str(srcdir), "-j", "1"])
+    with open(srcdir / "conf.py", "a") as f:
+        f.write("matlab_cache_size = 1000\n")
+    assert mat_cache.main([str(srcdir), "--prune"]) == 0
+    cache = mat_cache.ParseCache(str(srcdir / "_cache"))
+    assert 0 < cache.size() <= 1000 * mat_cache.PRUNE_RATIO
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,97 @@
+import logging
+import sys
+
+import helper
+import pytest
+from sphinx.testing.fixtures import make_app, test_params  # noqa: F811;
+
+from sphinxcontrib import mat_types
+
+
+@pytest.fixture
+def srcdir():
+    return helper.rootdir(__file__) / "roots" / "test_autodoc"
+
+
+@pytest.fixture
+def stringified(monkeypatch):
+    # Records entities converted to a string by sphinxcontrib itself. Sphinx
+    # converts the arguments of all events, that is not our business.
+    stringified = []
+    repr_ = mat_types.MatObject.__repr__
+
+    def counting_repr(self):
+        caller = sys._getframe(1).f_globals.get("__name__", "")
+        if caller.startswith("sphinxcontrib"):
+            stringified.append(self.name)
+        return repr_(self)
+
+    monkeypatch.setattr(mat_types.MatObject, "__repr__", counting_repr)
+    return stringified
+
+
+class RecordsHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def records():
+    handler = RecordsHandler()
+    logger = logging.getLogger("sphinx.matlab-domain")
+    logger.addHandler(handler)
+    yield handler.records
+    logger.removeHandler(handler)
+
+
+@pytest.fixture
+def tree_dumps(monkeypatch):
+    dumps = []
+    recursive_log_debug = mat_types.recursive_log_debug
+
+    def counting_recursive_log_debug(obj, indent=""):
+        if not indent:
+            dumps.append(obj)
+        recursive_log_debug(obj, indent)
+
+    monkeypatch.setattr(mat_types, "recursive_log_debug", counting_recursive_log_debug)
+    return dumps
+
+
+def is_entity_arg(arg):
+    if isinstance(arg, (list, tuple)):
+        return any(is_entity_arg(a) for a in arg)
+    if isinstance(arg, dict):
+        return any(is_entity_arg(a) for a in arg.values())
+    return isinstance(arg, mat_types.MatObject)
+
+
+def test_no_stringification_without_debug(
+    make_app, srcdir, stringified, records, tree_dumps
+):
+    app = make_app(srcdir=srcdir, freshenv=True)
+    app.builder.build_all()
+
+    with mat_types.registry_for(app).activated():
+        assert not mat_types.debug_enabled()
+    assert tree_dumps == []
+    assert stringified == []
+    # Messages are formatted lazily, but must not need entities either.
+    assert records
+    assert not [r.msg for r in records if is_entity_arg(r.args)]
+
+
+def test_tree_dump_with_debug(make_app, srcdir, tree_dumps):
+    app = make_app(srcdir=srcdir, freshenv=True, verbosity=2)
+
+    with mat_types.registry_for(app).activated():
+        assert mat_types.debug_enabled()
+        assert tree_dumps == [mat_types.entities_table["."]]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+test_directive_cache
+~~~~~~~~~~~~~~~~~~~~
+
+Test that the output of autodoc directives is kept in the environment and
+reused while the entities they consulted do not change.
+
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+import pickle
+import time
+
+import pytest
+from helper import srcdir  # noqa: F401;
+from sphinx.testing.fixtures import make_app, test_params  # noqa: F811;
+
+from sphinxcontrib import mat_directives
+
+
+@pytest.fixture
+def generated(monkeypatch):
+    # Records the arguments of the directives that ran their documenter.
+    generated = []
+    generate = mat_directives.MatlabAutodocDirective.generate
+
+    def counting_generate(self, *args):
+        generated.append(self.arguments[0])
+        return generate(self, *args)
+
+    monkeypatch.setattr(
+        mat_directives.MatlabAutodocDirective, "generate", counting_generate
+    )
+    return generated
+
+
+def touch(path):
+    future = time.time() + 10
+    os.utime(path, (future, future))
+
+
+@pytest.fixture
+def build(make_app, srcdir):
+    # Reads all documents of *srcdir* and returns the app and their text.
+    def build(**confoverrides):
+        for path in srcdir.glob("*.rst"):
+            touch(path)
+        app = make_app(srcdir=srcdir, confoverrides=confoverrides)
+        app.build()
+        texts = {
+            docname: pickle.loads(
+                (app.doctreedir / f"{docname}.doctree").read_bytes()
+            ).astext()
+            for docname in sorted(app.env.found_docs)
+        }
+        return app, texts
+
+    return build
+
+
+def test_unchanged_output_is_reused(build, generated):
+    app, expected = build()
+    assert "ClassExample" in generated
+    dependencies = app.env.matlab_entity_dependencies
+    generated.clear()
+
+    app, texts = build()
+    assert texts == expected
+    assert generated == []
+    assert app.env.matlab_entity_dependencies == dependencies
+
+
+def test_changed_entity_generates_again(build, generated, srcdir):
+    build()
+    generated.clear()
+    path = srcdir / "target" / "ClassExample.m"
+    path.write_text(path.read_text().replace("Example class", "Changed class", 1))
+    touch(path)
+    _, texts = build()
+    assert generated == ["ClassExample"]
+    assert "Changed class" in texts["index_target"]
+
+
+def test_changed_configuration_generates_again(build, generated):
+    build()
+    generated.clear()
+    build(matlab_show_property_default_value=True)
+    assert "ClassExample" in generated
+
+
+def test_same_directive_in_other_module(build, srcdir, generated):
+    (srcdir / "target" / "funcMeow.m").write_text(
+        "function y = funcMeow(x)\n% Meows in target\nend\n"
+    )
+    for docname, module in [("a", "target.submodule"), ("b", "target")]:
+        (srcdir / f"{docname}.rst").write_text(
+            f".. mat:module:: {module}\n\n.. mat:autofunction:: funcMeow\n"
+        )
+    _, texts = build()
+    assert generated.count("funcMeow") == 2
+    assert "target.submodule.funcMeow(input)" in texts["a"]
+    assert "target.funcMeow(x)" in texts["b"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
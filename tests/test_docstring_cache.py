@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+test_docstring_cache
+~~~~~~~~~~~~~~~~~~~~
+
+Test that auto-linked docstrings are kept in the environment and reused by
+later builds.
+
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+import pickle
+import time
+
+import pytest
+from helper import srcdir  # noqa: F401;
+from sphinx.testing.fixtures import make_app, test_params  # noqa: F811;
+
+from sphinxcontrib import mat_documenters as doc
+from sphinxcontrib import mat_types
+
+
+@pytest.fixture
+def linked(monkeypatch):
+    # Records the documenters that auto-linked.
+    linked = []
+    auto_link = doc.MatlabDocumenter.auto_link
+
+    def counting_auto_link(self, docstrings):
+        linked.append(self.fullname)
+        return auto_link(self, docstrings)
+
+    monkeypatch.setattr(doc.MatlabDocumenter, "auto_link", counting_auto_link)
+    return linked
+
+
+@pytest.fixture
+def build(make_app, srcdir):
+    # Reads all documents of *srcdir* and returns the app and their text.
+    def build(**confoverrides):
+        # Outdate all documents, but keep the environment.
+        future = time.time() + 10
+        for path in srcdir.glob("*.rst"):
+            os.utime(path, (future, future))
+        app = make_app(
+            srcdir=srcdir, confoverrides={"matlab_auto_link": "all", **confoverrides}
+        )
+        app.build()
+        texts = {
+            docname: pickle.loads(
+                (app.doctreedir / f"{docname}.doctree").read_bytes()
+            ).astext()
+            for docname in sorted(app.env.found_docs)
+        }
+        return app, texts
+
+    return build
+
+
+def test_later_builds_reuse_links(build, linked):
+    app, expected = build()
+    assert "target.ClassExample" in linked
+    dependencies = app.env.matlab_entity_dependencies
+    linked.clear()
+
+    app, texts = build()
+    assert texts == expected
+    assert linked == []
+    assert app.env.matlab_docstring_cache
+    # The entities linked to are recorded from the cache as well.
+    assert app.env.matlab_entity_dependencies == dependencies
+
+
+def test_new_entity_links_again(build, linked, srcdir):
+    build()
+    linked.clear()
+    (srcdir / "newFunction.m").write_text("function newFunction\n% New\nend\n")
+    build()
+    assert "target.ClassExample" in linked
+
+
+def test_size(build, linked):
+    app, _ = build(matlab_docstring_cache_size=2)
+    cache = app.env.matlab_docstring_cache
+    # The docstrings linked last are kept.
+    assert [key[1] for key in cache] == linked[-2:]
+
+
+def test_names_digest():
+    registry = mat_types.Registry()
+    with registry.activated():
+        empty = mat_types.names_digest()
+        assert mat_types.names_digest() is empty
+        mat_types.register_entity(
+            "f", mat_types.MatApplication("f", "", "An application")
+        )
+        assert mat_types.names_digest() != empty
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+test_entity_dependencies
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+Test that documents are read again when entities they refer to change.
+
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+import time
+
+import pytest
+from helper import srcdir  # noqa: F401;
+from sphinx.testing.fixtures import make_app, test_params  # noqa: F811;
+
+
+@pytest.fixture
+def build(make_app, srcdir):
+    # Builds *srcdir* and returns the app and the documents that were read.
+    def build():
+        app = make_app(srcdir=srcdir, confoverrides={"matlab_auto_link": "basic"})
+        read = []
+        app.connect("env-before-read-docs", lambda app, env, docs: read.extend(docs))
+        app.build()
+        return app, sorted(read)
+
+    return build
+
+
+def touch(path):
+    future = time.time() + 10
+    os.utime(path, (future, future))
+
+
+def test_entities_are_recorded(build):
+    app, read = build()
+    assert "index_submodule" in read
+    dependencies = app.env.matlab_entity_dependencies
+    # base class
+    assert "package.ClassBar" in dependencies["index_submodule"]
+    # "See also" targets, also those that do not exist
+    assert "BaseClass" in dependencies["index_target"]
+    assert dependencies["index_target"]["unknownEntity"] is None
+
+
+def test_changed_base_class(build, srcdir):
+    build()
+    path = srcdir / "target" / "+package" / "ClassBar.m"
+    path.write_text(path.read_text() + "\n")
+    touch(path)
+    _, read = build()
+    # The document of ClassBar by its own file, that of ClassMeow by the base
+    # class, and those of ClassExample and baseFunction by their "See also".
+    assert read == ["index_package", "index_root", "index_submodule", "index_target"]
+
+
+def test_changed_inherited_base_class(build, srcdir):
+    (srcdir / "target" / "submodule" / "ClassPurr.m").write_text(
+        "classdef ClassPurr < target.submodule.ClassMeow\n"
+        "    % Class which inherits from ClassMeow\n"
+        "end\n"
+    )
+    (srcdir / "index_inherited.rst").write_text(
+        """inherited
+---------
+
+.. autoclass:: target.submodule.ClassPurr
+    :members:
+    :inherited-members:
+"""
+    )
+    (srcdir / "index_method.rst").write_text(
+        """method
+------
+
+.. automethod:: target.submodule.ClassPurr.say
+"""
+    )
+    app, _ = build()
+    # The whole chain of base classes
+    assert set(app.env.matlab_entity_dependencies["index_inherited"]) == {
+        "target.submodule.ClassMeow",
+        "package.ClassBar",
+        "handle",
+    }
+    output = (app.outdir / "index_inherited.html").read_text()
+    assert "Say Meow" in output
+    assert "Doing foo" in output
+    # Only documented as a member of ClassPurr with :inherited-members:
+    output = (app.outdir / "index_method.html").read_text()
+    assert "Say Meow" not in output
+    path = srcdir / "target" / "+package" / "ClassBar.m"
+    path.write_text(path.read_text() + "\n")
+    touch(path)
+    _, read = build()
+    assert "index_inherited" in read
+
+
+def test_added_link_target(build, srcdir):
+    build()
+    (srcdir / "unknownEntity.m").write_text(
+        "function unknownEntity\n% Now known\nend\n"
+    )
+    _, read = build()
+    assert read == ["index_target"]
+
+
+def test_unchanged(build):
+    build()
+    _, read = build()
+    assert read == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
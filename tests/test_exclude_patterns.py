@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+test_exclude_patterns
+~~~~~~~~~~~~~~~~~~~~~
+
+Test that ``matlab_exclude_patterns`` prunes the MATLAB source tree.
+
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+
+import helper
+import pytest
+from sphinx.testing.fixtures import make_app, test_params  # noqa: F811;
+
+from sphinxcontrib import mat_types
+
+EXCLUDE = ["target/+package", "**/ClassExample.m"]
+
+
+@pytest.fixture
+def srcdir():
+    return helper.rootdir(__file__) / "roots" / "test_autodoc"
+
+
+@pytest.mark.parametrize("scoped", [False, True])
+def test_excluded_paths_are_not_parsed(make_app, srcdir, scoped):
+    app = make_app(
+        srcdir=srcdir,
+        confoverrides={
+            "matlab_exclude_patterns": EXCLUDE,
+            "matlab_scan_referenced_only": scoped,
+        },
+    )
+    with mat_types.registry_for(app).activated():
+        assert "target.submodule.ClassMeow" in mat_types.entities_table
+        assert "target.ClassExample" not in mat_types.entities_table
+        assert "target.+package" not in mat_types.entities_table
+        assert "target.+package.ClassBar" not in mat_types.entities_table
+        assert mat_types.excluded_paths == {
+            "target/+package",
+            "target/ClassExample.m",
+        }
+
+
+def test_snapshot_skips_excluded_paths(make_app, srcdir):
+    app = make_app(srcdir=srcdir, confoverrides={"matlab_exclude_patterns": EXCLUDE})
+    with mat_types.registry_for(app).activated():
+        snapshot = mat_types.tree_snapshots[mat_types.MatObject.basedir]
+    assert "target" in snapshot
+    assert not any(
+        path.startswith(os.path.join("target", "+package")) for path in snapshot
+    )
+    assert os.path.join("target", "ClassExample.m") not in snapshot
+    assert os.path.join("target", "submodule", "ClassMeow.m") in snapshot
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+test_header_only
+~~~~~~~~~~~~~~~~
+
+Test that files selected by ``matlab_header_only_size`` and
+``matlab_header_only_patterns`` are parsed up to the end of their docstring.
+
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from sphinxcontrib import mat_types
+
+DIRNAME = os.path.abspath(os.path.dirname(__file__))
+TESTDATA_ROOT = os.path.join(DIRNAME, "test_data")
+
+
+@pytest.fixture
+def configure(monkeypatch):
+    def configure(**config):
+        monkeypatch.setattr(
+            mat_types.MatObject,
+            "sphinx_env",
+            SimpleNamespace(config=SimpleNamespace(**config)),
+        )
+        monkeypatch.setattr(mat_types.MatObject, "basedir", TESTDATA_ROOT)
+
+    return configure
+
+
+def parse(mfile):
+    name = os.path.splitext(os.path.basename(mfile))[0]
+    return mat_types.MatObject.parse_mfile(
+        os.path.join(TESTDATA_ROOT, mfile), name, "test_data"
+    )
+
+
+def test_read_header(tmp_path):
+    mfile = tmp_path / "table.m"
+    rows = "\n".join(f"    {i} {i * 2}" for i in range(1000))
+    mfile.write_text(
+        f"""% Copyright notice
+
+function t = table(a, ...
+                   b)
+% TABLE A generated table
+%
+% Returns the table.
+
+t = [
+{rows}
+];
+end
+"""
+    )
+    assert mat_types.read_header(mfile) == (
+        b"""% Copyright notice
+
+function t = table(a, ...
+                   b)
+% TABLE A generated table
+%
+% Returns the table.
+
+end
+"""
+    )
+
+
+@pytest.mark.parametrize(
+    "mfile",
+    [
+        "ClassExample.m",
+        "ClassWithEnumMethod.m",
+        "f_example.m",
+        "script.m",
+        "script_with_comment_header_4.m",
+    ],
+)
+def test_header_matches_full_parse(configure, mfile):
+    configure(matlab_header_only_size=None, matlab_header_only_patterns=[])
+    full = parse(mfile)
+    configure(matlab_header_only_size=0, matlab_header_only_patterns=[])
+    header = parse(mfile)
+    assert not full.partial
+    assert header.partial
+    assert type(header) is type(full)
+    assert header.docstring == full.docstring
+    if isinstance(full, mat_types.MatClass):
+        assert header.bases == full.bases
+        assert header.attrs == full.attrs
+        assert header.methods == {}
+    elif isinstance(full, mat_types.MatFunction):
+        assert header.retv == full.retv
+        assert list(header.args) == list(full.args)
+
+
+def test_header_only_patterns(configure):
+    configure(
+        matlab_header_only_size=None,
+        matlab_header_only_patterns=["+package/*", "ClassEx*.m"],
+    )
+    assert parse("ClassExample.m").partial
+    assert parse(os.path.join("+package", "package_func.m")).partial
+    assert not parse("f_example.m").partial
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
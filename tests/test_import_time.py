@@ -0,0 +1,68 @@
+"""
+test_import_time
+~~~~~~~~~~~~~~~~
+
+Test that importing the extension is cheap. Every sphinx-build, test process
+and sphinx-matlab-apidoc run pays for it.
+
+:license: BSD, see LICENSE for details.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Generous, the import of Sphinx itself is included.
+IMPORT_BUDGET = 5.0  # seconds
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import sphinxcontrib.matlab
+elapsed = time.perf_counter() - start
+from sphinxcontrib import mat_tree_sitter_parser as parser
+compiled = [
+    name
+    for name, value in vars(parser).items()
+    if isinstance(value, parser.LazyQuery) and value._query is not None
+]
+print(json.dumps({
+    "elapsed": elapsed,
+    "pkg_resources": "pkg_resources" in sys.modules,
+    "compiled": compiled,
+}))
+"""
+
+
+@pytest.fixture(scope="module")
+def result():
+    # Use a fresh interpreter, the test process has imported everything already.
+    rootdir = Path(__file__).parents[1]
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(rootdir), *filter(None, [env.get("PYTHONPATH")])]
+    )
+    output = subprocess.check_output(
+        [sys.executable, "-c", SCRIPT], cwd=rootdir, env=env, text=True
+    )
+    return json.loads(output.splitlines()[-1])
+
+
+def test_no_pkg_resources(result):
+    assert not result["pkg_resources"]
+
+
+def test_queries_compiled_on_first_use(result):
+    assert result["compiled"] == []
+
+
+def test_import_budget(result):
+    assert result["elapsed"] < IMPORT_BUDGET
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+test_incremental_analyze
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+Test that analyzing the same MATLAB source tree again only re-parses changes.
+
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+import shutil
+import time
+
+import helper
+import pytest
+from helper import parsed, srcdir  # noqa: F401;
+from sphinx.testing.fixtures import make_app, test_params  # noqa: F811;
+
+from sphinxcontrib import mat_types
+
+DIRNAME = os.path.abspath(os.path.dirname(__file__))
+TESTDATA_ROOT = os.path.join(DIRNAME, "test_data")
+
+
+@pytest.fixture
+def app(make_app, srcdir):
+    app = make_app(srcdir=srcdir)
+    with mat_types.registry_for(app).activated():
+        yield app
+
+
+def touch(path):
+    future = time.time() + 10
+    os.utime(path, (future, future))
+
+
+def test_unchanged_tree_is_not_parsed_again(app, parsed):
+    before = dict(mat_types.entities_table)
+    mat_types.analyze(app)
+    assert parsed == []
+    assert mat_types.entities_table.keys() == before.keys()
+    assert all(mat_types.entities_table[k] is v for k, v in before.items())
+
+
+def test_changed_file_is_parsed_again(app, srcdir, parsed):
+    old_cls = mat_types.entities_table["target.ClassExample"]
+    old_func = mat_types.entities_table["target.submodule.funcMeow"]
+    keys = set(mat_types.entities_table)
+
+    path = srcdir / "target" / "ClassExample.m"
+    path.write_text(
+        path.read_text(encoding="utf-8").replace("% Example class", "% Changed"),
+        encoding="utf-8",
+    )
+    touch(path)
+    mat_types.analyze(app)
+
+    assert parsed == ["ClassExample"]
+    cls = mat_types.entities_table["target.ClassExample"]
+    assert cls is not old_cls
+    assert cls.docstring.startswith("Changed")
+    assert mat_types.entities_table["ClassExample"] is cls
+    assert mat_types.entities_table["target.submodule.funcMeow"] is old_func
+    assert set(mat_types.entities_table) == keys
+
+
+def test_removed_file(app, srcdir, parsed):
+    (srcdir / "target" / "submodule" / "funcMeow.m").unlink()
+    mat_types.analyze(app)
+
+    assert parsed == []
+    assert "target.submodule.funcMeow" not in mat_types.entities_table
+    assert "funcMeow" not in mat_types.entities_table
+    assert "target.ClassExample" in mat_types.entities_table
+
+
+def test_other_tree_is_analyzed_from_scratch(app, make_app, parsed):
+    other = make_app(srcdir=helper.rootdir(__file__) / "roots" / "test_autodoc")
+    assert other.srcdir != app.srcdir
+    assert "ClassExample" in parsed
+    assert list(mat_types.tree_snapshots) == [mat_types.MatObject.basedir]
+
+
+def table(registry):
+    # The entities by name, by their file and name, as entities of different
+    # analyses are different objects.
+    def describe(entity):
+        if isinstance(entity, dict):
+            return {role: describe(e) for role, e in entity.items()}
+        return type(entity).__name__, getattr(entity, "name", None)
+
+    return {name: describe(e) for name, e in registry.entities_table.items()}
+
+
+def test_removal_frees_short_name(tmp_path):
+    srcdir = tmp_path / "test_data"
+    shutil.copytree(TESTDATA_ROOT, srcdir)
+    (srcdir / "extra").mkdir()
+    shutil.copy(srcdir / "f_example.m", srcdir / "extra" / "f_example.m")
+    analyzer = mat_types.Analyzer(str(srcdir))
+    registry = analyzer.analyze()
+    assert table(registry) == table(mat_types.Analyzer(str(srcdir)).analyze())
+
+    # The short name of extra.f_example was taken by the root f_example.
+    (srcdir / "f_example.m").unlink()
+    analyzer.analyze()
+    expected = table(mat_types.Analyzer(str(srcdir)).analyze())
+    assert expected["f_example"] == ("MatFunction", "f_example")
+    assert table(registry) == expected
+
+    # And stays the same on later refreshes.
+    touch(srcdir / "f_with_comment_header.m")
+    analyzer.analyze()
+    assert table(registry) == expected
+
+    # Taken again by a new root f_example.
+    shutil.copy(srcdir / "extra" / "f_example.m", srcdir / "f_example.m")
+    analyzer.analyze()
+    assert table(registry) == table(mat_types.Analyzer(str(srcdir)).analyze())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
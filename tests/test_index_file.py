@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+test_index_file
+~~~~~~~~~~~~~~~
+
+Test that ``matlab_index_file`` exports the entities to SQLite and that they
+are loaded from there instead of parsing unchanged files.
+
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+import pickle
+import shutil
+import time
+
+import helper
+import pytest
+from helper import parsed  # noqa: F401;
+from sphinx.testing.fixtures import make_app, test_params  # noqa: F811;
+
+from sphinxcontrib import mat_index, mat_types
+
+DIRNAME = os.path.abspath(os.path.dirname(__file__))
+TESTDATA_ROOT = os.path.join(DIRNAME, "test_data")
+
+
+def fields(entity):
+    # The fields of *entity* that describe it, methods by their fields.
+    result = {
+        key: value
+        for key, value in vars(entity).items()
+        if key not in ("registry", "cls", "tokens", "_fullnames")
+    }
+    if isinstance(entity, mat_types.MatClass):
+        result["methods"] = {
+            name: fields(meth) for name, meth in entity.methods.items()
+        }
+        result.pop("_method_call_pattern")
+    return result
+
+
+def test_export_and_load(tmp_path):
+    filename = str(tmp_path / "index.db")
+    options = {"matlab_index_file": filename}
+    registry = mat_types.Analyzer(TESTDATA_ROOT, options).analyze()
+    assert os.path.isfile(filename)
+
+    index = mat_index.MatIndex(filename)
+    try:
+        assert "ClassExample" in index.names("class")
+        assert "f_example" in index.names("function")
+        assert "+package" in index.names("module")
+        assert index.lookup("package.package_func") == ["+package.package_func"]
+        # Methods of class folders are functions of their own.
+        assert index.connection.execute(
+            "SELECT kind FROM entities WHERE name = ?",
+            ("@ClassFolder.classMethod",),
+        ).fetchone() == ("function",)
+        (count,) = index.connection.execute(
+            "SELECT COUNT(*) FROM members WHERE entity = ? AND kind = 'property'",
+            ("ClassWithPropertyValidators",),
+        ).fetchone()
+        assert count == 4
+
+        for name in registry.name_index.names:
+            entity = registry.entities_table[name]
+            if mat_index.entity_kind(entity) in (None, "module"):
+                continue
+            if "@" in name:
+                # Class folders are transformed after loading.
+                continue
+            assert fields(index.entity(name)) == fields(entity), name
+    finally:
+        index.close()
+
+
+def test_unchanged_files_are_not_parsed(tmp_path, parsed):
+    srcdir = tmp_path / "src"
+    shutil.copytree(TESTDATA_ROOT, srcdir)
+    options = {"matlab_index_file": str(tmp_path / "index.db")}
+    first = mat_types.Analyzer(str(srcdir), options).analyze()
+    assert "ClassExample" in parsed
+    parsed.clear()
+
+    path = srcdir / "ClassExample.m"
+    future = time.time() + 10
+    os.utime(path, (future, future))
+    second = mat_types.Analyzer(str(srcdir), options).analyze()
+    assert parsed == ["ClassExample"]
+    assert set(second.entities_table) == set(first.entities_table)
+    for name in ("ClassWithPropertyValidators", "f_example", "ClassFolder"):
+        assert fields(second.entities_table[name]) == fields(first.entities_table[name])
+    assert second.index is not None
+
+
+def test_unchanged_index_is_not_written(tmp_path, monkeypatch):
+    srcdir = tmp_path / "src"
+    shutil.copytree(TESTDATA_ROOT, srcdir)
+    options = {"matlab_index_file": str(tmp_path / "index.db")}
+    exported = []
+    export_index = mat_index.export_index
+
+    def counting_export_index(filename, registry=None):
+        exported.append(filename)
+        return export_index(filename, registry)
+
+    monkeypatch.setattr(mat_index, "export_index", counting_export_index)
+    mat_types.Analyzer(str(srcdir), options).analyze()
+    assert len(exported) == 1
+
+    # All entities are taken from the index.
+    mat_types.Analyzer(str(srcdir), options).analyze()
+    assert len(exported) == 1
+
+    # Nothing parsed, but an entity less.
+    (srcdir / "f_example.m").unlink()
+    registry = mat_types.Analyzer(str(srcdir), options).analyze()
+    assert len(exported) == 2
+    assert "f_example" not in registry.index.names()
+
+    # A changed file is parsed.
+    future = time.time() + 10
+    os.utime(srcdir / "ClassExample.m", (future, future))
+    mat_types.Analyzer(str(srcdir), options).analyze()
+    assert len(exported) == 3
+
+
+def test_build_from_index(make_app, tmp_path, parsed):
+    srcdir = helper.rootdir(__file__) / "roots" / "test_autodoc"
+    confoverrides = {"matlab_index_file": str(tmp_path / "index.db")}
+
+    def build():
+        app = make_app(srcdir=srcdir, confoverrides=confoverrides)
+        app.builder.build_all()
+        content = pickle.loads((app.doctreedir / "index_target.doctree").read_bytes())
+        return content.astext()
+
+    expected = build()
+    parsed.clear()
+    assert build() == expected
+    assert parsed == []
+
+
+def test_other_parser_engine(tmp_path):
+    filename = str(tmp_path / "index.db")
+    mat_types.Analyzer(TESTDATA_ROOT, {"matlab_index_file": filename}).analyze()
+    analyzer = mat_types.Analyzer(
+        TESTDATA_ROOT, {"matlab_index_file": filename, "matlab_parser_engine": "cursor"}
+    )
+    with analyzer.activated():
+        assert mat_types.open_index(filename) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
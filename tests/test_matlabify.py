@@ -5,7 +5,7 @@ import pytest
 from sphinx.testing.fixtures import make_app, test_params
 
 from sphinxcontrib import mat_documenters as doc
-from sphinxcontrib.mat_types import MatModule, MatObject, entities_table
+from sphinxcontrib.mat_types import MatModule, MatObject, entities_table, registry_for
 
 rootdir = helper.rootdir(__file__)
 matlab_src_dir = str(rootdir / "test_data")
@@ -17,8 +17,9 @@ def app(make_app):
     # Create app to setup build environment
     srcdir = rootdir / "test_docs"
     app = make_app(srcdir=srcdir)
-    MatObject.basedir = app.config.matlab_src_dir
-    return app
+    with registry_for(app).activated():
+        MatObject.basedir = app.config.matlab_src_dir
+        yield app
 
 
 @pytest.fixture
@@ -30,7 +31,7 @@ def mod(app):
 #     assert MatObject.matlabify("") is None
 
 
-def test_unknown():
+def test_unknown(app):
     assert MatObject.matlabify("not_test_data") is None
 
 
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+test_memory_profile
+~~~~~~~~~~~~~~~~~~~
+
+Test that ``matlab_memory_profile`` records the memory at each stage of the
+build and reports it at the end.
+
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+import tracemalloc
+
+import helper
+import pytest
+from sphinx.testing.fixtures import make_app, test_params  # noqa: F811;
+
+from sphinxcontrib import mat_profile, mat_types
+
+DIRNAME = os.path.abspath(os.path.dirname(__file__))
+TESTDATA_ROOT = os.path.join(DIRNAME, "test_data")
+
+
+def test_build_reports_stages(make_app, monkeypatch):
+    marked = []
+    mark = mat_profile.MemoryProfile.mark
+
+    def recording_mark(self, name):
+        marked.append(name)
+        return mark(self, name)
+
+    monkeypatch.setattr(mat_profile.MemoryProfile, "mark", recording_mark)
+    srcdir = helper.rootdir(__file__) / "roots" / "test_autodoc"
+    app = make_app(
+        srcdir=srcdir,
+        freshenv=True,
+        confoverrides={"matlab_memory_profile": True},
+    )
+    app.build()
+    assert marked[:4] == ["walk", "parse", "populate_entities_table", "aliases"]
+    assert "read index_target" in marked
+    status = app._status.getvalue()
+    assert "Memory by stage (MiB):" in status
+    assert "Top allocation sites:" in status
+    assert "docstrings" in status
+    # Tracing ends with the build.
+    assert mat_types.registry_for(app).memory_profile is None
+    assert not tracemalloc.is_tracing()
+
+
+def test_entity_memory():
+    registry = mat_types.Analyzer(TESTDATA_ROOT).analyze()
+    totals = mat_profile.entity_memory(registry)
+    assert set(totals) == {"docstrings", "properties", "methods", "other"}
+    assert all(size > 0 for size in totals.values())
+
+
+def test_profile_records_growth():
+    profile = mat_profile.MemoryProfile()
+    try:
+        data = [bytes(1000) for _ in range(1000)]
+        profile.mark("allocate")
+    finally:
+        profile.stop()
+    (stage,) = profile.stages
+    assert stage.traced >= 1000 * 1000
+    site, size, _ = stage.growth[0]
+    assert site.startswith(__file__)
+    assert size >= 1000 * 1000
+    del data
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
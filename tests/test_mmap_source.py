@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+test_mmap_source
+~~~~~~~~~~~~~~~~
+
+Test that memory-mapped MATLAB files are parsed like files read into memory.
+
+:license: BSD, see LICENSE for details.
+"""
+
+import mmap
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from sphinxcontrib import mat_types
+
+DIRNAME = os.path.abspath(os.path.dirname(__file__))
+TESTDATA_ROOT = os.path.join(DIRNAME, "test_data")
+
+
+def set_threshold(monkeypatch, threshold):
+    config = SimpleNamespace(matlab_mmap_threshold=threshold)
+    monkeypatch.setattr(
+        mat_types.MatObject, "sphinx_env", SimpleNamespace(config=config)
+    )
+
+
+def parse(mfile):
+    name = os.path.splitext(mfile)[0]
+    return mat_types.MatObject.parse_mfile(
+        os.path.join(TESTDATA_ROOT, mfile), name, "test_data"
+    )
+
+
+def test_read_source(monkeypatch, tmp_path):
+    mfile = tmp_path / "f.m"
+    mfile.write_bytes(b"function f\n% doc\nend\n")
+    set_threshold(monkeypatch, 10)
+    with mat_types.read_source(mfile) as code:
+        assert isinstance(code, mmap.mmap)
+        assert code[:10] == b"function f"
+    assert code.closed
+
+    set_threshold(monkeypatch, 1024)
+    with mat_types.read_source(mfile) as code:
+        assert code == b"function f\n% doc\nend\n"
+
+    # Empty files cannot be mapped.
+    empty = tmp_path / "empty.m"
+    empty.write_bytes(b"")
+    set_threshold(monkeypatch, 0)
+    with mat_types.read_source(empty) as code:
+        assert code == b""
+
+
+@pytest.mark.parametrize(
+    "mfile",
+    ["ClassExample.m", "f_example.m", "script.m", "ClassWithEnumMethod.m"],
+)
+def test_mapped_file_is_parsed_like_read_file(monkeypatch, mfile):
+    set_threshold(monkeypatch, None)
+    read = parse(mfile)
+    set_threshold(monkeypatch, 0)
+    mapped = parse(mfile)
+    assert type(mapped) is type(read)
+    assert mapped.docstring == read.docstring
+    if isinstance(read, mat_types.MatClass):
+        assert mapped.properties == read.properties
+        assert mapped.methods.keys() == read.methods.keys()
+    elif isinstance(read, mat_types.MatFunction):
+        assert (mapped.retv, mapped.args) == (read.retv, read.args)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
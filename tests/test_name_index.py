@@ -0,0 +1,61 @@
+import helper
+import pytest
+from sphinx.testing.fixtures import make_app, test_params  # noqa: F811;
+
+from sphinxcontrib import mat_types
+from sphinxcontrib.mat_types import EntityNames, NameIndex
+
+
+def test_compute():
+    names = NameIndex.compute("target.+package.@ClassBar.ClassBar")
+    assert names == EntityNames(
+        "target.+package.@ClassBar.ClassBar",
+        "target.+package.@ClassBar.ClassBar",
+        "target.+package.ClassBar",
+        "target.package.@ClassBar.ClassBar",
+    )
+
+
+def test_add_and_discard():
+    index = NameIndex()
+    index.add("target.+package.ClassBar", None)
+    index.add("target.@ClassFolder", mat_types.MatModule("@ClassFolder", "", ""))
+    assert index.names["target.+package.ClassBar"].short == "package.ClassBar"
+    assert index.class_folders == ["target.@ClassFolder"]
+
+    index.discard("target.@ClassFolder")
+    assert "target.@ClassFolder" not in index.names
+    assert index.class_folders == []
+    # Names that are not indexed are computed.
+    assert index.get("target.@ClassFolder").stripped == "target.@ClassFolder"
+
+
+@pytest.fixture
+def app(make_app):
+    srcdir = helper.rootdir(__file__) / "roots" / "test_autodoc"
+    app = make_app(srcdir=srcdir)
+    with mat_types.registry_for(app).activated():
+        yield app
+
+
+def test_index_matches_entities_table(app):
+    index = mat_types.name_index
+    canonical = [k for k, v in mat_types.entities_table.items() if k in index.names]
+    assert "target.ClassExample" in canonical
+    assert "target.@ClassFolder" in index.class_folders
+    for name in canonical:
+        names = index.names[name]
+        assert names == NameIndex.compute(name)
+        assert mat_types.entities_name_map[names.stripped] == name
+    cls = mat_types.entities_table["target.@ClassFolder.ClassFolder"]
+    assert mat_types.entities_table["target.ClassFolder"] is cls
+
+
+def test_class_fullname_is_cached(app):
+    cls = mat_types.entities_table["target.+package.ClassBar"]
+    assert cls.fullname(app.env) == "target.package.ClassBar"
+    assert cls.fullname(app.env) is cls.fullname(app.env)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+test_parse_cache
+~~~~~~~~~~~~~~~~
+
+Test that ``matlab_cache_dir`` keeps parsed files by their content, such that
+other trees with the same files do not parse them again.
+
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+import shutil
+
+import pytest
+from helper import parsed  # noqa: F401;
+
+from sphinxcontrib import mat_cache, mat_types
+
+DIRNAME = os.path.abspath(os.path.dirname(__file__))
+TESTDATA_ROOT = os.path.join(DIRNAME, "test_data")
+
+
+def fields(entity):
+    # The fields of *entity* that describe it, methods by their fields.
+    result = {
+        key: value
+        for key, value in vars(entity).items()
+        if key not in ("registry", "cls", "tokens", "file", "_fullnames")
+    }
+    if isinstance(entity, mat_types.MatClass):
+        result["methods"] = {
+            name: fields(meth) for name, meth in entity.methods.items()
+        }
+        result.pop("_method_call_pattern")
+    return result
+
+
+@pytest.mark.parametrize("parsed", ["_parse_within_budget"], indirect=True)
+def test_shared_between_trees(tmp_path, parsed):
+    options = {"matlab_cache_dir": str(tmp_path / "cache")}
+    first = mat_types.Analyzer(TESTDATA_ROOT, options).analyze()
+    assert "ClassExample" in parsed
+    parsed.clear()
+
+    # The same files elsewhere, one of them changed.
+    srcdir = tmp_path / "src"
+    shutil.copytree(TESTDATA_ROOT, srcdir)
+    path = srcdir / "f_example.m"
+    path.write_text(path.read_text() + "\n% changed\n")
+    second = mat_types.Analyzer(str(srcdir), options).analyze()
+    assert parsed == ["f_example"]
+    assert second.parse_cache.hits > 0
+    for name in (
+        "ClassExample",
+        "ClassWithPropertyValidators",
+        "+package.package_func",
+    ):
+        entity = second.entities_table[name]
+        assert fields(entity) == fields(first.entities_table[name])
+        assert entity.file.startswith(str(srcdir))
+
+
+@pytest.mark.parametrize("parsed", ["_parse_within_budget"], indirect=True)
+def test_parser_engine_is_part_of_key(tmp_path, parsed):
+    options = {"matlab_cache_dir": str(tmp_path / "cache")}
+    mat_types.Analyzer(TESTDATA_ROOT, options).analyze()
+    parsed.clear()
+    options["matlab_parser_engine"] = "cursor"
+    mat_types.Analyzer(TESTDATA_ROOT, options).analyze()
+    assert "ClassExample" in parsed
+
+
+def test_prune_least_recently_used(tmp_path):
+    cache = mat_cache.ParseCache(str(tmp_path / "cache"), max_size=None)
+    with mat_types.Analyzer(TESTDATA_ROOT).activated():
+        for number, name in enumerate(("f_example", "f_with_nested_function")):
+            mfile = os.path.join(TESTDATA_ROOT, name + ".m")
+            entity = mat_types.MatObject.parse_mfile(mfile, name, "")
+            key = cache.key(mfile, name, "utf-8", False, "query")
+            cache.put(key, entity)
+            os.utime(cache.path(key), (number, number))
+        assert cache.get(key, "") is not None
+    entries = sorted(cache.entries())
+    assert len(entries) == 2
+    # Only the entry used last is kept.
+    (kept,) = [size for path, size, _ in entries if path == cache.path(key)]
+    assert cache.prune(int(kept / mat_cache.PRUNE_RATIO) + 1) == 1
+    assert [path for path, _, _ in cache.entries()] == [cache.path(key)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+test_parse_timeout
+~~~~~~~~~~~~~~~~~~
+
+Test that files exceeding ``matlab_parse_timeout`` fall back to their header.
+
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+import time
+from types import SimpleNamespace
+
+import helper
+import pytest
+from sphinx.testing.fixtures import make_app, test_params  # noqa: F811;
+
+from sphinxcontrib import mat_types
+from sphinxcontrib.mat_tree_sitter_parser import (
+    LazyQuery,
+    ParseTimeout,
+    time_budget,
+)
+
+DIRNAME = os.path.abspath(os.path.dirname(__file__))
+TESTDATA_ROOT = os.path.join(DIRNAME, "test_data")
+
+
+@pytest.fixture(autouse=True)
+def slow_files():
+    mat_types.slow_files.clear()
+    yield mat_types.slow_files
+    mat_types.slow_files.clear()
+
+
+def test_time_budget():
+    query = LazyQuery("(comment) @comment")
+    root = mat_types.thread_parser().parse(b"% a comment\n").root_node
+    with time_budget(60):
+        assert len(query.matches(root)) == 1
+    with time_budget(1e-9):
+        time.sleep(0.001)
+        with pytest.raises(ParseTimeout):
+            query.matches(root)
+    # No budget outside of the block.
+    assert len(query.matches(root)) == 1
+
+
+def test_timeout_falls_back_to_header(monkeypatch, slow_files):
+    config = SimpleNamespace(matlab_parse_timeout=1e-9)
+    monkeypatch.setattr(
+        mat_types.MatObject, "sphinx_env", SimpleNamespace(config=config)
+    )
+    mfile = os.path.join(TESTDATA_ROOT, "ClassExample.m")
+    entity = mat_types.MatObject.parse_mfile(mfile, "ClassExample", "test_data")
+    assert entity.partial
+    assert entity.docstring.startswith("test class methods")
+    assert entity.methods == {}
+    assert mfile in slow_files
+
+    # Known to be slow, the full parse is not tried again.
+    def fail(*args):
+        raise AssertionError("parsed again")
+
+    monkeypatch.setattr(mat_types.MatObject, "_parse_within_budget", fail)
+    assert mat_types.MatObject.parse_mfile(mfile, "ClassExample", "test_data").partial
+
+
+def test_changed_file_is_parsed_again(monkeypatch, slow_files, tmp_path):
+    mfile = tmp_path / "f.m"
+    mfile.write_text("function f\n% F a function\nend\n")
+    mat_types.remember_slow_file(str(mfile))
+    assert mat_types.is_slow_file(str(mfile))
+    mfile.write_text("function f(a)\n% F a function\nend\n")
+    assert not mat_types.is_slow_file(str(mfile))
+
+
+def test_timeout_is_reported(make_app, slow_files):
+    srcdir = helper.rootdir(__file__) / "roots" / "test_autodoc"
+    app = make_app(srcdir=srcdir, confoverrides={"matlab_parse_timeout": 1e-9})
+    registry = mat_types.registry_for(app)
+    cls = registry.entities_table["target.ClassExample"]
+    assert cls.partial
+    warnings = app.warning.getvalue()
+    assert "ClassExample.m was stopped after" in warnings
+    assert app.env.matlab_slow_files is registry.slow_files
+    assert cls.file in registry.slow_files
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
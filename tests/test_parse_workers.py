@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+test_parse_workers
+~~~~~~~~~~~~~~~~~~
+
+Test that parsing with ``matlab_parse_workers`` threads gives the same
+entities as parsing serially.
+
+:license: BSD, see LICENSE for details.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import helper
+import pytest
+from helper import parsed  # noqa: F401;
+from sphinx.testing.fixtures import make_app, test_params  # noqa: F811;
+
+from sphinxcontrib import mat_types
+from sphinxcontrib.mat_tree_sitter_parser import LazyQuery
+
+
+def analyze(make_app, workers):
+    mat_types.entities_table.clear()
+    srcdir = helper.rootdir(__file__) / "roots" / "test_autodoc"
+    try:
+        make_app(srcdir=srcdir, confoverrides={"matlab_parse_workers": workers})
+        return {
+            name: (type(entity), getattr(entity, "docstring", None))
+            for name, entity in mat_types.entities_table.items()
+            if not isinstance(entity, dict)
+        }
+    finally:
+        mat_types.entities_table.clear()
+
+
+def test_threads_give_same_entities(make_app, parsed):
+    serial = analyze(make_app, 0)
+    serial_parsed = sorted(parsed)
+    assert all(thread is threading.main_thread() for thread in parsed.threads)
+    parsed.clear()
+
+    threaded = analyze(make_app, 4)
+    assert threaded == serial
+    # Each file is parsed once, by the threads.
+    assert sorted(parsed) == serial_parsed
+    assert all(thread is not threading.main_thread() for thread in parsed.threads)
+    assert mat_types.prefetched == {}
+
+
+def test_thread_parser():
+    parser = mat_types.thread_parser()
+    assert mat_types.thread_parser() is parser
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(mat_types.thread_parser).result() is not parser
+
+
+def test_lazy_query_is_compiled_once(monkeypatch):
+    query = LazyQuery("(comment) @comment")
+    compiled = []
+    compile_query = type(mat_types.ML_LANG).query
+
+    def counting_query(lang, source):
+        compiled.append(source)
+        return compile_query(lang, source)
+
+    monkeypatch.setattr(type(mat_types.ML_LANG), "query", counting_query)
+    root = mat_types.thread_parser().parse(b"% a comment\n").root_node
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: query.matches(root), range(32)))
+    assert len(compiled) == 1
+    assert all(len(matches) == 1 for matches in results)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
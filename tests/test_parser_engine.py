@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+test_parser_engine
+~~~~~~~~~~~~~~~~~~
+
+Test that the cursor engine extracts the same definitions as the query engine.
+
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+from types import SimpleNamespace
+
+import helper
+import pytest
+from sphinx.testing.fixtures import make_app, test_params  # noqa: F811;
+from tree_sitter import Parser
+
+from sphinxcontrib import mat_types
+from sphinxcontrib.mat_tree_sitter_parser import (
+    ML_LANG,
+    MatClassCursorParser,
+    MatClassParser,
+    tree_sitter_is_0_21,
+)
+
+DIRNAME = os.path.abspath(os.path.dirname(__file__))
+TESTDATA_ROOT = os.path.join(DIRNAME, "test_data")
+
+# The query engine misses arguments blocks that follow the docstring.
+KNOWN_DIFFERENCES = ["ClassWithFunctionArguments.m"]
+
+
+def mfiles():
+    for dirpath, _, filenames in os.walk(TESTDATA_ROOT):
+        for filename in sorted(filenames):
+            if filename.endswith(".m") and filename not in KNOWN_DIFFERENCES:
+                yield os.path.relpath(os.path.join(dirpath, filename), TESTDATA_ROOT)
+
+
+def parse(mfile, engine, monkeypatch):
+    config = SimpleNamespace(matlab_parser_engine=engine)
+    monkeypatch.setattr(
+        mat_types.MatObject, "sphinx_env", SimpleNamespace(config=config)
+    )
+    name = os.path.splitext(os.path.basename(mfile))[0]
+    return mat_types.MatObject.parse_mfile(
+        os.path.join(TESTDATA_ROOT, mfile), name, "test_data"
+    )
+
+
+def definition(entity):
+    if isinstance(entity, mat_types.MatClass):
+        return {
+            "attrs": entity.attrs,
+            "bases": entity.bases,
+            "docstring": entity.docstring,
+            "properties": entity.properties,
+            "enumerations": entity.enumerations,
+            "methods": {
+                name: (meth.retv, meth.args, meth.docstring, meth.attrs)
+                for name, meth in entity.methods.items()
+            },
+        }
+    if isinstance(entity, mat_types.MatFunction):
+        return (entity.retv, entity.args, entity.docstring)
+    return entity.docstring
+
+
+@pytest.mark.parametrize("mfile", list(mfiles()))
+def test_engines_are_equivalent(mfile, monkeypatch):
+    query = definition(parse(mfile, "query", monkeypatch))
+    cursor = definition(parse(mfile, "cursor", monkeypatch))
+    assert cursor == query
+
+
+def test_arguments_block_after_docstring(monkeypatch):
+    mfile = "ClassWithFunctionArguments.m"
+    query = parse(mfile, "query", monkeypatch).methods["mymethod"]
+    cursor = parse(mfile, "cursor", monkeypatch).methods["mymethod"]
+    assert query.docstring == cursor.docstring
+    assert query.args == {"obj": {}, "b": {}}
+    assert list(cursor.args) == ["obj", "b"]
+    assert cursor.args["b"]["default"] == "1"
+
+
+def parse_class(parser, code):
+    if tree_sitter_is_0_21():
+        ts_parser = Parser()
+        ts_parser.set_language(ML_LANG)
+    else:
+        ts_parser = Parser(ML_LANG)
+    return parser(ts_parser.parse(code).root_node, "utf-8")
+
+
+def test_events_after_comment():
+    code = b"""classdef Events < handle
+    events
+        First % the first
+        % the second
+        Second
+    end
+end
+"""
+    assert list(parse_class(MatClassParser, code).events) == ["First"]
+    events = parse_class(MatClassCursorParser, code).events
+    assert events["First"]["docstring"] == "the first"
+    assert events["Second"]["docstring"] == "the second"
+
+
+def test_config_selects_engine(make_app, monkeypatch):
+    parsed = []
+    init = MatClassCursorParser.__init__
+
+    def recording_init(self, root_node, encoding):
+        init(self, root_node, encoding)
+        parsed.append(self.name.text.decode())
+
+    monkeypatch.setattr(MatClassCursorParser, "__init__", recording_init)
+    mat_types.entities_table.clear()
+    srcdir = helper.rootdir(__file__) / "roots" / "test_autodoc"
+    try:
+        make_app(srcdir=srcdir, confoverrides={"matlab_parser_engine": "cursor"})
+    finally:
+        # Do not hand entities parsed by the cursor engine to other tests.
+        mat_types.entities_table.clear()
+    assert "ClassExample" in parsed
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
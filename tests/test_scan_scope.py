@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+test_scan_scope
+~~~~~~~~~~~~~~~
+
+Test that with ``matlab_scan_referenced_only`` only the MATLAB sources the
+documents refer to are parsed.
+
+:license: BSD, see LICENSE for details.
+"""
+
+import helper
+import pytest
+from helper import parsed  # noqa: F401;
+from sphinx.testing.fixtures import make_app, test_params  # noqa: F811;
+
+from sphinxcontrib import mat_types
+from sphinxcontrib.mat_scan import referenced_entities
+
+
+def test_referenced_entities():
+    text = """
+.. mat:automodule:: target.+package
+
+.. mat:autofunction:: funcFoo(a, b)
+
+.. mat:currentmodule:: .
+
+.. mat:autoclass:: BaseClass
+
+See :mat:class:`the class <target.ClassExample>` and :mat:meth:`~Base.method`.
+"""
+    assert referenced_entities(text) == [
+        (["target.+package"], True),
+        (["target.+package.funcFoo", "funcFoo"], False),
+        (["BaseClass"], False),
+        (["target.ClassExample"], False),
+        (["Base.method"], False),
+    ]
+
+
+def test_referenced_entities_default_domain():
+    text = """
+.. autoclass:: py.Class
+
+.. default-domain:: mat
+
+.. autoclass:: mat.Class
+
+:class:`mat.Other` and :py:class:`py.Other`
+"""
+    assert referenced_entities(text) == [
+        (["mat.Class"], False),
+        (["mat.Other"], False),
+    ]
+    assert referenced_entities(".. autoclass:: a.B", "mat") == [(["a.B"], False)]
+
+
+@pytest.fixture
+def srcdir(tmp_path):
+    srcdir = helper.copy_root(tmp_path)
+    for doc in srcdir.glob("index_*.rst"):
+        doc.unlink()
+    (srcdir / "index.rst").write_text(
+        """Scoped
+======
+
+.. mat:autoclass:: target.submodule.ClassMeow
+
+.. include:: snippet.txt
+""",
+        encoding="utf-8",
+    )
+    # Not a source document, found when Sphinx reads index.rst.
+    (srcdir / "snippet.txt").write_text(
+        ".. mat:autofunction:: target.submodule.funcMeow\n", encoding="utf-8"
+    )
+    return srcdir
+
+
+@pytest.fixture
+def app(make_app, srcdir):
+    app = make_app(srcdir=srcdir, confoverrides={"matlab_scan_referenced_only": True})
+    with mat_types.registry_for(app).activated():
+        yield app
+
+
+def test_only_referenced_entities_are_parsed(parsed, app):
+    # ClassMeow derives from package.ClassBar, found on the path like MATLAB does.
+    assert parsed == ["ClassMeow", "ClassBar"]
+    assert "target.submodule.ClassMeow" in mat_types.entities_table
+    assert "package.ClassBar" in mat_types.entities_table
+    assert "target.ClassExample" not in mat_types.entities_table
+    assert "BaseClass" not in mat_types.entities_table
+    # Only the entities on the way are in the modules.
+    target = mat_types.entities_table["target"]
+    assert [name for name, _ in target.entities] == ["submodule", "+package"]
+    assert not target.listed
+
+
+def test_missed_references_are_loaded_on_demand(parsed, app):
+    app.builder.build_all()
+    assert parsed == ["ClassMeow", "ClassBar", "funcMeow"]
+    content = (app.outdir / "index.html").read_text(encoding="utf-8")
+    assert "funcMeow" in content
+    assert "ClassMeow" in content
+
+
+def test_automodule_loads_members(make_app, srcdir, parsed):
+    (srcdir / "index.rst").write_text(
+        ".. mat:automodule:: target\n    :members:\n", encoding="utf-8"
+    )
+    app = make_app(srcdir=srcdir, confoverrides={"matlab_scan_referenced_only": True})
+    entities_table = mat_types.registry_for(app).entities_table
+    target = entities_table["target"]
+    assert target.listed
+    # Class folder methods are part of the class.
+    cls = entities_table["target.ClassFolder"]
+    assert "classMethod" in cls.methods
+    assert "ClassExample" in parsed
+    assert "funcMeow" not in parsed
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -16,7 +16,7 @@ def _copy_samples(src_root: Path, dest_root: Path, relatives):
         shutil.copy2(src_root / rel, dest)
 
 
-def _run_apidoc(source: Path, output: Path, max_files: int = 50):
+def _run_apidoc(source: Path, output: Path, max_files: int = 50, *args: str):
     cmd = [
         sys.executable,
         "-m",
@@ -27,6 +27,7 @@ def _run_apidoc(source: Path, output: Path, max_files: int = 50):
         "--max-files",
         str(max_files),
         "--force",
+        *args,
     ]
     subprocess.run(cmd, check=True, cwd=PROJECT_ROOT)
 
@@ -79,3 +80,25 @@ def test_handles_underscored_folder(tmp_path):
     assert "_folder.files" in page
     # module name should retain leading underscore
     assert "_folder.files.f_example" in page
+
+
+def test_exclude_patterns(tmp_path):
+    src_dir = tmp_path / "src"
+    out_dir = tmp_path / "out"
+    src_dir.mkdir()
+
+    samples = [
+        Path("+package/package_func.m"),
+        Path("ClassExample.m"),
+        Path("f_example.m"),
+    ]
+    _copy_samples(TEST_DATA, src_dir, samples)
+    _copy_samples(TEST_DATA, src_dir / "tests", [Path("f_example.m")])
+
+    _run_apidoc(src_dir, out_dir, 50, "-e", "tests", "--exclude", "Class*.m")
+
+    content = "".join(p.read_text(encoding="utf-8") for p in out_dir.glob("*.rst"))
+    assert "f_example" in content
+    assert "package_func" in content
+    assert "ClassExample" not in content
+    assert "tests" not in content
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+test_trace_file
+~~~~~~~~~~~~~~~
+
+Test that ``matlab_trace_file`` writes the spans of the build phases, from all
+threads and processes, in the Trace Event Format.
+
+:license: BSD, see LICENSE for details.
+"""
+
+import json
+import os
+
+import pytest
+from helper import srcdir  # noqa: F401;
+from sphinx.testing.fixtures import make_app, test_params  # noqa: F811;
+
+from sphinxcontrib import mat_cache
+
+
+def read_trace(filename):
+    with open(filename, encoding="utf-8") as f:
+        events = json.load(f)["traceEvents"]
+    spans = [event for event in events if event["ph"] == "X"]
+    threads = {
+        (event["pid"], event["tid"]): event["args"]["name"]
+        for event in events
+        if event["name"] == "thread_name"
+    }
+    return spans, threads
+
+
+def test_build_phases(make_app, srcdir, tmp_path):
+    filename = tmp_path / "trace.json"
+    app = make_app(
+        srcdir=srcdir,
+        confoverrides={
+            "matlab_trace_file": str(filename),
+            "matlab_parse_workers": 2,
+            "matlab_auto_link": "all",
+        },
+    )
+    app.build()
+    spans, threads = read_trace(filename)
+    by_cat = {}
+    for event in spans:
+        by_cat.setdefault(event["cat"], []).append(event)
+        assert event["dur"] >= 0
+        # Every thread that recorded spans is named.
+        assert (event["pid"], event["tid"]) in threads
+
+    assert by_cat["analyze"][0]["name"] == "walk"
+    assert {event["name"] for event in by_cat["aliases"]} == {
+        "transform_class_folder",
+        "class_folder_aliases",
+        "short_name_aliases",
+    }
+    assert "parse ClassExample" in {event["name"] for event in by_cat["parse"]}
+    # Files are parsed by the threads of matlab_parse_workers.
+    assert any(
+        threads[event["pid"], event["tid"]].startswith("matlab-parse")
+        for event in by_cat["parse"]
+    )
+    directives = {event["name"]: event for event in by_cat["autodoc"]}
+    assert directives["mat:autoclass ClassExample"]["args"]["docname"] == (
+        "index_target"
+    )
+    assert "auto_link target.ClassExample" in {
+        event["name"] for event in by_cat["auto-link"]
+    }
+    assert by_cat["xref"]
+
+
+def test_cache_cli_trace(tmp_path, srcdir):
+    with open(srcdir / "conf.py", "a") as f:
+        f.write('matlab_cache_dir = "_cache"\n')
+    filename = tmp_path / "trace.json"
+    assert mat_cache.main([str(srcdir), "-j", "2", "--trace", str(filename)]) == 0
+    spans, _ = read_trace(filename)
+    parsed = [event for event in spans if event["cat"] == "parse"]
+    assert "parse ClassExample" in {event["name"] for event in parsed}
+    assert os.getpid() not in {event["pid"] for event in parsed}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
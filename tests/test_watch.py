@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+test_watch
+~~~~~~~~~~
+
+Test rebuilding after changes of MATLAB sources.
+
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+import time
+
+import pytest
+from helper import srcdir  # noqa: F401;
+from sphinx.testing.fixtures import make_app, test_params  # noqa: F811;
+
+from sphinxcontrib import mat_types
+from sphinxcontrib.mat_watch import MatSourceWatcher, rebuild
+
+
+@pytest.fixture
+def app(make_app, srcdir):
+    app = make_app(srcdir=srcdir)
+    app.build()
+    app.read_docs = []
+    app.connect(
+        "env-before-read-docs",
+        lambda app, env, docnames: app.read_docs.extend(docnames),
+    )
+    with mat_types.registry_for(app).activated():
+        yield app
+
+
+def edit(path, old, new):
+    text = path.read_text(encoding="utf-8").replace(old, new)
+    path.write_text(text, encoding="utf-8")
+    # make sure the file is newer than the documents read in the first build
+    future = time.time() + 10
+    os.utime(path, (future, future))
+
+
+def test_rebuild_changed_class(app, srcdir):
+    watcher = MatSourceWatcher(mat_types.MatObject.basedir)
+    old_cls = mat_types.entities_table["target.ClassExample"]
+
+    edit(srcdir / "target" / "ClassExample.m", "% Example class", "% Changed class")
+    changed = watcher.poll()
+    assert changed == [os.path.join("target", "ClassExample.m")]
+
+    rebuild(app, changed)
+    cls = mat_types.entities_table["target.ClassExample"]
+    assert cls is not old_cls
+    assert cls.docstring.startswith("Changed class")
+    assert mat_types.entities_table["ClassExample"] is cls
+    assert app.read_docs == ["index_target"]
+    assert watcher.poll() == []
+
+
+def test_rebuild_changed_class_folder_method(app, srcdir):
+    watcher = MatSourceWatcher(mat_types.MatObject.basedir)
+
+    edit(
+        srcdir / "target" / "@ClassFolder" / "classMethod.m",
+        "A function within a package",
+        "A changed method",
+    )
+    rebuild(app, watcher.poll())
+    cls = mat_types.entities_table["target.ClassFolder"]
+    assert cls is mat_types.entities_table["target.@ClassFolder.ClassFolder"]
+    assert "A changed method" in cls.methods["classMethod"].docstring
+    assert isinstance(cls.methods["classMethod"], mat_types.MatMethod)
+    assert app.read_docs == ["index_classfolder"]
+
+
+def test_rebuild_added_and_removed_function(app, srcdir):
+    watcher = MatSourceWatcher(mat_types.MatObject.basedir)
+    new_file = srcdir / "target" / "submodule" / "funcNew.m"
+
+    new_file.write_text("function funcNew()\n% A new function\nend\n")
+    rebuild(app, watcher.poll())
+    func = mat_types.entities_table["target.submodule.funcNew"]
+    assert func.docstring == "A new function"
+    assert mat_types.entities_table["funcNew"] is func
+    submodule = mat_types.entities_table["target.submodule"]
+    assert "funcNew" in [name for name, _ in submodule.entities]
+
+    new_file.unlink()
+    rebuild(app, watcher.poll())
+    assert "target.submodule.funcNew" not in mat_types.entities_table
+    assert "funcNew" not in mat_types.entities_table
+    assert "funcNew" not in [name for name, _ in submodule.entities]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])